@@ -0,0 +1,168 @@
+"""
+Query-plan check for FeedbackDatabase
+
+Calls every public FeedbackDatabase method against a populated scratch
+database, captures each SQL statement it runs, and prints its
+EXPLAIN QUERY PLAN. Exits with status 1 if any statement falls back to a
+full scan of a row table (a "SCAN <table>" step that doesn't use an index).
+
+Usage:
+    python -m backend.database.check_query_plans
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import inspect
+import os
+import re
+import tempfile
+from backend.database.db import FeedbackDatabase
+
+# Methods that don't run data queries, or where a full scan is inherent
+SKIPPED_METHODS = {
+    'get_connection', 'close', 'init_database', 'migrate',
+    'delete_all_feedback',  # deletes every row by definition
+    'rebuild_rollups',      # recovery command, recomputes from every row
+}
+
+# Tables that grow with the number of feedback rows. Rollup tables are
+# bounded by the number of categories, so scanning them is expected.
+ROW_TABLES = {'feedback', 'jobs'}
+
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+
+def method_calls(database: FeedbackDatabase) -> dict:
+    """Representative arguments for each public method"""
+    return {
+        'add_feedback': lambda: database.add_feedback({
+            'feedback_id': 'QP1', 'text': 'plan check', 'source': 'Web', 'date': '2025-12-31'
+        }),
+        'add_feedback_bulk': lambda: database.add_feedback_bulk([{
+            'feedback_id': 'QP2', 'text': 'plan check', 'source': 'Web', 'date': '2025-12-31'
+        }]),
+        'get_all_feedback': lambda: [
+            database.get_all_feedback(),
+            database.get_all_feedback(limit=10),
+            database.get_all_feedback(limit=10, source='Web'),
+            database.get_all_feedback(limit=10, sentiment='Negative'),
+            database.get_all_feedback(limit=10, source='Web', sentiment='Negative'),
+        ],
+        'search_feedback': lambda: [
+            database.search_feedback('feedback'),
+            database.search_feedback('feedback 1', source='Web', sentiment='Positive',
+                                     intent='Bug Report', date_from='2025-12-01',
+                                     date_to='2025-12-31', limit=5),
+            database.search_feedback('feedback', cursor=database.search_feedback(
+                'feedback', limit=5)[1]),
+        ],
+        'get_feedback_by_id': lambda: database.get_feedback_by_id('F1'),
+        'update_feedback_analysis': lambda: database.update_feedback_analysis(
+            'F1', 'Positive', 0.9, 'General Feedback', 0.8
+        ),
+        'get_sentiment_distribution': database.get_sentiment_distribution,
+        'get_intent_distribution': database.get_intent_distribution,
+        'get_source_distribution': database.get_source_distribution,
+        'get_trends_by_date': database.get_trends_by_date,
+        'get_negative_feedback': database.get_negative_feedback,
+        'get_summary_stats': database.get_summary_stats,
+        'count_unanalyzed_feedback': database.count_unanalyzed_feedback,
+        'get_unanalyzed_feedback': lambda: database.get_unanalyzed_feedback(after_id=10, limit=50),
+        'create_job': lambda: database.create_job('qp-job', 'analyze_all', 10),
+        'get_job': lambda: database.get_job('qp-job'),
+        'get_unfinished_jobs': lambda: [
+            database.get_unfinished_jobs(),
+            database.get_unfinished_jobs('analyze_all'),
+        ],
+        'claim_job': lambda: database.claim_job('qp-job', 'qp-owner', 30),
+        'save_job_chunk': lambda: database.save_job_chunk('qp-job', 'qp-owner', [{
+            'id': 1, 'sentiment': 'Positive', 'sentiment_score': 0.9,
+            'intent': 'General Feedback', 'intent_score': 0.8
+        }], 1, 30),
+        'release_job': lambda: database.release_job('qp-job', 'qp-owner'),
+        'finish_job': lambda: database.finish_job('qp-job', 'qp-owner', 'completed'),
+    }
+
+
+def populate(database: FeedbackDatabase, rows: int = 2000):
+    sources = ["Mobile App", "Web", "Support"]
+    sentiments = ["Positive", "Neutral", "Negative", None]
+    conn = database.get_connection()
+    conn.executemany(
+        '''INSERT INTO feedback (feedback_id, text, source, date, sentiment,
+                                 sentiment_score, intent, intent_score)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+        [(f"F{i}", f"feedback {i}", sources[i % 3], f"2025-12-{i % 28 + 1:02d}",
+          sentiments[i % 4], 0.5 if sentiments[i % 4] else None,
+          "Bug Report" if sentiments[i % 4] else None, 0.5 if sentiments[i % 4] else None)
+         for i in range(rows)]
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+
+
+def check(database: FeedbackDatabase) -> list:
+    """Run every method, explain every captured statement, return failures"""
+    calls = method_calls(database)
+
+    public = {
+        name for name, _ in inspect.getmembers(FeedbackDatabase, inspect.isfunction)
+        if not name.startswith('_')
+    }
+    missing = sorted(public - SKIPPED_METHODS - set(calls))
+    failures = [f"{name}: not covered by check_query_plans" for name in missing]
+
+    conn = database.get_connection()
+    for name, call in calls.items():
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            call()
+        finally:
+            conn.set_trace_callback(None)
+
+        explained = [
+            sql for sql in statements
+            if sql.lstrip().split(None, 1)[0].upper() in ('SELECT', 'UPDATE', 'DELETE', 'INSERT')
+        ]
+        for sql in explained:
+            plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+            print(f"\n{name}: {' '.join(sql.split())[:100]}")
+            for step in plan:
+                print(f"    {step}")
+                match = FULL_SCAN.match(step)
+                if match and match.group(1) in ROW_TABLES:
+                    failures.append(f"{name}: full scan ({step}) in: {' '.join(sql.split())}")
+
+    return failures
+
+
+def main() -> int:
+    print("=" * 60)
+    print("QUERY PLAN CHECK")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = FeedbackDatabase(os.path.join(tmp, "plans.db"))
+        populate(database)
+        failures = check(database)
+        database.close()
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"✗ {len(failures)} problem(s):")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+
+    print("✓ No full table scans")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,246 @@
+import base64
+import os
 import sqlite3
+import threading
+import time
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import config
 
+# Incrementally maintained analytics counters. analytics_rollups holds one
+# row per (dimension, bucket); trend_rollups holds the date x sentiment grid.
+# Triggers on feedback keep both in step with every write path.
+ROLLUP_DIMENSIONS = [
+    # (dimension, bucket expression, condition, score expression)
+    ('total', "''", "1", "0"),
+    ('source', "{row}.source", "1", "0"),
+    ('sentiment', "{row}.sentiment", "{row}.sentiment IS NOT NULL", "0"),
+    ('intent', "{row}.intent", "{row}.intent IS NOT NULL", "0"),
+    ('sentiment_score', "''", "{row}.sentiment_score IS NOT NULL", "{row}.sentiment_score"),
+]
+
+
+def _rollup_apply_sql(row: str) -> str:
+    """Trigger statements that count `row` (NEW) into the rollups"""
+    statements = [
+        f"""INSERT INTO analytics_rollups (dimension, bucket, count, score_sum)
+            SELECT '{dimension}', {bucket}, 1, {score} WHERE {condition}
+            ON CONFLICT (dimension, bucket) DO UPDATE
+            SET count = count + 1, score_sum = score_sum + excluded.score_sum;"""
+        for dimension, bucket, condition, score in ROLLUP_DIMENSIONS
+    ]
+    statements.append(
+        """INSERT INTO trend_rollups (date, sentiment, count)
+            SELECT {row}.date, {row}.sentiment, 1 WHERE {row}.sentiment IS NOT NULL
+            ON CONFLICT (date, sentiment) DO UPDATE SET count = count + 1;"""
+    )
+    return "\n".join(statements).format(row=row)
+
+
+def _rollup_remove_sql(row: str) -> str:
+    """Trigger statements that take `row` (OLD) back out of the rollups"""
+    statements = [
+        f"""UPDATE analytics_rollups
+            SET count = count - 1, score_sum = score_sum - {score}
+            WHERE dimension = '{dimension}' AND bucket = {bucket} AND {condition};"""
+        for dimension, bucket, condition, score in ROLLUP_DIMENSIONS
+    ]
+    statements.append(
+        """UPDATE trend_rollups SET count = count - 1
+            WHERE date = {row}.date AND sentiment = {row}.sentiment;"""
+    )
+    return "\n".join(statements).format(row=row)
+
+
+# Recomputes every rollup from the feedback table (backfill and recovery)
+ROLLUP_REBUILD_STATEMENTS = [
+    "DELETE FROM analytics_rollups",
+    "DELETE FROM trend_rollups",
+    """INSERT INTO analytics_rollups (dimension, bucket, count, score_sum)
+       SELECT 'total', '', COUNT(*), 0 FROM feedback""",
+    """INSERT INTO analytics_rollups (dimension, bucket, count, score_sum)
+       SELECT 'source', source, COUNT(*), 0 FROM feedback GROUP BY source""",
+    """INSERT INTO analytics_rollups (dimension, bucket, count, score_sum)
+       SELECT 'sentiment', sentiment, COUNT(*), 0 FROM feedback
+       WHERE sentiment IS NOT NULL GROUP BY sentiment""",
+    """INSERT INTO analytics_rollups (dimension, bucket, count, score_sum)
+       SELECT 'intent', intent, COUNT(*), 0 FROM feedback
+       WHERE intent IS NOT NULL GROUP BY intent""",
+    """INSERT INTO analytics_rollups (dimension, bucket, count, score_sum)
+       SELECT 'sentiment_score', '', COUNT(sentiment_score), COALESCE(SUM(sentiment_score), 0)
+       FROM feedback""",
+    """INSERT INTO trend_rollups (date, sentiment, count)
+       SELECT date, sentiment, COUNT(*) FROM feedback
+       WHERE sentiment IS NOT NULL GROUP BY date, sentiment""",
+]
+
+def _add_column(table: str, column: str, declaration: str):
+    """Migration statement that adds a column unless the table already has it"""
+    def apply(conn):
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+    return apply
+
+
+# Schema migrations, applied in order on startup. PRAGMA user_version
+# records how many have run; append new steps, never edit old ones.
+# A statement is SQL, or a callable that takes the connection (for steps
+# SQLite has no IF NOT EXISTS form for).
+SCHEMA_MIGRATIONS = [
+    # 1: secondary indexes for the dashboard and job access paths
+    [
+        "CREATE INDEX IF NOT EXISTS idx_feedback_created_at ON feedback (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_feedback_source_created ON feedback (source, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_feedback_sentiment_created ON feedback (sentiment, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_feedback_intent ON feedback (intent)",
+        "CREATE INDEX IF NOT EXISTS idx_feedback_date_sentiment ON feedback (date, sentiment)",
+        "CREATE INDEX IF NOT EXISTS idx_feedback_sentiment_score ON feedback (sentiment_score)",
+        "CREATE INDEX IF NOT EXISTS idx_feedback_unanalyzed ON feedback (id) WHERE sentiment IS NULL",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)",
+    ],
+    # 2: analytics rollups maintained by triggers, backfilled from existing rows
+    [
+        """CREATE TABLE IF NOT EXISTS analytics_rollups (
+               dimension TEXT NOT NULL,
+               bucket TEXT NOT NULL,
+               count INTEGER NOT NULL DEFAULT 0,
+               score_sum REAL NOT NULL DEFAULT 0,
+               PRIMARY KEY (dimension, bucket)
+           ) WITHOUT ROWID""",
+        """CREATE TABLE IF NOT EXISTS trend_rollups (
+               date TEXT NOT NULL,
+               sentiment TEXT NOT NULL,
+               count INTEGER NOT NULL DEFAULT 0,
+               PRIMARY KEY (date, sentiment)
+           ) WITHOUT ROWID""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_feedback_rollup_insert
+            AFTER INSERT ON feedback
+            BEGIN
+            {_rollup_apply_sql('NEW')}
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_feedback_rollup_delete
+            AFTER DELETE ON feedback
+            BEGIN
+            {_rollup_remove_sql('OLD')}
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_feedback_rollup_update
+            AFTER UPDATE OF source, date, sentiment, sentiment_score, intent ON feedback
+            BEGIN
+            {_rollup_remove_sql('OLD')}
+            {_rollup_apply_sql('NEW')}
+            END""",
+        *ROLLUP_REBUILD_STATEMENTS,
+    ],
+    # 3: full-text index over feedback.text, kept in sync by triggers
+    [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS feedback_fts USING fts5(
+               text, content='feedback', content_rowid='id',
+               tokenize='porter unicode61'
+           )""",
+        """CREATE TRIGGER IF NOT EXISTS trg_feedback_fts_insert
+           AFTER INSERT ON feedback
+           BEGIN
+               INSERT INTO feedback_fts (rowid, text) VALUES (NEW.id, NEW.text);
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_feedback_fts_delete
+           AFTER DELETE ON feedback
+           BEGIN
+               INSERT INTO feedback_fts (feedback_fts, rowid, text) VALUES ('delete', OLD.id, OLD.text);
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_feedback_fts_update
+           AFTER UPDATE OF text ON feedback
+           BEGIN
+               INSERT INTO feedback_fts (feedback_fts, rowid, text) VALUES ('delete', OLD.id, OLD.text);
+               INSERT INTO feedback_fts (rowid, text) VALUES (NEW.id, NEW.text);
+           END""",
+        "INSERT INTO feedback_fts (feedback_fts) VALUES ('rebuild')",
+    ],
+    # 4: job leases, so exactly one API worker process runs each job
+    [
+        _add_column('jobs', 'owner', 'TEXT'),
+        _add_column('jobs', 'lease_until', 'REAL'),
+    ],
+]
+
+
+def _encode_search_cursor(score: float, row_id: int) -> str:
+    """Opaque keyset cursor for search pagination"""
+    return base64.urlsafe_b64encode(f"{score!r}:{row_id}".encode()).decode()
+
+
+def _decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        score, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(':')
+        return float(score), int(row_id)
+    except Exception:
+        raise ValueError("Invalid search cursor")
+
+
 class FeedbackDatabase:
     """SQLite database operations for feedback management"""
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, pragmas: Dict = None):
         self.db_path = db_path or str(config.DATABASE_PATH)
-        self.init_database()
+        self.pragmas = config.SQLITE_PRAGMAS if pragmas is None else pragmas
+        
+        # One persistent connection per thread (the API runs queries on a
+        # bounded thread pool, so this is effectively a connection pool)
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._pid = os.getpid()
+        
+        # Schema setup is deferred to the first query, so constructing the
+        # instance (and importing this module) does no I/O
+        self._initialized = False
+        self._init_lock = threading.Lock()
     
     def get_connection(self):
-        """Create a database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's persistent database connection, creating the schema on first use"""
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self.init_database()
+                    self._initialized = True
+        return self._thread_connection()
+    
+    def _thread_connection(self):
+        """Get this thread's persistent connection, opening it on first use"""
+        if self._pid != os.getpid():
+            # Connections must not be shared across a fork
+            self._local = threading.local()
+            self._connections = []
+            self._pid = os.getpid()
+        
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def _open_connection(self):
+        """Open a new connection and apply the configured pragmas"""
+        busy_timeout_ms = self.pragmas.get('busy_timeout', 5000)
+        conn = sqlite3.connect(self.db_path, timeout=busy_timeout_ms / 1000,
+                               check_same_thread=False)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+    
+    def close(self):
+        """Close every connection opened by this instance"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
     
     def init_database(self):
         """Initialize database with required tables"""
-        conn = self.get_connection()
+        conn = self._thread_connection()
         cursor = conn.cursor()
         
         # Create feedback table
@@ -45,13 +269,59 @@ class FeedbackDatabase:
             )
         ''')
         
+        # Create jobs table for background work (e.g. analyze-all)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                job_type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                processed INTEGER NOT NULL DEFAULT 0,
+                last_id INTEGER NOT NULL DEFAULT 0,
+                processed_at_start INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                updated_at TEXT,
+                finished_at TEXT
+            )
+        ''')
+        
         conn.commit()
-        conn.close()
+        
+        self.migrate()
+    
+    def migrate(self):
+        """
+        Apply any schema migrations newer than the database's user_version
+        
+        Several API workers may start at once, so the pending steps run under
+        one write lock (BEGIN IMMEDIATE) and user_version is read again once
+        it is held: a worker that waited for the lock finds the steps applied.
+        """
+        conn = self._thread_connection()
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= len(SCHEMA_MIGRATIONS):
+            return
+        
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for number, statements in enumerate(SCHEMA_MIGRATIONS[version:], start=version + 1):
+                for statement in statements:
+                    if callable(statement):
+                        statement(conn)
+                    else:
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
     
     def add_feedback(self, feedback_data: Dict) -> bool:
         """Add new feedback to database"""
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -70,15 +340,54 @@ class FeedbackDatabase:
             ))
             
             conn.commit()
-            conn.close()
             return True
         except sqlite3.IntegrityError:
             # Feedback ID already exists
+            conn.rollback()
             return False
         except Exception as e:
             print(f"Error adding feedback: {e}")
+            conn.rollback()
             return False
     
+    def add_feedback_bulk(self, feedbacks: List[Dict]) -> Tuple[int, int]:
+        """
+        Insert many feedback rows in a single transaction
+        
+        Rows whose feedback_id already exists (in the table or earlier in
+        the same batch) are skipped with INSERT OR IGNORE.
+        
+        Returns:
+            (added_count, duplicate_count)
+        """
+        if not feedbacks:
+            return 0, 0
+        
+        conn = self.get_connection()
+        with conn:
+            cursor = conn.executemany('''
+                INSERT OR IGNORE INTO feedback (feedback_id, text, source, date, sentiment,
+                                               sentiment_score, intent, intent_score)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (
+                    f.get('feedback_id'),
+                    f.get('text'),
+                    f.get('source'),
+                    f.get('date'),
+                    f.get('sentiment'),
+                    f.get('sentiment_score'),
+                    f.get('intent'),
+                    f.get('intent_score')
+                )
+                for f in feedbacks
+            ])
+            # rowcount sums direct row changes only, so it counts exactly
+            # the rows that were inserted (ignored rows change nothing)
+            added = cursor.rowcount
+        
+        return added, len(feedbacks) - added
+    
     def get_all_feedback(self, limit: int = None, source: str = None, 
                         sentiment: str = None) -> List[Dict]:
         """Retrieve all feedback with optional filters"""
@@ -109,9 +418,78 @@ class FeedbackDatabase:
         for row in cursor.fetchall():
             results.append(dict(zip(columns, row)))
         
-        conn.close()
         return results
     
+    def search_feedback(self, query: str, source: str = None, sentiment: str = None,
+                        intent: str = None, date_from: str = None, date_to: str = None,
+                        limit: int = 20, cursor: str = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Full-text search over feedback text, best matches first
+        
+        Every whitespace-separated term in `query` must appear, matched by
+        stem and as a prefix ("crash" finds "crashes", "crashing"). Terms are
+        quoted, so FTS5 operators in user input are matched literally.
+        
+        Args:
+            query: Search terms
+            source, sentiment, intent: Optional exact-match filters
+            date_from, date_to: Optional inclusive date bounds (YYYY-MM-DD)
+            limit: Page size
+            cursor: Opaque cursor from the previous page
+        
+        Returns:
+            (results, next_cursor); each result is a feedback row plus
+            `snippet` (matches wrapped in <b></b>) and `score` (bm25, lower is better)
+        """
+        terms = query.split()
+        if not terms:
+            return [], None
+        match = ' '.join('"' + term.replace('"', '""') + '"*' for term in terms)
+        
+        conn = self.get_connection()
+        cur = conn.cursor()
+        
+        sql = '''
+            SELECT f.*, snippet(feedback_fts, 0, '<b>', '</b>', '…', 12) AS snippet,
+                   feedback_fts.rank AS score
+            FROM feedback_fts
+            JOIN feedback f ON f.id = feedback_fts.rowid
+            WHERE feedback_fts MATCH ?
+        '''
+        params = [match]
+        
+        for column, value in (('source', source), ('sentiment', sentiment), ('intent', intent)):
+            if value:
+                sql += f" AND f.{column} = ?"
+                params.append(value)
+        
+        if date_from:
+            sql += " AND f.date >= ?"
+            params.append(date_from)
+        
+        if date_to:
+            sql += " AND f.date <= ?"
+            params.append(date_to)
+        
+        if cursor:
+            last_score, last_id = _decode_search_cursor(cursor)
+            sql += " AND (feedback_fts.rank > ? OR (feedback_fts.rank = ? AND f.id > ?))"
+            params.extend([last_score, last_score, last_id])
+        
+        sql += " ORDER BY feedback_fts.rank, f.id LIMIT ?"
+        params.append(limit + 1)
+        
+        cur.execute(sql, params)
+        columns = [description[0] for description in cur.description]
+        results = [dict(zip(columns, row)) for row in cur.fetchall()]
+        
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_cursor = _encode_search_cursor(results[-1]['score'], results[-1]['id'])
+        
+        return results, next_cursor
+    
     def get_feedback_by_id(self, feedback_id: str) -> Optional[Dict]:
         """Get specific feedback by ID"""
         conn = self.get_connection()
@@ -121,8 +499,6 @@ class FeedbackDatabase:
         columns = [description[0] for description in cursor.description]
         row = cursor.fetchone()
         
-        conn.close()
-        
         if row:
             return dict(zip(columns, row))
         return None
@@ -131,8 +507,8 @@ class FeedbackDatabase:
                                  sentiment_score: float, intent: str, 
                                  intent_score: float) -> bool:
         """Update feedback with analysis results"""
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -142,59 +518,39 @@ class FeedbackDatabase:
             ''', (sentiment, sentiment_score, intent, intent_score, feedback_id))
             
             conn.commit()
-            conn.close()
             return True
         except Exception as e:
             print(f"Error updating feedback: {e}")
+            conn.rollback()
             return False
     
-    def get_sentiment_distribution(self) -> Dict[str, int]:
-        """Get count of feedback by sentiment"""
+    def _get_rollup(self, dimension: str, order_by_count: bool = False) -> Dict[str, int]:
+        """Read counters for one rollup dimension"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT sentiment, COUNT(*) as count 
-            FROM feedback 
-            WHERE sentiment IS NOT NULL
-            GROUP BY sentiment
-        ''')
+        query = '''
+            SELECT bucket, count
+            FROM analytics_rollups
+            WHERE dimension = ? AND count > 0
+        '''
+        if order_by_count:
+            query += " ORDER BY count DESC"
         
-        results = {row[0]: row[1] for row in cursor.fetchall()}
-        conn.close()
-        return results
+        cursor.execute(query, (dimension,))
+        return {row[0]: row[1] for row in cursor.fetchall()}
+    
+    def get_sentiment_distribution(self) -> Dict[str, int]:
+        """Get count of feedback by sentiment"""
+        return self._get_rollup('sentiment')
     
     def get_intent_distribution(self) -> Dict[str, int]:
         """Get count of feedback by intent"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT intent, COUNT(*) as count 
-            FROM feedback 
-            WHERE intent IS NOT NULL
-            GROUP BY intent
-            ORDER BY count DESC
-        ''')
-        
-        results = {row[0]: row[1] for row in cursor.fetchall()}
-        conn.close()
-        return results
+        return self._get_rollup('intent', order_by_count=True)
     
     def get_source_distribution(self) -> Dict[str, int]:
         """Get count of feedback by source"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT source, COUNT(*) as count 
-            FROM feedback 
-            GROUP BY source
-        ''')
-        
-        results = {row[0]: row[1] for row in cursor.fetchall()}
-        conn.close()
-        return results
+        return self._get_rollup('source')
     
     def get_trends_by_date(self) -> List[Dict]:
         """Get feedback trends over time"""
@@ -202,17 +558,15 @@ class FeedbackDatabase:
         cursor = conn.cursor()
         
         cursor.execute('''
-            SELECT date, sentiment, COUNT(*) as count 
-            FROM feedback 
-            WHERE sentiment IS NOT NULL
-            GROUP BY date, sentiment
-            ORDER BY date
+            SELECT date, sentiment, count
+            FROM trend_rollups
+            WHERE count > 0
+            ORDER BY date, sentiment
         ''')
         
         columns = ['date', 'sentiment', 'count']
         results = [dict(zip(columns, row)) for row in cursor.fetchall()]
         
-        conn.close()
         return results
     
     def get_negative_feedback(self, limit: int = 10) -> List[Dict]:
@@ -224,27 +578,23 @@ class FeedbackDatabase:
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        cursor.execute('''
+            SELECT dimension, count, score_sum
+            FROM analytics_rollups
+            WHERE dimension IN ('total', 'sentiment_score')
+        ''')
+        totals = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        
         # Total feedback count
-        cursor.execute("SELECT COUNT(*) FROM feedback")
-        total_count = cursor.fetchone()[0]
+        total_count = totals.get('total', (0, 0))[0]
         
         # Average sentiment score
-        cursor.execute("SELECT AVG(sentiment_score) FROM feedback WHERE sentiment_score IS NOT NULL")
-        avg_sentiment = cursor.fetchone()[0] or 0
+        score_count, score_sum = totals.get('sentiment_score', (0, 0))
+        avg_sentiment = score_sum / score_count if score_count else 0
         
         # Most common intent
-        cursor.execute('''
-            SELECT intent, COUNT(*) as count 
-            FROM feedback 
-            WHERE intent IS NOT NULL
-            GROUP BY intent 
-            ORDER BY count DESC 
-            LIMIT 1
-        ''')
-        top_intent_row = cursor.fetchone()
-        top_intent = top_intent_row[0] if top_intent_row else "N/A"
-        
-        conn.close()
+        intent_counts = self._get_rollup('intent', order_by_count=True)
+        top_intent = next(iter(intent_counts), "N/A")
         
         return {
             "total_feedback": total_count,
@@ -252,13 +602,216 @@ class FeedbackDatabase:
             "top_intent": top_intent
         }
     
+    def rebuild_rollups(self):
+        """Recompute all analytics rollups from the feedback table"""
+        conn = self.get_connection()
+        try:
+            conn.execute("BEGIN")
+            for statement in ROLLUP_REBUILD_STATEMENTS:
+                conn.execute(statement)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    
+    def count_unanalyzed_feedback(self) -> int:
+        """Count feedback rows that have no analysis yet"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM feedback WHERE sentiment IS NULL")
+        count = cursor.fetchone()[0]
+        return count
+    
+    def get_unanalyzed_feedback(self, after_id: int = 0, limit: int = 500) -> List[Dict]:
+        """
+        Get the next chunk of unanalyzed feedback using keyset pagination
+        
+        Args:
+            after_id: Only return rows with id greater than this
+            limit: Maximum number of rows to return
+        
+        Returns:
+            List of dicts with id, feedback_id and text, ordered by id
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id, feedback_id, text
+            FROM feedback
+            WHERE sentiment IS NULL AND id > ?
+            ORDER BY id
+            LIMIT ?
+        ''', (after_id, limit))
+        
+        columns = ['id', 'feedback_id', 'text']
+        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        
+        return results
+    
+    def create_job(self, job_id: str, job_type: str, total: int) -> Dict:
+        """
+        Create a queued background job, unless one of the same type is unfinished
+
+        The check and the insert are one statement, so concurrent submissions
+        from several worker processes still create a single job.
+
+        Returns:
+            The new job, or the existing unfinished job of this type
+        """
+        now = datetime.now().isoformat()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO jobs (job_id, job_type, status, total, created_at, updated_at)
+            SELECT ?, ?, 'queued', ?, ?, ?
+            WHERE NOT EXISTS (
+                SELECT 1 FROM jobs WHERE status IN ('queued', 'running') AND job_type = ?
+            )
+        ''', (job_id, job_type, total, now, now, job_type))
+        
+        conn.commit()
+        if cursor.rowcount == 1:
+            return self.get_job(job_id)
+        return self.get_unfinished_jobs(job_type)[0]
+    
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get a background job by ID"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+        columns = [description[0] for description in cursor.description]
+        row = cursor.fetchone()
+        
+        if row:
+            return dict(zip(columns, row))
+        return None
+    
+    def get_unfinished_jobs(self, job_type: str = None) -> List[Dict]:
+        """Get queued or running jobs, oldest first"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        query = "SELECT * FROM jobs WHERE status IN ('queued', 'running')"
+        params = []
+        if job_type:
+            query += " AND job_type = ?"
+            params.append(job_type)
+        query += " ORDER BY created_at"
+        
+        cursor.execute(query, params)
+        columns = [description[0] for description in cursor.description]
+        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        
+        return results
+    
+    def claim_job(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """
+        Take a job for one worker process; throughput is measured from this point
+        
+        A job can be claimed while it is queued, or while it is running under
+        a lease its owner stopped renewing (e.g. the process died). The check
+        and the update are one statement, so only one process wins.
+        
+        Args:
+            job_id: The job to claim
+            owner: Identifier of the claiming process
+            lease_seconds: How long the claim holds without a renewal
+        
+        Returns:
+            True if this owner now runs the job
+        """
+        now = time.time()
+        timestamp = datetime.now().isoformat()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            UPDATE jobs
+            SET status = 'running', owner = ?, lease_until = ?,
+                started_at = ?, updated_at = ?, processed_at_start = processed
+            WHERE job_id = ?
+              AND (status = 'queued'
+                   OR (status = 'running' AND (lease_until IS NULL OR lease_until < ?)))
+        ''', (owner, now + lease_seconds, timestamp, timestamp, job_id, now))
+        
+        conn.commit()
+        return cursor.rowcount == 1
+    
+    def release_job(self, job_id: str, owner: str):
+        """Put a job this owner holds back in the queue (e.g. on shutdown)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            UPDATE jobs
+            SET status = 'queued', owner = NULL, lease_until = NULL, updated_at = ?
+            WHERE job_id = ? AND owner = ? AND status = 'running'
+        ''', (datetime.now().isoformat(), job_id, owner))
+        
+        conn.commit()
+    
+    def save_job_chunk(self, job_id: str, owner: str, results: List[Dict], last_id: int,
+                       lease_seconds: float) -> bool:
+        """
+        Store a chunk of analysis results, advance the job cursor and renew the lease
+        
+        All of it happens in one transaction, and only while `owner` still
+        holds the job, so a restarted or taken-over job never skips or
+        double-counts a chunk.
+        
+        Args:
+            job_id: The job that produced the results
+            owner: Identifier of the process running the job
+            results: Dicts with id, sentiment, sentiment_score, intent, intent_score
+            last_id: Highest feedback id covered by this chunk
+            lease_seconds: New lease length, counted from now
+        
+        Returns:
+            False (and nothing stored) if another process has taken the job over
+        """
+        conn = self.get_connection()
+        with conn:
+            cursor = conn.execute('''
+                UPDATE jobs
+                SET processed = processed + ?, last_id = ?, lease_until = ?, updated_at = ?
+                WHERE job_id = ? AND owner = ? AND status = 'running'
+            ''', (len(results), last_id, time.time() + lease_seconds,
+                  datetime.now().isoformat(), job_id, owner))
+            if cursor.rowcount != 1:
+                return False
+            conn.executemany('''
+                UPDATE feedback
+                SET sentiment = ?, sentiment_score = ?, intent = ?, intent_score = ?
+                WHERE id = ?
+            ''', [
+                (r['sentiment'], r['sentiment_score'], r['intent'], r['intent_score'], r['id'])
+                for r in results
+            ])
+        return True
+    
+    def finish_job(self, job_id: str, owner: str, status: str, error: str = None):
+        """Mark a job this owner holds as completed or failed"""
+        now = datetime.now().isoformat()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            UPDATE jobs
+            SET status = ?, error = ?, lease_until = NULL, updated_at = ?, finished_at = ?
+            WHERE job_id = ? AND owner = ?
+        ''', (status, error, now, now, job_id, owner))
+        
+        conn.commit()
+    
     def delete_all_feedback(self):
         """Delete all feedback (for testing purposes)"""
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute("DELETE FROM feedback")
         conn.commit()
-        conn.close()
 
 
 # Singleton instance
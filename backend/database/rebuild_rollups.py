@@ -0,0 +1,25 @@
+"""
+Recompute the analytics rollups from the feedback table
+
+The rollups are kept current by triggers; run this to recover if they
+ever drift (e.g. after editing the database by hand with triggers disabled).
+
+Usage:
+    python -m backend.database.rebuild_rollups
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import time
+from backend.database.db import db
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    db.rebuild_rollups()
+    print(f"✓ Analytics rollups rebuilt in {time.perf_counter() - start:.2f}s")
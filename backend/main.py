@@ -7,9 +7,14 @@ sys.path.insert(0, str(project_root))
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.routes import feedback
-from ml.sentiment_model import sentiment_model
-from ml.intent_model import intent_model
+from backend.routes import feedback, jobs, models
+from backend.database.db import db
+from ml.inference import load_serving_models, models_trained
+from ml.prediction_cache import prediction_cache
+from backend.services.batcher import analysis_batcher
+from backend.services.executors import loop_lag_monitor, shutdown_executors, run_inference
+from backend.services.jobs import job_manager
+from backend.services.model_reloader import model_reloader
 import config
 import os
 
@@ -33,6 +38,8 @@ app.add_middleware(
 
 # Include routers
 app.include_router(feedback.router)
+app.include_router(jobs.router)
+app.include_router(models.router)
 
 
 @app.on_event("startup")
@@ -42,20 +49,23 @@ async def startup_event():
     print("Starting Smart Customer Feedback Intelligence Platform")
     print("=" * 60)
     
+    loop_lag_monitor.start()
+    
     # Check if models exist
-    models_exist = (
-        os.path.exists(str(config.SENTIMENT_MODEL_PATH)) and
-        os.path.exists(str(config.INTENT_MODEL_PATH)) and
-        os.path.exists(str(config.TOKENIZER_PATH))
-    )
+    models_exist = models_trained()
     
     if models_exist:
         try:
-            print("\nLoading trained models...")
-            sentiment_model.load_model()
-            intent_model.load_model()
-            intent_model.set_tokenizer(sentiment_model.tokenizer)
-            print("\n✓ Models loaded successfully!")
+            if config.INFERENCE_MODE == "server":
+                print(f"\nUsing the model server at {config.MODEL_SERVER_SOCKET}")
+            elif config.PRELOAD_MODELS:
+                print("\nLoading trained models...")
+                # Off the event loop, so the lag monitor keeps ticking
+                await run_inference(load_serving_models)
+                print("\n✓ Models loaded successfully!")
+            else:
+                print("\nModels will be loaded on the first analysis request")
+            await job_manager.resume_unfinished()
         except Exception as e:
             print(f"\n✗ Error loading models: {e}")
             print("Please run 'python ml/train_models.py' to train the models.")
@@ -63,6 +73,9 @@ async def startup_event():
         print("\n⚠ Models not found!")
         print("Please run 'python ml/train_models.py' to train the models first.")
     
+    # Swap in retrained models without a restart
+    model_reloader.start()
+    
     print("\n" + "=" * 60)
     print("API Server Ready!")
     print("=" * 60)
@@ -70,6 +83,18 @@ async def startup_event():
     print("=" * 60 + "\n")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background inference workers"""
+    await analysis_batcher.stop()
+    await job_manager.stop()
+    await model_reloader.stop()
+    await loop_lag_monitor.stop()
+    shutdown_executors()
+    prediction_cache.close()
+    db.close()
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -81,10 +106,15 @@ async def root():
             "add_feedback": "POST /api/feedback/add",
             "bulk_upload": "POST /api/feedback/bulk",
             "analyze_text": "POST /api/analyze",
+            "analyze_batch": "POST /api/analyze/batch",
             "analyze_feedback": "POST /api/feedback/analyze/{feedback_id}",
             "analyze_all": "POST /api/feedback/analyze-all",
+            "get_job": "GET /api/jobs/{job_id}",
+            "model_status": "GET /api/models",
+            "reload_models": "POST /api/models/reload",
             "get_all_feedback": "GET /api/feedback/all",
             "get_feedback": "GET /api/feedback/{feedback_id}",
+            "search_feedback": "GET /api/feedback/search",
             "get_analytics": "GET /api/analytics/summary",
             "get_trends": "GET /api/analytics/trends",
             "get_negative": "GET /api/analytics/negative-feedback"
@@ -95,15 +125,15 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    models_loaded = (
-        sentiment_model.model is not None and
-        intent_model.model is not None
-    )
-    
+    # From the model server with INFERENCE_MODE "server"
+    model = await model_reloader.status()
     return {
         "status": "healthy",
-        "models_loaded": models_loaded,
-        "database": "connected"
+        "models_loaded": model.get("version") is not None,
+        "model": model,
+        "database": "connected",
+        "event_loop_lag": loop_lag_monitor.stats(),
+        "prediction_cache": prediction_cache.stats()
     }
 
 
@@ -0,0 +1,146 @@
+"""
+Shared model server for multi-worker API deployments
+
+One process loads the serving models; API workers started with
+INFERENCE_MODE = "server" preprocess texts themselves and send the token
+lists here over a Unix socket (backend/services/model_client.py).
+Concurrent requests from all workers are micro-batched into one forward
+pass, and the prediction cache and hot reload watcher live here too, so
+TensorFlow and the models are in memory once per host instead of once per
+worker.
+
+Usage:
+    python backend/model_server.py
+    uvicorn backend.main:app --workers 4
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import asyncio
+import json
+import os
+import signal
+from backend.services.batcher import MicroBatcher
+from backend.services.executors import run_inference, shutdown_executors
+from backend.services.model_client import FRAME_HEADER, decode_frame_size, encode_frame
+from backend.services.model_reloader import model_reloader
+from ml.inference import load_serving_models, predict_columnar
+from ml.prediction_cache import prediction_cache
+import config
+
+
+class ModelServer:
+    """Unix socket server that runs predict_columnar for many API workers"""
+
+    def __init__(self, socket_path: str = None):
+        self.socket_path = str(socket_path or config.MODEL_SERVER_SOCKET)
+        # Each item is one request's token lists, so a batch is one forward pass
+        self.batcher = MicroBatcher(self._predict_batch)
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self._writers = set()
+
+    def _predict_batch(self, items: list) -> list:
+        """Predict the token lists of several requests together and split the results"""
+        columns = predict_columnar([tokens for token_lists in items for tokens in token_lists])
+        self.batches += 1
+
+        results, start = [], 0
+        for token_lists in items:
+            end = start + len(token_lists)
+            results.append({field: values[start:end].tolist() for field, values in columns.items()})
+            start = end
+        return results
+
+    async def _dispatch(self, request: dict) -> dict:
+        op = request.get('op')
+        if op == 'predict':
+            self.requests += 1
+            self.texts += len(request['token_lists'])
+            if not request['token_lists']:
+                return {'columns': {field: [] for field in
+                                    ('sentiment', 'sentiment_score', 'intent', 'intent_score')}}
+            return {'columns': await self.batcher.submit(request['token_lists'])}
+        if op == 'reload':
+            return {'result': await model_reloader.reload(force=request.get('force', False))}
+        if op == 'status':
+            return {'status': self.status()}
+        return {'error': f"Unknown operation {op!r}"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """One API worker thread's connection: requests are answered in order"""
+        self._writers.add(writer)
+        try:
+            while True:
+                header = await reader.readexactly(FRAME_HEADER.size)
+                payload = await reader.readexactly(decode_frame_size(header))
+                try:
+                    reply = await self._dispatch(json.loads(payload))
+                except Exception as e:
+                    reply = {'error': f"{type(e).__name__}: {e}"}
+                writer.write(encode_frame(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def status(self) -> dict:
+        return {
+            'model': model_reloader.stats(),
+            'prediction_cache': prediction_cache.stats(),
+            'connections': len(self._writers),
+            'requests': self.requests,
+            'texts': self.texts,
+            'batches': self.batches,
+            'texts_per_batch': round(self.texts / self.batches, 2) if self.batches else 0.0,
+        }
+
+    async def serve(self):
+        """Load the models, then answer requests until SIGINT / SIGTERM"""
+        print("=" * 60)
+        print("MODEL SERVER")
+        print("=" * 60)
+
+        # This process owns the models, whatever mode the API workers use
+        config.INFERENCE_MODE = "local"
+        await run_inference(load_serving_models)
+
+        if os.path.exists(self.socket_path):
+            # Left over from a server that did not shut down cleanly
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        model_reloader.start()
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        print(f"Listening on {self.socket_path}", flush=True)
+        try:
+            await stop.wait()
+        finally:
+            server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await server.wait_closed()
+            await self.batcher.stop()
+            await model_reloader.stop()
+            shutdown_executors()
+            prediction_cache.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            print("Model server stopped")
+
+
+if __name__ == "__main__":
+    asyncio.run(ModelServer().serve())
@@ -1,27 +1,21 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from pydantic import ValidationError
 from backend.schemas.feedback import (
-    FeedbackInput, AnalysisRequest, AnalysisResult,
+    FeedbackInput, AnalysisRequest, AnalysisResult, BatchAnalysisRequest,
     FeedbackResponse, AnalyticsSummary, MessageResponse,
-    BulkFeedbackInput
+    BulkFeedbackInput, JobSubmitResponse, SearchResponse
 )
 from backend.database.db import db
-from ml.sentiment_model import sentiment_model
-from ml.intent_model import intent_model
-from ml.nlp_pipeline import preprocess_text
+from ml.inference import models_trained
+from backend.services.analysis import analyze_texts
+from backend.services.batcher import analysis_batcher
+from backend.services.executors import run_inference, run_db
+from backend.services.jobs import job_manager
 from typing import List, Optional
-import os
 import config
 
 router = APIRouter(prefix="/api", tags=["feedback"])
 
-# Check if models are trained
-MODELS_TRAINED = (
-    os.path.exists(str(config.SENTIMENT_MODEL_PATH)) and
-    os.path.exists(str(config.INTENT_MODEL_PATH)) and
-    os.path.exists(str(config.TOKENIZER_PATH))
-)
-
-
 @router.post("/feedback/add", response_model=MessageResponse)
 async def add_feedback(feedback: FeedbackInput):
     """
@@ -40,7 +34,7 @@ async def add_feedback(feedback: FeedbackInput):
     feedback_dict['intent'] = None
     feedback_dict['intent_score'] = None
     
-    success = db.add_feedback(feedback_dict)
+    success = await run_db(db.add_feedback, feedback_dict)
     
     if not success:
         raise HTTPException(
@@ -59,23 +53,27 @@ async def add_bulk_feedback(bulk_input: BulkFeedbackInput):
     """
     Add multiple feedback entries at once
     
+    Entries are inserted in chunks of `BULK_INSERT_CHUNK_SIZE`, one transaction
+    per chunk. Entries whose feedback_id already exists are skipped.
+    
+    The whole JSON body is parsed and validated before the first chunk is
+    written, so the payload is held in memory; use POST /feedback/bulk/stream
+    for very large uploads.
+    
     - **feedbacks**: List of feedback objects to add
     """
     added_count = 0
     failed_count = 0
+    chunk_size = config.BULK_INSERT_CHUNK_SIZE
     
-    for feedback in bulk_input.feedbacks:
-        feedback_dict = feedback.model_dump()
-        feedback_dict['sentiment'] = None
-        feedback_dict['sentiment_score'] = None
-        feedback_dict['intent'] = None
-        feedback_dict['intent_score'] = None
-        
-        success = db.add_feedback(feedback_dict)
-        if success:
-            added_count += 1
-        else:
-            failed_count += 1
+    for start in range(0, len(bulk_input.feedbacks), chunk_size):
+        chunk = [
+            feedback.model_dump()
+            for feedback in bulk_input.feedbacks[start:start + chunk_size]
+        ]
+        added, duplicates = await run_db(db.add_feedback_bulk, chunk)
+        added_count += added
+        failed_count += duplicates
     
     return MessageResponse(
         message=f"Added {added_count} feedback entries. {failed_count} duplicates skipped.",
@@ -83,35 +81,126 @@ async def add_bulk_feedback(bulk_input: BulkFeedbackInput):
     )
 
 
+def _insert_ndjson_lines(lines: List[bytes], first_line: int) -> tuple:
+    """
+    Validate NDJSON feedback lines and insert the valid ones in one transaction
+    
+    Returns:
+        (added_count, duplicate_count, line numbers of invalid lines)
+    """
+    feedbacks, invalid = [], []
+    for number, line in enumerate(lines, start=first_line):
+        if not line.strip():
+            continue
+        try:
+            feedbacks.append(FeedbackInput.model_validate_json(line).model_dump())
+        except ValidationError:
+            invalid.append(number)
+    
+    added, duplicates = db.add_feedback_bulk(feedbacks)
+    return added, duplicates, invalid
+
+
+@router.post("/feedback/bulk/stream", response_model=MessageResponse)
+async def stream_bulk_feedback(request: Request):
+    """
+    Add feedback from a newline-delimited JSON body, one feedback object per line
+    
+    The body is read as it arrives: every `BULK_INSERT_CHUNK_SIZE` lines are
+    validated and inserted in one transaction, so memory use stays bounded
+    however large the upload is. Entries whose feedback_id already exists
+    and lines that are not valid feedback objects are skipped and counted.
+    
+    Example line: `{"feedback_id": "F101", "text": "Great app!", "source": "Web", "date": "2026-01-01"}`
+    """
+    chunk_size = config.BULK_INSERT_CHUNK_SIZE
+    max_line = config.BULK_STREAM_MAX_LINE_BYTES
+    added_count = duplicate_count = 0
+    invalid_lines = []
+    pending, buffer, next_line = [], b"", 1
+    
+    async def flush(lines: List[bytes]):
+        nonlocal added_count, duplicate_count, next_line
+        added, duplicates, invalid = await run_db(_insert_ndjson_lines, lines, next_line)
+        added_count += added
+        duplicate_count += duplicates
+        invalid_lines.extend(invalid)
+        next_line += len(lines)
+    
+    async for data in request.stream():
+        lines = (buffer + data).split(b"\n")
+        buffer = lines.pop()
+        if len(buffer) > max_line:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Line {next_line + len(pending) + len(lines)} exceeds {max_line} bytes; "
+                       f"{added_count} entries were added before it"
+            )
+        pending.extend(lines)
+        while len(pending) >= chunk_size:
+            await flush(pending[:chunk_size])
+            pending = pending[chunk_size:]
+    
+    pending.append(buffer)
+    await flush(pending)
+    
+    message = f"Added {added_count} feedback entries. {duplicate_count} duplicates skipped."
+    if invalid_lines:
+        message += (f" {len(invalid_lines)} invalid lines skipped "
+                    f"(first: line {invalid_lines[0]}).")
+    return MessageResponse(message=message, success=True)
+
+
 @router.post("/analyze", response_model=AnalysisResult)
 async def analyze_feedback(request: AnalysisRequest):
     """
     Analyze feedback text using NLP and Deep Learning models
     
-    Returns sentiment (Positive/Neutral/Negative) and intent classification
+    Returns sentiment (Positive/Neutral/Negative) and intent classification.
+    Concurrent requests are micro-batched into a single forward pass per model.
     
     - **text**: The feedback text to analyze
     """
-    if not MODELS_TRAINED:
+    if not models_trained():
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Models not trained yet. Please run 'python ml/train_models.py' first."
         )
     
-    # Preprocess text
-    clean_text = preprocess_text(request.text)
+    # Preprocess and predict together with other in-flight requests
+    prediction = await analysis_batcher.submit(request.text)
     
-    # Get predictions
-    sentiment_pred = sentiment_model.predict(clean_text)
-    intent_pred = intent_model.predict(clean_text)
+    return AnalysisResult(text=request.text, **prediction)
+
+
+@router.post("/analyze/batch", response_model=List[AnalysisResult])
+async def analyze_feedback_batch(request: BatchAnalysisRequest):
+    """
+    Analyze a list of texts without storing them
     
-    return AnalysisResult(
-        text=request.text,
-        sentiment=sentiment_pred['sentiment'],
-        sentiment_score=sentiment_pred['confidence'],
-        intent=intent_pred['intent'],
-        intent_score=intent_pred['confidence']
-    )
+    Texts are preprocessed and scored in chunks of `ANALYZE_BATCH_CHUNK_SIZE`,
+    with one forward pass per model for each chunk. Results keep the input order.
+    
+    - **texts**: The feedback texts to analyze
+    """
+    if not models_trained():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Models not trained yet. Please run 'python ml/train_models.py' first."
+        )
+    
+    chunk_size = config.ANALYZE_BATCH_CHUNK_SIZE
+    results = []
+    
+    for start in range(0, len(request.texts), chunk_size):
+        chunk = request.texts[start:start + chunk_size]
+        predictions = await run_inference(analyze_texts, chunk)
+        results.extend(
+            AnalysisResult(text=text, **prediction)
+            for text, prediction in zip(chunk, predictions)
+        )
+    
+    return results
 
 
 @router.post("/feedback/analyze/{feedback_id}", response_model=MessageResponse)
@@ -121,14 +210,14 @@ async def analyze_stored_feedback(feedback_id: str):
     
     - **feedback_id**: The ID of the feedback to analyze
     """
-    if not MODELS_TRAINED:
+    if not models_trained():
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Models not trained yet. Please run 'python ml/train_models.py' first."
         )
     
     # Get feedback from database
-    feedback = db.get_feedback_by_id(feedback_id)
+    feedback = await run_db(db.get_feedback_by_id, feedback_id)
     
     if not feedback:
         raise HTTPException(
@@ -137,18 +226,10 @@ async def analyze_stored_feedback(feedback_id: str):
         )
     
     # Preprocess and analyze
-    clean_text = preprocess_text(feedback['text'])
-    sentiment_pred = sentiment_model.predict(clean_text)
-    intent_pred = intent_model.predict(clean_text)
+    prediction = (await run_inference(analyze_texts, [feedback['text']]))[0]
     
     # Update database
-    db.update_feedback_analysis(
-        feedback_id=feedback_id,
-        sentiment=sentiment_pred['sentiment'],
-        sentiment_score=sentiment_pred['confidence'],
-        intent=intent_pred['intent'],
-        intent_score=intent_pred['confidence']
-    )
+    await run_db(db.update_feedback_analysis, feedback_id=feedback_id, **prediction)
     
     return MessageResponse(
         message=f"Feedback {feedback_id} analyzed and updated successfully",
@@ -156,45 +237,27 @@ async def analyze_stored_feedback(feedback_id: str):
     )
 
 
-@router.post("/feedback/analyze-all", response_model=MessageResponse)
+@router.post("/feedback/analyze-all", response_model=JobSubmitResponse)
 async def analyze_all_feedback():
     """
     Analyze all feedback entries in the database that haven't been analyzed yet
+    
+    Runs as a background job and returns its ID right away.
+    Poll progress with `GET /api/jobs/{job_id}`.
     """
-    if not MODELS_TRAINED:
+    if not models_trained():
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Models not trained yet. Please run 'python ml/train_models.py' first."
         )
     
-    # Get all feedback
-    all_feedback = db.get_all_feedback()
+    job = await job_manager.submit_analyze_all()
     
-    analyzed_count = 0
-    for feedback in all_feedback:
-        # Skip if already analyzed
-        if feedback.get('sentiment') is not None:
-            continue
-        
-        # Analyze
-        clean_text = preprocess_text(feedback['text'])
-        sentiment_pred = sentiment_model.predict(clean_text)
-        intent_pred = intent_model.predict(clean_text)
-        
-        # Update database
-        db.update_feedback_analysis(
-            feedback_id=feedback['feedback_id'],
-            sentiment=sentiment_pred['sentiment'],
-            sentiment_score=sentiment_pred['confidence'],
-            intent=intent_pred['intent'],
-            intent_score=intent_pred['confidence']
-        )
-        
-        analyzed_count += 1
-    
-    return MessageResponse(
-        message=f"Analyzed {analyzed_count} feedback entries",
-        success=True
+    return JobSubmitResponse(
+        message=f"Analysis job {job['job_id']} {job['status']} for {job['total']} feedback entries",
+        success=True,
+        job_id=job['job_id'],
+        status=job['status']
     )
 
 
@@ -211,10 +274,45 @@ async def get_all_feedback(
     - **source**: Filter by source (Mobile App, Web, Support)
     - **sentiment**: Filter by sentiment (Positive, Neutral, Negative)
     """
-    feedback_list = db.get_all_feedback(limit=limit, source=source, sentiment=sentiment)
+    feedback_list = await run_db(db.get_all_feedback, limit=limit, source=source,
+                                 sentiment=sentiment)
     return feedback_list
 
 
+@router.get("/feedback/search", response_model=SearchResponse)
+async def search_feedback(
+    q: str = Query(..., min_length=1),
+    source: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    intent: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None
+):
+    """
+    Full-text search over all feedback, best matches first
+    
+    - **q**: Search terms (all must match; word stems and prefixes count)
+    - **source**, **sentiment**, **intent**: Optional filters
+    - **date_from**, **date_to**: Optional inclusive date range (YYYY-MM-DD)
+    - **limit**: Page size (default: 20, max: 100)
+    - **cursor**: `next_cursor` from the previous page
+    """
+    try:
+        results, next_cursor = await run_db(
+            db.search_feedback, q, source=source, sentiment=sentiment, intent=intent,
+            date_from=date_from, date_to=date_to, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return SearchResponse(results=results, next_cursor=next_cursor)
+
+
 @router.get("/feedback/{feedback_id}", response_model=FeedbackResponse)
 async def get_feedback(feedback_id: str):
     """
@@ -222,7 +320,7 @@ async def get_feedback(feedback_id: str):
     
     - **feedback_id**: The unique identifier of the feedback
     """
-    feedback = db.get_feedback_by_id(feedback_id)
+    feedback = await run_db(db.get_feedback_by_id, feedback_id)
     
     if not feedback:
         raise HTTPException(
@@ -240,10 +338,10 @@ async def get_analytics_summary():
     
     Returns overall statistics, sentiment distribution, intent distribution, and source breakdown
     """
-    summary_stats = db.get_summary_stats()
-    sentiment_dist = db.get_sentiment_distribution()
-    intent_dist = db.get_intent_distribution()
-    source_dist = db.get_source_distribution()
+    summary_stats = await run_db(db.get_summary_stats)
+    sentiment_dist = await run_db(db.get_sentiment_distribution)
+    intent_dist = await run_db(db.get_intent_distribution)
+    source_dist = await run_db(db.get_source_distribution)
     
     return AnalyticsSummary(
         total_feedback=summary_stats['total_feedback'],
@@ -262,7 +360,7 @@ async def get_trends():
     
     Returns time-series data of sentiment trends
     """
-    trends = db.get_trends_by_date()
+    trends = await run_db(db.get_trends_by_date)
     return {"trends": trends}
 
 
@@ -273,5 +371,5 @@ async def get_negative_feedback(limit: int = 10):
     
     - **limit**: Number of negative feedback entries to return (default: 10)
     """
-    negative_feedback = db.get_negative_feedback(limit=limit)
+    negative_feedback = await run_db(db.get_negative_feedback, limit=limit)
     return negative_feedback
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, HTTPException, status
+from backend.schemas.feedback import JobStatus
+from backend.services.jobs import job_manager
+
+router = APIRouter(prefix="/api", tags=["jobs"])
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job_status(job_id: str):
+    """
+    Get progress of a background job
+    
+    Returns processed/total counts, throughput (rows/s) and ETA
+    
+    - **job_id**: The ID returned when the job was submitted
+    """
+    job = await job_manager.get_status(job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with ID {job_id} not found"
+        )
+    
+    return job
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, status
+from backend.schemas.feedback import ModelReloadResponse
+from backend.services.model_reloader import model_reloader
+from ml.inference import models_trained
+
+router = APIRouter(prefix="/api", tags=["models"])
+
+
+@router.get("/models")
+async def get_model_status():
+    """
+    Serving model version and hot reload counters
+    """
+    return await model_reloader.status()
+
+
+@router.post("/models/reload", response_model=ModelReloadResponse)
+async def reload_models(force: bool = False):
+    """
+    Load the model version on disk and swap it in without a restart
+    
+    The new models are loaded and warmed up in the background while requests
+    keep being served by the current ones. If loading fails, the current
+    models stay in service.
+    
+    - **force**: Reload even if the model files have not changed
+    """
+    if not models_trained():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Models not trained yet. Please run 'python ml/train_models.py' first."
+        )
+    
+    try:
+        return await model_reloader.reload(force=force)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Model reload failed, previous models still serving: {e}"
+        )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Annotated, Optional
 from datetime import datetime
 
 class FeedbackInput(BaseModel):
@@ -30,6 +30,22 @@ class AnalysisRequest(BaseModel):
             }
         }
 
+class BatchAnalysisRequest(BaseModel):
+    """Schema for batch text analysis request"""
+    texts: list[Annotated[str, Field(min_length=1)]] = Field(
+        ..., min_length=1, description="Texts to analyze (each non-empty, as in AnalysisRequest)"
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "texts": [
+                    "The app crashes after login. Very frustrating!",
+                    "Please add calendar integration"
+                ]
+            }
+        }
+
 class AnalysisResult(BaseModel):
     """Schema for analysis results"""
     text: str
@@ -65,6 +81,16 @@ class FeedbackResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class SearchHit(FeedbackResponse):
+    """Schema for a single full-text search result"""
+    snippet: str = Field(..., description="Matching fragment with terms wrapped in <b></b>")
+    score: float = Field(..., description="bm25 relevance (lower is more relevant)")
+
+class SearchResponse(BaseModel):
+    """Schema for a page of full-text search results"""
+    results: list[SearchHit]
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to get the next page")
+
 class AnalyticsSummary(BaseModel):
     """Schema for analytics summary"""
     total_feedback: int
@@ -136,3 +162,54 @@ class MessageResponse(BaseModel):
                 "success": True
             }
         }
+
+
+class JobSubmitResponse(BaseModel):
+    """Response for submitting a background job"""
+    message: str
+    success: bool = True
+    job_id: str
+    status: str
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "message": "Analysis job 3f2a... queued for 1200 feedback entries",
+                "success": True,
+                "job_id": "3f2a9c1e5b7d4e0f8a6b2c4d1e3f5a7b",
+                "status": "queued"
+            }
+        }
+
+class JobStatus(BaseModel):
+    """Schema for background job progress"""
+    job_id: str
+    job_type: str
+    status: str = Field(..., description="queued, running, completed or failed")
+    total: int
+    processed: int
+    progress: float = Field(..., ge=0, le=1, description="Fraction of rows processed")
+    throughput: float = Field(..., description="Rows per second since the job (re)started")
+    eta_seconds: Optional[float] = None
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+class ModelReloadResponse(BaseModel):
+    """Result of a hot model reload"""
+    reloaded: bool = Field(..., description="False if the model files had not changed")
+    version: str = Field(..., description="Model version now serving")
+    previous_version: Optional[str] = None
+    seconds: float = Field(..., description="Time to load, warm up and swap in the new models")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "reloaded": True,
+                "version": "9c41d0e7b2a85f36",
+                "previous_version": "1e8f3b6a0c7d2945",
+                "seconds": 2.41
+            }
+        }
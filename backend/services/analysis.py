@@ -0,0 +1,23 @@
+from ml import inference
+from ml.nlp_pipeline import preprocess_batch
+from backend.services.model_client import model_client
+import config
+
+
+def analyze_texts_columnar(texts: list) -> dict:
+    """
+    ml.inference.analyze_texts_columnar for the configured INFERENCE_MODE
+
+    Preprocessing always runs in this API worker; with "server" the token
+    lists go to the shared model server instead of models in this process.
+    """
+    if config.INFERENCE_MODE == "server":
+        return model_client.predict_columnar(preprocess_batch(texts, return_string=False))
+    return inference.analyze_texts_columnar(texts)
+
+
+def analyze_texts(texts: list) -> list:
+    """ml.inference.analyze_texts for the configured INFERENCE_MODE"""
+    if not texts:
+        return []
+    return inference.columns_to_dicts(analyze_texts_columnar(texts))
@@ -0,0 +1,113 @@
+import asyncio
+from typing import Callable, List, Optional
+from backend.services.analysis import analyze_texts
+from backend.services.executors import inference_executor
+import config
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batcher for model inference
+
+    Concurrent callers submit single items; the batcher waits up to
+    `max_wait_ms` (or until `max_batch_size` items are pending), runs
+    `process_batch` once on the whole batch and hands each caller its own result.
+    """
+
+    def __init__(self, process_batch: Callable[[list], list],
+                 max_batch_size: int = None, max_wait_ms: float = None):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size or config.BATCH_MAX_SIZE
+        self.max_wait_ms = config.BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+
+        self._pending: List[tuple] = []
+        self._has_items: Optional[asyncio.Event] = None
+        self._full: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background batching task is alive"""
+        return self._worker is not None and not self._worker.done()
+
+    def start(self):
+        """Start the batching task on the running event loop (idempotent)"""
+        if self.running:
+            return
+        self._has_items = asyncio.Event()
+        self._full = asyncio.Event()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the batching task and fail any callers still waiting"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        for _, future in self._pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Inference batcher stopped"))
+        self._pending = []
+
+    async def submit(self, item):
+        """Queue a single item and wait for its result"""
+        self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        self._has_items.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+
+        return await future
+
+    async def _next_batch(self) -> List[tuple]:
+        """Wait for the batching window and take up to max_batch_size items"""
+        await self._has_items.wait()
+
+        if len(self._pending) < self.max_batch_size and self.max_wait_ms > 0:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.max_wait_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+
+        if not self._pending:
+            self._has_items.clear()
+        if len(self._pending) < self.max_batch_size:
+            self._full.clear()
+
+        # Callers that gave up (e.g. client disconnected) don't need a slot
+        return [(item, future) for item, future in batch if not future.done()]
+
+    async def _run(self):
+        """Background loop: collect a batch, run it off the event loop, fan out results"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._next_batch()
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(inference_executor, self.process_batch, items)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+# Singleton instance used by POST /api/analyze
+analysis_batcher = MicroBatcher(analyze_texts)
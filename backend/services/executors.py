@@ -0,0 +1,92 @@
+import asyncio
+import functools
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import config
+
+# Dedicated, bounded pools so blocking work never runs on the event loop.
+# TensorFlow and sqlite3 both release the GIL while they work, so threads
+# give real overlap without re-loading the models in every worker.
+inference_executor = ThreadPoolExecutor(
+    max_workers=config.INFERENCE_WORKERS,
+    thread_name_prefix="inference"
+)
+db_executor = ThreadPoolExecutor(
+    max_workers=config.DB_WORKERS,
+    thread_name_prefix="db"
+)
+
+
+async def run_inference(fn, *args, **kwargs):
+    """Run CPU-bound preprocessing/prediction on the inference pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(inference_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def run_db(fn, *args, **kwargs):
+    """Run a blocking database call on the DB pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_executors():
+    """Stop accepting work and wait for running tasks to finish"""
+    inference_executor.shutdown(wait=True)
+    db_executor.shutdown(wait=True)
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag
+
+    Sleeps for a fixed interval and records how much later than requested
+    the loop woke up. Sustained lag means something is blocking the loop.
+    """
+
+    def __init__(self, interval_ms: float = None, window: int = 600):
+        self.interval = (interval_ms or config.LOOP_LAG_INTERVAL_MS) / 1000
+        self.samples = deque(maxlen=window)
+        self.max_lag_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start sampling on the running event loop (idempotent)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (time.perf_counter() - start - self.interval) * 1000)
+            self.samples.append(lag_ms)
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+    def stats(self) -> dict:
+        """Current, p99 and max lag over the sample window, in milliseconds"""
+        if not self.samples:
+            return {"current_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0, "samples": 0}
+
+        ordered = sorted(self.samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return {
+            "current_ms": round(self.samples[-1], 2),
+            "p99_ms": round(p99, 2),
+            "max_ms": round(self.max_lag_ms, 2),
+            "samples": len(self.samples)
+        }
+
+
+# Singleton instance
+loop_lag_monitor = LoopLagMonitor()
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Optional, Set
+from backend.database.db import db
+from backend.services.executors import run_inference, run_db
+from backend.services.analysis import analyze_texts_columnar
+import config
+
+ANALYZE_ALL = "analyze_all"
+
+
+class JobManager:
+    """
+    Runs long analysis work in the background
+
+    Job state lives in the `jobs` table, so progress can be polled from any
+    request and unfinished jobs are resumed from their keyset cursor on restart.
+    Every API worker process may schedule a job, but only the one that claims
+    its lease runs it; the others wait and take over if that lease expires.
+    """
+
+    def __init__(self, chunk_size: int = None, lease_seconds: float = None):
+        self.chunk_size = chunk_size or config.ANALYZE_JOB_CHUNK_SIZE
+        self.lease_seconds = lease_seconds or config.JOB_LEASE_SECONDS
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Jobs whose lease this process holds
+        self._owned: Set[str] = set()
+        self._token = uuid.uuid4().hex[:8]
+
+    @property
+    def owner(self) -> str:
+        """Lease owner id of this process (the pid keeps forked workers apart)"""
+        return f"{socket.gethostname()}:{os.getpid()}:{self._token}"
+
+    async def submit_analyze_all(self) -> Dict:
+        """
+        Queue an analyze-all job and return it immediately
+
+        Only one analyze-all job runs at a time; submitting while one is
+        unfinished returns the existing job.
+        """
+        total = await run_db(db.count_unanalyzed_feedback)
+        job = await run_db(db.create_job, uuid.uuid4().hex, ANALYZE_ALL, total)
+        self._schedule(job['job_id'])
+        return job
+
+    async def resume_unfinished(self):
+        """Restart any jobs left queued or running by a previous process"""
+        for job in await run_db(db.get_unfinished_jobs):
+            print(f"Resuming job {job['job_id']} ({job['processed']}/{job['total']}) "
+                  f"if no other worker holds it")
+            self._schedule(job['job_id'])
+
+    async def stop(self):
+        """Cancel running jobs and release their leases, so they resume on restart"""
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks = {}
+
+        for job_id in self._owned:
+            await run_db(db.release_job, job_id, self.owner)
+        self._owned = set()
+
+    def _schedule(self, job_id: str):
+        task = self._tasks.get(job_id)
+        if task is None or task.done():
+            self._tasks[job_id] = asyncio.get_running_loop().create_task(
+                self._run_analyze_all(job_id)
+            )
+
+    async def _claim(self, job_id: str) -> Optional[Dict]:
+        """
+        Wait until this process holds the job's lease
+
+        Returns:
+            The job row, or None once the job is finished (by another worker)
+        """
+        while True:
+            if await run_db(db.claim_job, job_id, self.owner, self.lease_seconds):
+                self._owned.add(job_id)
+                return await run_db(db.get_job, job_id)
+
+            job = await run_db(db.get_job, job_id)
+            if job is None or job['status'] not in ('queued', 'running'):
+                return None
+            # Another worker runs it; retry once its current lease runs out
+            await asyncio.sleep(max(0.0, (job['lease_until'] or 0) - time.time()) + 1)
+
+    async def _run_analyze_all(self, job_id: str):
+        """Score unanalyzed rows chunk by chunk, committing after each chunk"""
+        try:
+            job = await self._claim(job_id)
+            if job is None:
+                return
+            last_id = job['last_id']
+
+            while True:
+                rows = await run_db(db.get_unanalyzed_feedback,
+                                    after_id=last_id, limit=self.chunk_size)
+                if not rows:
+                    break
+
+                columns = await run_inference(analyze_texts_columnar,
+                                              [row['text'] for row in rows])
+                results = [
+                    {'id': row['id'], 'sentiment': sentiment, 'sentiment_score': sentiment_score,
+                     'intent': intent, 'intent_score': intent_score}
+                    for row, sentiment, sentiment_score, intent, intent_score in zip(
+                        rows, columns['sentiment'].tolist(), columns['sentiment_score'].tolist(),
+                        columns['intent'].tolist(), columns['intent_score'].tolist()
+                    )
+                ]
+
+                last_id = rows[-1]['id']
+                # Also renews the lease; fails if another worker took the job over
+                if not await run_db(db.save_job_chunk, job_id, self.owner, results, last_id,
+                                    self.lease_seconds):
+                    print(f"Job {job_id}: lease expired, another worker took it over")
+                    self._owned.discard(job_id)
+                    return
+
+            await run_db(db.finish_job, job_id, self.owner, 'completed')
+            self._owned.discard(job_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Job {job_id} failed: {e}")
+            await run_db(db.finish_job, job_id, self.owner, 'failed', str(e))
+            self._owned.discard(job_id)
+        finally:
+            self._tasks.pop(job_id, None)
+
+    async def get_status(self, job_id: str) -> Optional[Dict]:
+        """Job row plus derived throughput (rows/s) and ETA (seconds)"""
+        job = await run_db(db.get_job, job_id)
+        if job is None:
+            return None
+
+        throughput = 0.0
+        if job['started_at']:
+            started = datetime.fromisoformat(job['started_at'])
+            ended = datetime.fromisoformat(job['finished_at']) if job['finished_at'] else datetime.now()
+            elapsed = (ended - started).total_seconds()
+            if elapsed > 0:
+                throughput = (job['processed'] - job['processed_at_start']) / elapsed
+
+        eta_seconds = None
+        if job['status'] == 'running' and throughput > 0:
+            eta_seconds = max(0, job['total'] - job['processed']) / throughput
+
+        job['progress'] = min(1.0, job['processed'] / job['total']) if job['total'] else 1.0
+        job['throughput'] = round(throughput, 2)
+        job['eta_seconds'] = round(eta_seconds, 1) if eta_seconds is not None else None
+        return job
+
+
+# Singleton instance
+job_manager = JobManager()
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import socket
+import struct
+import threading
+import numpy as np
+import config
+
+# Every message is a 4-byte big-endian length followed by that many bytes of JSON
+FRAME_HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+
+
+class ModelServerError(RuntimeError):
+    """The model server could not be reached or failed to handle a request"""
+
+
+def encode_frame(message: dict) -> bytes:
+    payload = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def decode_frame_size(header: bytes) -> int:
+    (size,) = FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ModelServerError(f"Frame of {size} bytes exceeds {MAX_FRAME_SIZE}")
+    return size
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionResetError("Model server closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+class ModelServerClient:
+    """
+    Blocking client for backend/model_server.py
+
+    Callers run on the inference thread pool, so each thread keeps its own
+    connection with one request in flight; the server batches across all
+    connections of all API workers.
+    """
+
+    def __init__(self, socket_path: str = None, timeout: float = None):
+        self.socket_path = str(socket_path or config.MODEL_SERVER_SOCKET)
+        self.timeout = config.MODEL_SERVER_TIMEOUT if timeout is None else timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    def _disconnect(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def call(self, op: str, **params) -> dict:
+        """Send one request and wait for its reply"""
+        request = encode_frame({'op': op, **params})
+        # A dropped connection (e.g. the server restarted) is retried once
+        # on a new one; a timeout is not, since the server may still be working
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                sock.sendall(request)
+                reply = json.loads(_recv_exactly(sock, decode_frame_size(
+                    _recv_exactly(sock, FRAME_HEADER.size))))
+                break
+            except TimeoutError as e:
+                self._disconnect()
+                raise ModelServerError(f"Model server at {self.socket_path} timed out "
+                                       f"after {self.timeout}s") from e
+            except OSError as e:
+                self._disconnect()
+                if attempt:
+                    raise ModelServerError(f"Model server at {self.socket_path} "
+                                           f"unavailable: {e}") from e
+
+        if 'error' in reply:
+            raise ModelServerError(reply['error'])
+        return reply
+
+    def predict_columnar(self, token_lists: list) -> dict:
+        """ml.inference.predict_columnar, run by the model server"""
+        columns = self.call('predict', token_lists=token_lists)['columns']
+        return {
+            'sentiment': np.array(columns['sentiment'], dtype=str),
+            'sentiment_score': np.array(columns['sentiment_score'], dtype=np.float32),
+            'intent': np.array(columns['intent'], dtype=str),
+            'intent_score': np.array(columns['intent_score'], dtype=np.float32)
+        }
+
+    def reload(self, force: bool = False) -> dict:
+        """Hot-reload the server's models; same result as reload_serving_models"""
+        return self.call('reload', force=force)['result']
+
+    def status(self) -> dict:
+        """Server's model version, reload counters, cache and batching stats"""
+        return self.call('status')['status']
+
+    async def status_async(self, timeout: float = None) -> dict:
+        """
+        status() from the event loop, on its own short-lived connection
+
+        Health checks use this instead of the inference pool, so they never
+        queue behind analysis requests that may each take up to
+        MODEL_SERVER_TIMEOUT.
+
+        Args:
+            timeout: Seconds to wait for the reply
+                (default: config.MODEL_SERVER_STATUS_TIMEOUT)
+        """
+        timeout = config.MODEL_SERVER_STATUS_TIMEOUT if timeout is None else timeout
+        try:
+            reply = await asyncio.wait_for(self._request_async({'op': 'status'}), timeout)
+        except TimeoutError as e:
+            raise ModelServerError(f"Model server at {self.socket_path} did not report "
+                                   f"its status within {timeout}s") from e
+        except (OSError, asyncio.IncompleteReadError) as e:
+            raise ModelServerError(f"Model server at {self.socket_path} "
+                                   f"unavailable: {e}") from e
+
+        if 'error' in reply:
+            raise ModelServerError(reply['error'])
+        return reply['status']
+
+    async def _request_async(self, message: dict) -> dict:
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        try:
+            writer.write(encode_frame(message))
+            await writer.drain()
+            size = decode_frame_size(await reader.readexactly(FRAME_HEADER.size))
+            return json.loads(await reader.readexactly(size))
+        finally:
+            writer.close()
+
+    def close(self):
+        """Close this thread's connection"""
+        self._disconnect()
+
+
+# Singleton instance
+model_client = ModelServerClient()
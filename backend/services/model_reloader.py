@@ -0,0 +1,119 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from ml.inference import loaded_models, model_source, reload_serving_models
+from backend.services.model_client import model_client
+import config
+
+
+class ModelReloader:
+    """
+    Hot reload of the serving models
+
+    Loads run on a dedicated thread, so neither the event loop nor the
+    inference pool is blocked while a new version loads and warms up; see
+    ml.inference.reload_serving_models for the swap itself. When polling is
+    enabled, a watcher task reloads once changed model files have stayed
+    the same for one more poll (a retrain writes several files in turn).
+
+    With INFERENCE_MODE "server" the models live in the model server, which
+    runs its own watcher; API workers forward reloads and status to it.
+    """
+
+    def __init__(self, poll_seconds: float = None):
+        self.poll_seconds = (config.MODEL_RELOAD_POLL_SECONDS
+                             if poll_seconds is None else poll_seconds)
+        self.reloads = 0
+        self.failures = 0
+        self.last_reload: Optional[dict] = None
+        self.last_error: Optional[str] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-reload")
+        self._task: Optional[asyncio.Task] = None
+        # Changed source seen on the previous poll, and the last one that failed to load
+        self._pending = None
+        self._failed_source = None
+
+    def start(self):
+        """Start watching the model files on the running event loop (idempotent)"""
+        if config.INFERENCE_MODE == "server":
+            return
+        if self.poll_seconds > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=True)
+
+    async def reload(self, force: bool = False) -> dict:
+        """Load the model version on disk and swap it in; raises if it fails to load"""
+        loop = asyncio.get_running_loop()
+        reload = model_client.reload if config.INFERENCE_MODE == "server" else reload_serving_models
+        try:
+            result = await loop.run_in_executor(self._executor, functools.partial(reload, force))
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            raise
+
+        if result['reloaded']:
+            self.reloads += 1
+            print(f"✓ Model version {result['version']} swapped in after {result['seconds']:.2f}s")
+        self.last_reload = result
+        return result
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            models = loaded_models()
+            if models is None:
+                # Not loaded yet: the first request loads whatever is on disk
+                continue
+
+            source = model_source()
+            if source is None or source == models.source or source == self._failed_source:
+                self._pending = None
+                continue
+            if source != self._pending:
+                self._pending = source
+                continue
+
+            self._pending = None
+            try:
+                await self.reload()
+            except Exception as e:
+                self._failed_source = source
+                print(f"✗ Model reload failed, still serving {models.version}: {e}")
+
+    async def status(self) -> dict:
+        """stats() of the process that owns the models"""
+        if config.INFERENCE_MODE != "server":
+            return self.stats()
+        try:
+            # Not on the inference pool, where it would wait behind analysis calls
+            return (await model_client.status_async())['model']
+        except Exception as e:
+            return {"version": None, "error": str(e)}
+
+    def stats(self) -> dict:
+        models = loaded_models()
+        return {
+            "version": models.version if models is not None else None,
+            "loaded_at": models.loaded_at if models is not None else None,
+            "watching": self._task is not None and not self._task.done(),
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_reload": self.last_reload,
+            "last_error": self.last_error,
+            "cascade": models.cascade_stats() if models is not None else None,
+        }
+
+
+# Singleton instance
+model_reloader = ModelReloader()
@@ -0,0 +1,132 @@
+"""
+Benchmark for the micro-batching inference scheduler
+Compares batch-of-one inference against MicroBatcher at 1, 8 and 64 concurrent clients
+
+Usage:
+    python benchmarks/bench_batcher.py            # uses trained models if present
+    python benchmarks/bench_batcher.py --simulate # fixed-cost stand-in for model.predict
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import asyncio
+import os
+import time
+import config
+
+CONCURRENCY_LEVELS = [1, 8, 64]
+SAMPLE_TEXTS = [
+    "The app crashes after login. Very frustrating!",
+    "Love the new dark mode feature!",
+    "The app is slow and laggy",
+    "Please add calendar integration",
+    "The pricing is too expensive",
+]
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def simulated_process_batch(texts: list) -> list:
+    """Stand-in for analyze_texts: ~20 ms fixed cost per call plus 0.2 ms per item"""
+    time.sleep(0.020 + 0.0002 * len(texts))
+    return [{'sentiment': 'Neutral', 'sentiment_score': 0.5,
+             'intent': 'General Feedback', 'intent_score': 0.5} for _ in texts]
+
+
+def load_process_batch(simulate: bool):
+    """Return the batch function to benchmark"""
+    models_exist = (
+        os.path.exists(str(config.SENTIMENT_MODEL_PATH)) and
+        os.path.exists(str(config.INTENT_MODEL_PATH)) and
+        os.path.exists(str(config.TOKENIZER_PATH))
+    )
+    if simulate or not models_exist:
+        print("Using simulated model cost (20 ms/call + 0.2 ms/item)")
+        return simulated_process_batch
+
+    from ml.inference import analyze_texts, load_serving_models
+
+    load_serving_models()
+    analyze_texts(SAMPLE_TEXTS)  # warm up
+    return analyze_texts
+
+
+async def run_clients(call, concurrency: int, requests_per_client: int) -> dict:
+    """Run `concurrency` clients, each issuing sequential requests, and collect latencies"""
+    latencies = []
+
+    async def client(client_id: int):
+        for i in range(requests_per_client):
+            text = SAMPLE_TEXTS[(client_id + i) % len(SAMPLE_TEXTS)]
+            start = time.perf_counter()
+            await call(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(c) for c in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'throughput': len(latencies) / elapsed,
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+    }
+
+
+async def benchmark(process_batch, requests_per_client: int, max_batch_size: int,
+                    max_wait_ms: float):
+    from backend.services.batcher import MicroBatcher
+
+    loop = asyncio.get_running_loop()
+
+    async def unbatched(text):
+        return await loop.run_in_executor(None, process_batch, [text])
+
+    print(f"\n{'mode':<10}{'clients':>8}{'req/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    print("-" * 50)
+
+    for concurrency in CONCURRENCY_LEVELS:
+        batcher = MicroBatcher(process_batch, max_batch_size=max_batch_size,
+                               max_wait_ms=max_wait_ms)
+
+        for mode, call in (("unbatched", unbatched), ("batched", batcher.submit)):
+            stats = await run_clients(call, concurrency, requests_per_client)
+            print(f"{mode:<10}{concurrency:>8}{stats['throughput']:>12.1f}"
+                  f"{stats['p50']:>10.2f}{stats['p99']:>10.2f}")
+
+        await batcher.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--simulate", action="store_true",
+                        help="Use a fixed-cost stand-in instead of the trained models")
+    parser.add_argument("--requests", type=int, default=20,
+                        help="Sequential requests per client")
+    parser.add_argument("--max-batch-size", type=int, default=config.BATCH_MAX_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=config.BATCH_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("MICRO-BATCHING BENCHMARK")
+    print("=" * 60)
+    print(f"Window: {args.max_wait_ms} ms, max batch: {args.max_batch_size}")
+
+    process_batch = load_process_batch(args.simulate)
+    asyncio.run(benchmark(process_batch, args.requests, args.max_batch_size,
+                          args.max_wait_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Benchmark for loading the serving models from a model bundle
+Random-weight sentiment and intent models (config.MAX_VOCAB_SIZE words) are
+saved both the legacy way (.h5 models plus tokenizer / label encoder
+pickles) and as a bundle, then loaded in fresh interpreters:
+
+    legacy        SentimentModel / IntentModel.load_model from .h5 + pickles
+    keras bundle  SentimentModel / IntentModel.load_bundle
+    numpy bundle  NumpyClassifier.load_bundle (no TensorFlow import)
+
+Load time includes the imports each path needs. Then --workers NumPy
+processes load the same bundle at once and /proc/<pid>/smaps shows how much
+of the mapped weights file each one holds privately (Pss vs Rss).
+
+Usage:
+    python benchmarks/bench_bundle_load.py --workers 4
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import tempfile
+import time
+
+MODES = ["legacy", "keras bundle", "numpy bundle"]
+
+
+def write_artifacts(workdir: str, float16: bool):
+    """Random-weight models saved as .h5 + pickles and as a bundle in workdir"""
+    import numpy as np
+    from sklearn.preprocessing import LabelEncoder
+    from ml.sentiment_model import SentimentModel
+    from ml.intent_model import IntentModel
+    from ml.numpy_engine import NumpyTokenizer
+    from ml.bundle import write_bundle
+    import config
+
+    words = ['<OOV>'] + [f"word{index}" for index in range(config.MAX_VOCAB_SIZE)]
+    tokenizer = NumpyTokenizer({word: index + 1 for index, word in enumerate(words)},
+                               num_words=config.MAX_VOCAB_SIZE, oov_token='<OOV>')
+
+    contents, encoders = {}, {}
+    for name, model, classes in (
+        ("sentiment", SentimentModel(), config.SENTIMENT_CLASSES),
+        ("intent", IntentModel(), config.INTENT_CLASSES),
+    ):
+        model.build_model(config.MAX_VOCAB_SIZE, num_classes=len(classes))
+        model.model(np.zeros((1, 1), dtype=np.int32))  # build weights
+        model.model.save(os.path.join(workdir, f"{name}.h5"))
+        encoders[name] = LabelEncoder().fit(classes)
+        contents[name] = (model.model, classes)
+
+    with open(os.path.join(workdir, "tokenizer.pkl"), 'wb') as f:
+        pickle.dump(tokenizer, f)
+    with open(os.path.join(workdir, "label_encoders.pkl"), 'wb') as f:
+        pickle.dump(encoders, f)
+    write_bundle(contents, tokenizer, bundle_dir=os.path.join(workdir, "bundles"), float16=float16)
+
+
+def load(mode: str, workdir: str) -> list:
+    """Load both models the given way; returns the loaded model objects"""
+    from ml.bundle import load_bundle, current_bundle_path
+
+    if mode == "legacy":
+        from ml.sentiment_model import SentimentModel
+        from ml.intent_model import IntentModel
+
+        sentiment, intent = SentimentModel(), IntentModel()
+        sentiment.load_model(os.path.join(workdir, "sentiment.h5"),
+                             os.path.join(workdir, "tokenizer.pkl"),
+                             os.path.join(workdir, "label_encoders.pkl"))
+        intent.load_model(os.path.join(workdir, "intent.h5"),
+                          os.path.join(workdir, "label_encoders.pkl"))
+        intent.set_tokenizer(sentiment.tokenizer)
+        return [sentiment, intent]
+
+    bundle = load_bundle(current_bundle_path(os.path.join(workdir, "bundles")))
+    if mode == "keras bundle":
+        from ml.sentiment_model import SentimentModel
+        from ml.intent_model import IntentModel
+
+        models = [SentimentModel(), IntentModel()]
+    else:
+        from ml.numpy_engine import NumpyClassifier
+
+        models = [NumpyClassifier('sentiment'), NumpyClassifier('intent')]
+    for model in models:
+        model.load_bundle(bundle)
+    return models
+
+
+def worker(mode: str, workdir: str, hold: bool):
+    """Runs in a child process; prints one JSON line with its load time"""
+    start = time.perf_counter()
+    models = load(mode, workdir)
+    load_seconds = time.perf_counter() - start
+
+    if hold:
+        # Touch every weight page, report, then stay alive until the parent is done
+        for model in models:
+            for array in model.model.arrays.values():
+                float(array.sum())
+    print(json.dumps({'load_seconds': load_seconds}), flush=True)
+    if hold:
+        sys.stdin.read()
+
+
+def worker_command(mode: str, workdir: str, hold: bool = False) -> list:
+    command = [sys.executable, __file__, "--worker", mode, "--workdir", workdir]
+    return command + ["--hold"] if hold else command
+
+
+def result_line(output: str) -> dict:
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def mapped_kb(pid: int, filename: str) -> tuple:
+    """(Rss, Pss) in kB of a process's mappings of filename"""
+    rss = pss = 0
+    current = False
+    with open(f"/proc/{pid}/smaps") as f:
+        for line in f:
+            fields = line.split()
+            if '-' in fields[0] and len(fields) >= 5:
+                current = len(fields) >= 6 and fields[5].endswith(filename)
+            elif current and fields[0] == "Rss:":
+                rss += int(fields[1])
+            elif current and fields[0] == "Pss:":
+                pss += int(fields[1])
+    return rss, pss
+
+
+def measure_sharing(workdir: str, workers: int) -> list:
+    processes = [
+        subprocess.Popen(worker_command("numpy bundle", workdir, hold=True),
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                         stderr=subprocess.DEVNULL, text=True)
+        for _ in range(workers)
+    ]
+    try:
+        for process in processes:
+            # Wait for the JSON line that follows the load messages
+            while not process.stdout.readline().startswith('{'):
+                pass
+        return [mapped_kb(process.pid, "weights.bin") for process in processes]
+    finally:
+        for process in processes:
+            process.communicate("")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure model bundle load time and sharing")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--float16", action="store_true", help="write a float16 bundle")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    parser.add_argument("--hold", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.workdir, args.hold)
+        return
+
+    print("=" * 60)
+    print("MODEL BUNDLE LOADING")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        subprocess.run([sys.executable, "-c",
+                        f"import sys; sys.path.insert(0, {str(project_root)!r}); "
+                        f"from benchmarks.bench_bundle_load import write_artifacts; "
+                        f"write_artifacts({workdir!r}, {args.float16})"],
+                       check=True, capture_output=True)
+
+        legacy_mb = sum(os.path.getsize(os.path.join(workdir, name)) for name in
+                        ("sentiment.h5", "intent.h5", "tokenizer.pkl", "label_encoders.pkl")) / 1e6
+        bundle_dir = next(path for path in Path(workdir, "bundles").iterdir() if path.is_dir())
+        bundle_mb = sum(path.stat().st_size for path in bundle_dir.iterdir()) / 1e6
+        print(f"Artifacts: legacy {legacy_mb:.1f} MB, bundle {bundle_mb:.1f} MB"
+              f"{' (float16)' if args.float16 else ''}\n")
+
+        print(f"{'mode':<16}{'load s':>10}")
+        print("-" * 26)
+        for mode in MODES:
+            result = subprocess.run(worker_command(mode, workdir), capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"{mode} worker failed:\n{result.stderr[-2000:]}")
+            print(f"{mode:<16}{result_line(result.stdout)['load_seconds']:>10.2f}")
+
+        usage = measure_sharing(workdir, args.workers)
+
+    print(f"\nweights.bin in {args.workers} NumPy workers (kB):")
+    print(f"{'worker':<10}{'Rss':>10}{'Pss':>10}")
+    for index, (rss, pss) in enumerate(usage):
+        print(f"{index:<10}{rss:>10}{pss:>10}")
+    print(f"{'total':<10}{sum(rss for rss, _ in usage):>10}{sum(pss for _, pss in usage):>10}"
+          f"   (Pss total ~ one copy: the pages are shared)")
+
+
+if __name__ == "__main__":
+    main()
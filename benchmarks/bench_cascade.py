@@ -0,0 +1,168 @@
+"""
+Confidence-gated cascade: escalation rate, speedup and accuracy delta
+
+Trains the sentiment and intent LSTMs and the hashed bag-of-words linear
+first stages on the synthetic training data with the held-out split of
+bench_multitask, writes them to a scratch bundle and serves the held-out
+texts through ml.inference.ServingModels.predict_rows:
+
+    lstm      every text through both LSTMs (CASCADE_THRESHOLD = None)
+    cascade   linear stage first; texts below the threshold go to the LSTM
+
+The served traffic is both held-out sets in batches of --batch-size, with
+both tasks run on every text as the API does. For each threshold it
+reports the fraction of that traffic escalated per task (cascade_stats),
+held-out accuracy against the LSTM-only setup, and the speedup.
+
+Note: generate_training_data() adds punctuation variants of each sample, so
+near-duplicates can land on both sides of the split. Absolute accuracy is
+optimistic; the comparison between setups is still like-for-like.
+
+Usage:
+    python benchmarks/bench_cascade.py --backend numpy
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import tempfile
+import time
+import numpy as np
+from ml.sentiment_model import SentimentModel
+from ml.intent_model import IntentModel
+from ml.linear_model import LinearClassifier
+from ml.numpy_engine import NumpyClassifier
+from ml.bundle import ModelBundle, write_bundle
+from ml.inference import ServingModels
+from ml.nlp_pipeline import preprocess_batch
+from ml.train_models import generate_training_data, flatten_data, split_holdout
+import config
+
+THRESHOLDS = [0.5, 0.6, 0.7, 0.8, 0.9, 0.95]
+
+
+def time_call(fn, repeats: int) -> float:
+    """Median wall time of fn() in milliseconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def accuracy(models: ServingModels, token_lists: list, labels: list, column: int) -> float:
+    rows = models.predict_rows(token_lists)
+    return float(np.mean([row[column] == label for row, label in zip(rows, labels)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cascade escalation, speedup and accuracy")
+    parser.add_argument("--backend", choices=["keras", "numpy"], default="keras")
+    parser.add_argument("--epochs", type=int, default=15)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("CONFIDENCE-GATED CASCADE")
+    print("=" * 60)
+
+    sentiment_data, intent_data = generate_training_data()
+    s_texts, s_labels = flatten_data(sentiment_data)
+    i_texts, i_labels = flatten_data(intent_data)
+
+    s_train, s_train_y, s_test, s_test_y = split_holdout(
+        preprocess_batch(s_texts, return_string=False), s_labels)
+    i_train, i_train_y, i_test, i_test_y = split_holdout(
+        preprocess_batch(i_texts, return_string=False), i_labels)
+
+    # The LSTMs train on joined strings, as in train_models
+    sentiment = SentimentModel()
+    sentiment.train([' '.join(tokens) for tokens in s_train], s_train_y,
+                    epochs=args.epochs, validation_split=0.0)
+    intent = IntentModel()
+    intent.set_tokenizer(sentiment.tokenizer)
+    intent.train([' '.join(tokens) for tokens in i_train], i_train_y,
+                 epochs=args.epochs, validation_split=0.0)
+
+    linear_models = [LinearClassifier('sentiment').train(s_train, s_train_y),
+                     LinearClassifier('intent').train(i_train, i_train_y)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        contents = {
+            'sentiment': (sentiment.model, sentiment.label_encoder.classes_),
+            'intent': (intent.model, intent.label_encoder.classes_),
+        }
+        for linear in linear_models:
+            contents[linear.bundle_name] = (linear, linear.classes)
+        bundle = ModelBundle(write_bundle(contents, sentiment.tokenizer, bundle_dir=tmp,
+                                          activate=False))
+
+        if args.backend == "numpy":
+            sentiment, intent = NumpyClassifier('sentiment'), NumpyClassifier('intent')
+            sentiment.load_bundle(bundle)
+            intent.load_bundle(bundle)
+        sentiment.warmup()
+        intent.warmup()
+        sentiment_linear, intent_linear = LinearClassifier('sentiment'), LinearClassifier('intent')
+        sentiment_linear.load_bundle(bundle)
+        intent_linear.load_bundle(bundle)
+
+        def serving(threshold: float = None) -> ServingModels:
+            if threshold is None:
+                return ServingModels(None, "lstm", sentiment, intent)
+            return ServingModels(None, "cascade", sentiment, intent,
+                                 sentiment_linear=sentiment_linear, intent_linear=intent_linear,
+                                 threshold=threshold)
+
+        # Serving traffic: both held-out sets, in fixed-size batches
+        traffic = s_test + i_test
+        batches = [traffic[start:start + args.batch_size]
+                   for start in range(0, len(traffic), args.batch_size)]
+
+        def serve_all(models: ServingModels):
+            for batch in batches:
+                models.predict_rows(batch)
+
+        baseline = serving()
+        base_sentiment = accuracy(baseline, s_test, s_test_y, 0)
+        base_intent = accuracy(baseline, i_test, i_test_y, 2)
+        base_ms = time_call(lambda: serve_all(baseline), args.repeats)
+
+        linear_sentiment = float(np.mean(
+            sentiment_linear.predict(s_test, columnar=True)['sentiment'] == np.array(s_test_y)))
+        linear_intent = float(np.mean(
+            intent_linear.predict(i_test, columnar=True)['intent'] == np.array(i_test_y)))
+
+        print(f"\nBackend: {args.backend}, {len(s_test)} + {len(i_test)} held-out texts, "
+              f"batches of {args.batch_size}")
+        print(f"LSTM only:    sentiment {base_sentiment:.3f}, intent {base_intent:.3f}, "
+              f"{base_ms:.1f} ms for all batches")
+        print(f"Linear only:  sentiment {linear_sentiment:.3f}, intent {linear_intent:.3f}\n")
+
+        print(f"{'threshold':>10}{'escalated':>18}{'accuracy delta':>22}{'ms':>9}{'speedup':>10}")
+        print(f"{'':>10}{'sent.':>9}{'intent':>9}{'sent.':>11}{'intent':>11}")
+        print("-" * 69)
+        for threshold in THRESHOLDS:
+            models = serving(threshold)
+            serve_all(models)
+            stats = models.cascade_stats()
+            sentiment_acc = accuracy(models, s_test, s_test_y, 0)
+            intent_acc = accuracy(models, i_test, i_test_y, 2)
+            elapsed = time_call(lambda: serve_all(models), args.repeats)
+            print(f"{threshold:>10.2f}"
+                  f"{stats['sentiment_escalated']:>9.1%}{stats['intent_escalated']:>9.1%}"
+                  f"{sentiment_acc - base_sentiment:>+11.3f}{intent_acc - base_intent:>+11.3f}"
+                  f"{elapsed:>9.1f}{base_ms / elapsed:>9.1f}x")
+
+    print(f"\nServe it with config.CASCADE_THRESHOLD (currently {config.CASCADE_THRESHOLD}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Per-call overhead of FeedbackDatabase: connect-per-call vs persistent connections
+
+"before" opens a fresh sqlite3 connection (no pragmas) for every method call,
+like the original implementation. "after" uses the thread-local persistent
+connections with config.SQLITE_PRAGMAS applied once at open time.
+
+Usage:
+    python benchmarks/bench_db_connections.py --rows 5000 --calls 2000
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from backend.database.db import FeedbackDatabase
+
+
+class ConnectPerCallDatabase(FeedbackDatabase):
+    """Baseline: new connection for every call, default pragmas"""
+
+    def _thread_connection(self):
+        return sqlite3.connect(self.db_path)
+
+
+def populate(database: FeedbackDatabase, rows: int):
+    sources = ["Mobile App", "Web", "Support"]
+    sentiments = ["Positive", "Neutral", "Negative"]
+    conn = database.get_connection()
+    conn.executemany(
+        '''INSERT INTO feedback (feedback_id, text, source, date, sentiment, sentiment_score)
+           VALUES (?, ?, ?, ?, ?, ?)''',
+        [(f"F{i}", f"feedback text {i}", sources[i % 3], f"2025-12-{i % 28 + 1:02d}",
+          sentiments[i % 3], 0.5) for i in range(rows)]
+    )
+    conn.commit()
+
+
+def per_call_us(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure FeedbackDatabase per-call overhead")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("FEEDBACKDATABASE PER-CALL OVERHEAD")
+    print("=" * 60)
+    print(f"Rows: {args.rows}, calls per operation: {args.calls}\n")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, cls in (("before", ConnectPerCallDatabase), ("after", FeedbackDatabase)):
+            database = cls(os.path.join(tmp, f"{name}.db"))
+            populate(database, args.rows)
+            offset = args.rows
+
+            operations = {
+                "get_feedback_by_id": lambda i: database.get_feedback_by_id(f"F{i % args.rows}"),
+                "add_feedback": lambda i: database.add_feedback({
+                    'feedback_id': f"N{offset + i}", 'text': "new feedback",
+                    'source': "Web", 'date': "2025-12-31"
+                }),
+                "update_feedback_analysis": lambda i: database.update_feedback_analysis(
+                    f"F{i % args.rows}", "Positive", 0.9, "General Feedback", 0.8
+                ),
+                "get_source_distribution": lambda i: database.get_source_distribution(),
+            }
+            results[name] = {op: per_call_us(fn, args.calls) for op, fn in operations.items()}
+            database.close()
+
+    print(f"{'operation':<28}{'before us':>12}{'after us':>12}{'speedup':>10}")
+    print("-" * 62)
+    for op in results["before"]:
+        before, after = results["before"][op], results["after"][op]
+        print(f"{op:<28}{before:>12.1f}{after:>12.1f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
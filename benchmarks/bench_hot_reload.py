@@ -0,0 +1,191 @@
+"""
+Benchmark for hot model reload under load
+Writes two bundles with different random weights (vocabulary from
+data/sample_feedback.csv) to a scratch MODEL_BUNDLE_DIR, then runs
+--clients threads calling ml.inference.analyze_texts in a loop while the
+main thread flips CURRENT between the two bundles and calls
+reload_serving_models --reloads times.
+
+Every response is checked against the outputs of both versions: a batch
+must match one of them entirely (no request sees a half-swapped model),
+and no request may raise. Reports reload time and request latency while
+idle and while a reload is in progress.
+
+Usage:
+    python benchmarks/bench_hot_reload.py --backend numpy --clients 4 --reloads 10
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import csv
+import random
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter
+import numpy as np
+import config
+
+SAMPLE_PATH = config.BASE_DIR / "data" / "sample_feedback.csv"
+TOLERANCE = 1e-5
+
+
+def load_texts() -> list:
+    with open(SAMPLE_PATH, newline='', encoding='utf-8') as f:
+        return [row['text'] for row in csv.DictReader(f)]
+
+
+def write_versions(texts: list) -> list:
+    """Two bundles with the same vocabulary and different random weights"""
+    import keras
+    from ml.sentiment_model import SentimentModel
+    from ml.intent_model import IntentModel
+    from ml.numpy_engine import NumpyTokenizer
+    from ml.nlp_pipeline import preprocess_batch
+    from ml.bundle import write_bundle
+
+    counts = Counter(token for tokens in preprocess_batch(texts, return_string=False)
+                     for token in tokens)
+    word_index = {'<OOV>': 1, **{word: index + 2 for index, (word, _) in
+                                 enumerate(counts.most_common())}}
+    tokenizer = NumpyTokenizer(word_index, oov_token='<OOV>')
+
+    paths = []
+    for seed in (1, 2):
+        keras.utils.set_random_seed(seed)
+        sentiment, intent = SentimentModel(), IntentModel()
+        sentiment.build_model(len(word_index) + 1, num_classes=len(config.SENTIMENT_CLASSES))
+        intent.build_model(len(word_index) + 1, num_classes=len(config.INTENT_CLASSES))
+        for model in (sentiment, intent):
+            model.model(np.zeros((1, 1), dtype=np.int32))  # build weights
+        paths.append(write_bundle({
+            'sentiment': (sentiment.model, config.SENTIMENT_CLASSES),
+            'intent': (intent.model, config.INTENT_CLASSES),
+        }, tokenizer, activate=False))
+    return paths
+
+
+def matches(rows: list, expected: list) -> bool:
+    return all(
+        row['sentiment'] == want['sentiment'] and row['intent'] == want['intent']
+        and abs(row['sentiment_score'] - want['sentiment_score']) <= TOLERANCE
+        and abs(row['intent_score'] - want['intent_score']) <= TOLERANCE
+        for row, want in zip(rows, expected)
+    )
+
+
+def percentile(values: list, q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot model reload under load")
+    parser.add_argument("--backend", choices=["keras", "numpy"], default="numpy")
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--reloads", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="seconds of steady load between reloads")
+    parser.add_argument("--max-batch", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config.MODEL_BUNDLE_DIR = Path(tmp)
+        config.INFERENCE_BACKEND = args.backend
+        from ml import inference
+        from ml.bundle import activate_bundle
+
+        texts = load_texts()
+        versions = write_versions(texts)
+
+        # Outputs of each version, per text
+        expected = {}
+        for path in versions:
+            activate_bundle(path)
+            inference.reload_serving_models()
+            expected[inference.loaded_models().version] = dict(
+                zip(texts, inference.analyze_texts(texts)))
+        version_of = {path: version for path, version in zip(versions, expected)}
+
+        print("=" * 60)
+        print("HOT MODEL RELOAD UNDER LOAD")
+        print("=" * 60)
+        print(f"Backend: {args.backend}, {args.clients} client threads, {args.reloads} reloads, "
+              f"batches of 1-{args.max_batch} texts\n")
+
+        stop = threading.Event()
+        reloading = threading.Event()
+        lock = threading.Lock()
+        latencies = {'steady': [], 'during reload': []}
+        errors, mismatches, served = [], [], Counter()
+
+        def client(seed: int):
+            rng = random.Random(seed)
+            while not stop.is_set():
+                batch = rng.sample(texts, rng.randint(1, min(args.max_batch, len(texts))))
+                during = reloading.is_set()
+                start = time.perf_counter()
+                try:
+                    rows = inference.analyze_texts(batch)
+                except Exception as e:
+                    with lock:
+                        errors.append(repr(e))
+                    continue
+                elapsed = (time.perf_counter() - start) * 1000
+                answered = [version for version, outputs in expected.items()
+                            if matches(rows, [outputs[text] for text in batch])]
+                with lock:
+                    latencies['during reload' if during or reloading.is_set() else 'steady'].append(elapsed)
+                    if answered:
+                        served[answered[0]] += 1
+                    else:
+                        mismatches.append(batch)
+
+        threads = [threading.Thread(target=client, args=(seed,)) for seed in range(args.clients)]
+        for thread in threads:
+            thread.start()
+
+        reload_seconds = []
+        for index in range(args.reloads):
+            time.sleep(args.interval)
+            target = versions[index % 2]
+            activate_bundle(target)
+            reloading.set()
+            result = inference.reload_serving_models()
+            reloading.clear()
+            assert result['reloaded'] and result['version'] == version_of[target]
+            reload_seconds.append(result['seconds'])
+        time.sleep(args.interval)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    total = sum(served.values()) + len(mismatches) + len(errors)
+    print(f"{'reload (load + warm up + swap)':<34}median {statistics.median(reload_seconds):.2f}s, "
+          f"max {max(reload_seconds):.2f}s")
+    print(f"{'requests':<34}{total} ({', '.join(f'{count} on {version}' for version, count in served.items())})")
+    print(f"{'failed requests':<34}{len(errors)}")
+    print(f"{'mixed / wrong results':<34}{len(mismatches)}\n")
+
+    print(f"{'latency (ms)':<16}{'requests':>10}{'p50':>10}{'p99':>10}{'max':>10}")
+    print("-" * 56)
+    for phase, values in latencies.items():
+        print(f"{phase:<16}{len(values):>10}{percentile(values, 50):>10.1f}"
+              f"{percentile(values, 99):>10.1f}{max(values, default=0):>10.1f}")
+
+    if errors or mismatches:
+        print(f"\n✗ {len(errors)} failed, {len(mismatches)} wrong")
+        for error in errors[:5]:
+            print(f"  - {error}")
+        sys.exit(1)
+    print("\n✓ Every request was answered entirely by the old or the new models")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Import-time profile of the project's entry modules
+
+Imports each module in a fresh interpreter with `python -X importtime` and
+reports its cumulative import time plus the heaviest imports it pulls in.
+Importing the API or the ML modules should not load TensorFlow, download
+NLTK data or touch the database; those happen on first use.
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --runs 5 --top 5 --json
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+
+MODULES = [
+    "config",
+    "backend.database.db",
+    "ml.nlp_pipeline",
+    "ml.sentiment_model",
+    "ml.intent_model",
+    "ml.multitask_model",
+    "ml.inference",
+    "backend.routes.feedback",
+    "backend.main",
+]
+
+# Modules that should never be loaded just by importing the entry modules
+HEAVY_MODULES = ["tensorflow", "keras", "sklearn", "nltk"]
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+
+def profile_import(module: str) -> dict:
+    """Import `module` in a new interpreter and parse its -X importtime output"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(project_root), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"
+        return {'error': error}
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            _, cumulative, _, name = match.groups()
+            imports[name] = int(cumulative)
+
+    return {
+        'total_ms': imports.get(module, 0) / 1000,
+        'imports': imports,
+        'heavy': [name for name in HEAVY_MODULES if name in imports],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of entry modules")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=3, help="heaviest imports to list")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for module in MODULES:
+        runs = [profile_import(module) for _ in range(args.runs)]
+        last = runs[-1]
+        if 'error' in last:
+            results[module] = {'error': last['error']}
+            continue
+
+        own_children = sorted(
+            ((name, us / 1000) for name, us in last['imports'].items()
+             if name != module and '.' not in name),
+            key=lambda item: item[1], reverse=True
+        )
+        results[module] = {
+            'median_ms': round(statistics.median(run['total_ms'] for run in runs), 1),
+            'heavy_modules': last['heavy'],
+            'top_imports': [(name, round(ms, 1)) for name, ms in own_children[:args.top]],
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 60)
+    print("IMPORT TIME")
+    print("=" * 60)
+    print(f"Median of {args.runs} fresh interpreters per module\n")
+
+    print(f"{'module':<28}{'ms':>10}  heavy deps loaded")
+    print("-" * 60)
+    for module, result in results.items():
+        if 'error' in result:
+            print(f"{module:<28}{'-':>10}  import failed: {result['error']}")
+            continue
+        heavy = ', '.join(result['heavy_modules']) or '-'
+        print(f"{module:<28}{result['median_ms']:>10.1f}  {heavy}")
+
+    print("\nHeaviest top-level imports:")
+    for module, result in results.items():
+        if 'error' in result:
+            continue
+        top = ', '.join(f"{name} {ms:.0f}ms" for name, ms in result['top_imports'])
+        print(f"  {module:<26}{top}")
+
+
+if __name__ == "__main__":
+    main()
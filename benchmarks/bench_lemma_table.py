@@ -0,0 +1,97 @@
+"""
+Benchmark for the memoized token table in the NLP pipeline
+Preprocesses data/sample_feedback.csv scaled up to --rows rows and compares
+
+    legacy    separate punctuation / stopword / lemmatize passes with a
+              WordNet lookup per token (timed on --legacy-rows, extrapolated)
+    cold      merged single pass, table filled as tokens are first seen
+    prebuilt  merged single pass with a table built from the sample file
+              and loaded from disk, as after train_models
+
+Usage:
+    python benchmarks/bench_lemma_table.py --rows 1000000 --legacy-rows 20000
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+from itertools import cycle, islice
+from ml.nlp_pipeline import NLPPipeline
+import config
+
+SAMPLE_PATH = config.BASE_DIR / "data" / "sample_feedback.csv"
+
+
+def load_texts(rows: int) -> tuple:
+    with open(SAMPLE_PATH, newline='', encoding='utf-8') as f:
+        sample = [row['text'] for row in csv.DictReader(f)]
+    return list(islice(cycle(sample), rows)), sample
+
+
+def legacy_preprocess(pipeline: NLPPipeline, text: str) -> str:
+    """The pipeline before the token table: one pass per step, WordNet per token"""
+    tokens = pipeline.tokenize(pipeline.clean_text(text))
+    tokens = pipeline.remove_punctuation(tokens)
+    tokens = pipeline.remove_stopwords(tokens)
+    tokens = pipeline.lemmatize(tokens)
+    return ' '.join(token for token in tokens if token.strip())
+
+
+def timed(fn, texts: list) -> tuple:
+    start = time.perf_counter()
+    output = [fn(text) for text in texts]
+    return output, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memoized lemmatization")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--legacy-rows", type=int, default=20000,
+                        help="rows timed for the legacy path (extrapolated to --rows)")
+    args = parser.parse_args()
+
+    texts, sample = load_texts(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        table_path = os.path.join(tmp, "lemma_table.json")
+        cold = NLPPipeline(lemma_table_path=table_path)  # file doesn't exist yet
+
+        builder = NLPPipeline(lemma_table_path=table_path)
+        lemmas = builder.build_lemma_table(sample)
+        builder.save_lemma_table(table_path)
+        prebuilt = NLPPipeline(lemma_table_path=table_path)
+
+        print("=" * 60)
+        print("MEMOIZED LEMMATIZATION")
+        print("=" * 60)
+        print(f"{args.rows} rows from {SAMPLE_PATH.name} ({len(sample)} distinct), "
+              f"prebuilt table: {lemmas} lemmas\n")
+
+        subset = texts[:args.legacy_rows]
+        expected, legacy_s = timed(lambda text: legacy_preprocess(cold, text), subset)
+        legacy_rate = len(subset) / legacy_s
+
+        print(f"{'path':<10}{'texts/s':>10}{'total s':>10}{'speedup':>10}")
+        print("-" * 40)
+        print(f"{'legacy':<10}{legacy_rate:>10.0f}{args.rows / legacy_rate:>9.1f}*{1.0:>9.2f}x")
+
+        for name, pipeline in (("cold", cold), ("prebuilt", prebuilt)):
+            output, elapsed = timed(pipeline.preprocess_text, texts)
+            assert output[:len(subset)] == expected, f"{name} output differs from legacy"
+            rate = args.rows / elapsed
+            print(f"{name:<10}{rate:>10.0f}{elapsed:>10.1f}{rate / legacy_rate:>9.2f}x")
+
+        print("\n* extrapolated from the legacy rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark for length-bucketed padding
+Compares padding every batch to MAX_SEQUENCE_LENGTH against length-bucketed
+padding (config.LENGTH_BUCKETS) for the Keras and NumPy backends, both with
+one call per batch ("batch": padded to the bucket of its longest text) and
+one call per bucket ("split")
+
+Sequence lengths follow a log-normal distribution with a median of ~10
+tokens and a long tail, clipped to 1..150. That matches preprocessed
+customer feedback: most texts are 5-20 tokens, with a few long reviews.
+Models use random weights with the training architecture (mask_zero=True).
+
+Usage:
+    python benchmarks/bench_length_buckets.py --texts 2000 --batch-size 64
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import tempfile
+import time
+import numpy as np
+from ml.sentiment_model import SentimentModel
+from ml.intent_model import IntentModel
+from ml.numpy_engine import NumpyClassifier, NumpyTokenizer
+from ml.bundle import write_bundle
+from ml.padding import predict_bucketed, length_buckets
+from ml.serving import ServingFunction
+import config
+
+VOCAB_SIZE = 2000
+
+
+def realistic_sequences(count: int, seed: int = 0) -> list:
+    """Token id lists with a log-normal length distribution (median ~10)"""
+    rng = np.random.default_rng(seed)
+    lengths = np.clip(np.round(rng.lognormal(np.log(10), 0.6, size=count)), 1, 150).astype(int)
+    return [list(rng.integers(1, VOCAB_SIZE, size=length)) for length in lengths]
+
+
+def run(predict, sequences: list, buckets: list, batch_size: int, split: bool = True) -> tuple:
+    """Predict in batches like analyze_texts does; return (outputs, seconds)"""
+    start = time.perf_counter()
+    outputs = [
+        predict_bucketed(predict, sequences[i:i + batch_size], buckets, split=split)
+        for i in range(0, len(sequences), batch_size)
+    ]
+    return np.concatenate(outputs), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure length-bucketed padding")
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    sequences = realistic_sequences(args.texts)
+    lengths = np.array([min(len(s), config.MAX_SEQUENCE_LENGTH) for s in sequences])
+    full = [config.MAX_SEQUENCE_LENGTH]
+    bucketed = length_buckets(config.MAX_SEQUENCE_LENGTH)
+
+    print("=" * 60)
+    print("LENGTH-BUCKETED PADDING")
+    print("=" * 60)
+    print(f"Texts: {args.texts}, batch size: {args.batch_size}")
+    print(f"Token lengths: median {np.median(lengths):.0f}, p90 {np.percentile(lengths, 90):.0f}, "
+          f"max {lengths.max()}")
+    print(f"Buckets: {bucketed}\n")
+
+    print(f"{'model':<20}{'full ms':>9}{'batch ms':>10}{'split ms':>10}"
+          f"{'best':>8}{'max |diff|':>12}")
+    print("-" * 69)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, model, classes in (
+            ("sentiment", SentimentModel(), config.SENTIMENT_CLASSES),
+            ("intent", IntentModel(), config.INTENT_CLASSES),
+        ):
+            model.build_model(VOCAB_SIZE, num_classes=len(classes))
+            model.model(np.zeros((1, 1), dtype=np.int32), training=False)  # build weights
+            keras_predict = ServingFunction(model.model, config.MAX_SEQUENCE_LENGTH)
+
+            path = write_bundle({name: (model.model, classes)}, NumpyTokenizer({}),
+                                bundle_dir=tmp, activate=False)
+            engine = NumpyClassifier(name)
+            engine.load_bundle(path)
+
+            for backend, predict in (("keras", keras_predict), ("numpy", engine.model.predict)):
+                # Warm up every bucket shape once
+                run(predict, sequences[:args.batch_size * 2], bucketed, args.batch_size)
+                run(predict, sequences[:args.batch_size], full, args.batch_size)
+
+                expected, full_seconds = run(predict, sequences, full, args.batch_size)
+                batch_out, batch_seconds = run(predict, sequences, bucketed, args.batch_size,
+                                               split=False)
+                split_out, split_seconds = run(predict, sequences, bucketed, args.batch_size)
+                max_diff = max(float(np.max(np.abs(expected - batch_out))),
+                               float(np.max(np.abs(expected - split_out))))
+                print(f"{f'{name} ({backend})':<20}{full_seconds * 1000:>9.0f}"
+                      f"{batch_seconds * 1000:>10.0f}{split_seconds * 1000:>10.0f}"
+                      f"{full_seconds / min(batch_seconds, split_seconds):>7.1f}x"
+                      f"{max_diff:>12.1e}")
+
+
+if __name__ == "__main__":
+    main()
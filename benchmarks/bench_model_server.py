@@ -0,0 +1,237 @@
+"""
+Benchmark for the shared model server (INFERENCE_MODE = "server")
+Starts --workers API worker processes and compares
+
+    local   every worker loads TensorFlow and both models (backend/main.py
+            with PRELOAD_MODELS), as with `uvicorn --workers N` today
+    server  one backend/model_server.py process owns the models; workers
+            preprocess and send token lists over the Unix socket
+
+Each worker runs config.INFERENCE_WORKERS threads calling
+backend.services.analysis.analyze_texts on --batch-size texts from
+data/sample_feedback.csv for --seconds, like the inference pool of an API
+worker. Models are random-weight bundles; the prediction cache is off so
+every text reaches a model. Memory is the Pss sum of all processes
+(shared pages counted once).
+
+Usage:
+    python benchmarks/bench_model_server.py --workers 4 --seconds 20
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import csv
+import json
+import os
+import random
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from collections import Counter
+import config
+
+SAMPLE_PATH = config.BASE_DIR / "data" / "sample_feedback.csv"
+
+
+def configure(workdir: str, backend: str, mode: str):
+    """Point this process's config at the scratch bundle and socket"""
+    config.MODEL_BUNDLE_DIR = Path(workdir) / "bundles"
+    config.MODEL_SERVER_SOCKET = Path(workdir) / "model_server.sock"
+    config.INFERENCE_BACKEND = backend
+    config.INFERENCE_MODE = mode
+    config.PREDICTION_CACHE_SIZE = 0
+    config.PREDICTION_CACHE_SQLITE = False
+    config.MODEL_RELOAD_POLL_SECONDS = 0
+
+
+def load_texts() -> list:
+    with open(SAMPLE_PATH, newline='', encoding='utf-8') as f:
+        return [row['text'] for row in csv.DictReader(f)]
+
+
+def write_models(workdir: str):
+    """Random-weight sentiment and intent models as the current bundle"""
+    import numpy as np
+    from ml.sentiment_model import SentimentModel
+    from ml.intent_model import IntentModel
+    from ml.numpy_engine import NumpyTokenizer
+    from ml.bundle import write_bundle
+
+    counts = Counter(word for text in load_texts() for word in re.findall(r"\w+", text.lower()))
+    word_index = {'<OOV>': 1, **{word: index + 2 for index, (word, _) in
+                                 enumerate(counts.most_common())}}
+
+    contents = {}
+    for name, model, classes in (
+        ("sentiment", SentimentModel(), config.SENTIMENT_CLASSES),
+        ("intent", IntentModel(), config.INTENT_CLASSES),
+    ):
+        model.build_model(config.MAX_VOCAB_SIZE, num_classes=len(classes))
+        model.model(np.zeros((1, 1), dtype=np.int32))  # build weights
+        contents[name] = (model.model, classes)
+    write_bundle(contents, NumpyTokenizer(word_index, oov_token='<OOV>'))
+
+
+def pss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def worker(seconds: float, batch_size: int, seed: int):
+    """API worker stand-in: load (local mode), report ready, run on 'go', report counts"""
+    from backend.services.analysis import analyze_texts
+    from ml.inference import load_serving_models
+
+    if config.INFERENCE_MODE == "local":
+        load_serving_models()
+    texts = load_texts()
+    print("ready", flush=True)
+    sys.stdin.readline()
+
+    counts = Counter()
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def run(thread_seed: int):
+        rng = random.Random(thread_seed)
+        while time.perf_counter() < deadline:
+            analyze_texts(rng.sample(texts, batch_size))
+            with lock:
+                counts['requests'] += 1
+                counts['texts'] += batch_size
+
+    threads = [threading.Thread(target=run, args=(seed * 100 + index,))
+               for index in range(config.INFERENCE_WORKERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(json.dumps(counts), flush=True)
+    sys.stdin.readline()  # stay alive until the parent has measured memory
+
+
+def spawn(role: str, args, mode: str, seed: int = 0) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, __file__, "--role", role, "--mode", mode, "--workdir", args.workdir,
+         "--backend", args.backend, "--seconds", str(args.seconds),
+         "--batch-size", str(args.batch_size), "--seed", str(seed)],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+
+
+def wait_for(process: subprocess.Popen, prefix: str) -> str:
+    """Read the process's output until a line starting with prefix"""
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Process {process.pid} exited before printing {prefix!r}")
+        if line.startswith(prefix):
+            return line
+
+
+def run_mode(mode: str, args) -> dict:
+    server = None
+    if mode == "server":
+        server = spawn("server", args, mode)
+        wait_for(server, "Listening on")
+
+    workers = [spawn("worker", args, mode, seed) for seed in range(args.workers)]
+    try:
+        start = time.perf_counter()
+        for process in workers:
+            wait_for(process, "ready")
+        ready_seconds = time.perf_counter() - start
+
+        for process in workers:
+            process.stdin.write("go\n")
+            process.stdin.flush()
+        counts = [json.loads(wait_for(process, "{")) for process in workers]
+
+        processes = workers + ([server] if server else [])
+        memory = sum(pss_mb(process.pid) for process in processes)
+        server_memory = pss_mb(server.pid) if server else 0.0
+    finally:
+        for process in workers:
+            process.communicate("exit\n")
+        if server:
+            server.terminate()
+            server.communicate()
+
+    return {
+        'ready_seconds': ready_seconds,
+        'pss_mb': memory,
+        'server_pss_mb': server_memory,
+        'texts_per_second': sum(count['texts'] for count in counts) / args.seconds,
+        'requests': sum(count['requests'] for count in counts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker models vs a shared model server")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--backend", choices=["keras", "numpy"], default="keras")
+    parser.add_argument("--role", choices=["server", "worker"], help=argparse.SUPPRESS)
+    parser.add_argument("--mode", choices=["local", "server"], help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    parser.add_argument("--seed", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.role:
+        configure(args.workdir, args.backend, args.mode)
+        if args.role == "server":
+            import asyncio
+            from backend.model_server import ModelServer
+
+            asyncio.run(ModelServer().serve())
+        else:
+            worker(args.seconds, args.batch_size, args.seed)
+        return
+
+    print("=" * 60)
+    print("SHARED MODEL SERVER VS PER-WORKER MODELS")
+    print("=" * 60)
+    print(f"{args.workers} workers x {config.INFERENCE_WORKERS} threads, backend {args.backend}, "
+          f"{args.batch_size} texts per request, {args.seconds:.0f}s, {os.cpu_count()} CPUs\n")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        args.workdir = workdir
+        configure(workdir, args.backend, "local")
+        subprocess.run([sys.executable, "-c",
+                        f"import sys; sys.path.insert(0, {str(project_root)!r}); "
+                        f"from benchmarks import bench_model_server as bench; "
+                        f"bench.configure({workdir!r}, {args.backend!r}, 'local'); "
+                        f"bench.write_models({workdir!r})"],
+                       check=True, capture_output=True)
+
+        results = {mode: run_mode(mode, args) for mode in ("local", "server")}
+
+    local, server = results["local"], results["server"]
+    print(f"{'':<26}{'local':>12}{'server':>12}{'ratio':>10}")
+    print("-" * 60)
+    print(f"{'workers ready (s)':<26}{local['ready_seconds']:>12.1f}{server['ready_seconds']:>12.1f}"
+          f"{local['ready_seconds'] / server['ready_seconds']:>9.1f}x")
+    print(f"{'total Pss (MB)':<26}{local['pss_mb']:>12.0f}{server['pss_mb']:>12.0f}"
+          f"{local['pss_mb'] / server['pss_mb']:>9.1f}x")
+    print(f"{'  of which server (MB)':<26}{'':>12}{server['server_pss_mb']:>12.0f}")
+    print(f"{'throughput (texts/s)':<26}{local['texts_per_second']:>12.0f}"
+          f"{server['texts_per_second']:>12.0f}"
+          f"{server['texts_per_second'] / local['texts_per_second']:>9.1f}x")
+    print(f"{'requests':<26}{local['requests']:>12}{server['requests']:>12}")
+
+
+if __name__ == "__main__":
+    main()
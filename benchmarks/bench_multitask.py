@@ -0,0 +1,112 @@
+"""
+Latency and accuracy comparison: separate sentiment/intent models vs the
+shared-encoder multi-task model
+
+Trains fresh instances of both setups on the synthetic training data with
+an identical held-out split, then reports held-out accuracy and predict
+latency at batch sizes 1, 8 and 64. Nothing is written to ml/models.
+
+Note: generate_training_data() adds punctuation variants of each sample, so
+near-duplicates can land on both sides of the split. Absolute accuracy is
+optimistic; the comparison between setups is still like-for-like.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import time
+import numpy as np
+from ml.sentiment_model import SentimentModel
+from ml.intent_model import IntentModel
+from ml.multitask_model import MultiTaskModel
+from ml.nlp_pipeline import preprocess_batch
+from ml.train_models import generate_training_data, flatten_data, split_holdout
+
+BATCH_SIZES = [1, 8, 64]
+
+
+def time_call(fn, repeats: int) -> float:
+    """Median wall time of fn() in milliseconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def accuracy(predictions: list, key: str, labels: list) -> float:
+    return float(np.mean([p[key] == label for p, label in zip(predictions, labels)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two-model and multi-task setups")
+    parser.add_argument("--epochs", type=int, default=15)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("MULTI-TASK vs TWO-MODEL COMPARISON")
+    print("=" * 60)
+
+    sentiment_data, intent_data = generate_training_data()
+    s_texts, s_labels = flatten_data(sentiment_data)
+    i_texts, i_labels = flatten_data(intent_data)
+
+    s_train, s_train_y, s_test, s_test_y = split_holdout(preprocess_batch(s_texts), s_labels)
+    i_train, i_train_y, i_test, i_test_y = split_holdout(preprocess_batch(i_texts), i_labels)
+
+    # Two-model setup
+    sentiment = SentimentModel()
+    sentiment.train(s_train, s_train_y, epochs=args.epochs, validation_split=0.0)
+    intent = IntentModel()
+    intent.set_tokenizer(sentiment.tokenizer)
+    intent.train(i_train, i_train_y, epochs=args.epochs, validation_split=0.0)
+
+    # Fused setup with the same tokenizer
+    fused = MultiTaskModel()
+    fused.set_tokenizer(sentiment.tokenizer)
+    fused.train(s_train, s_train_y, i_train, i_train_y,
+                epochs=args.epochs, validation_split=0.0)
+
+    fused_sentiment, _ = fused.predict(s_test)
+    _, fused_intent = fused.predict(i_test)
+
+    print("\nHeld-out accuracy")
+    print(f"{'setup':<12}{'sentiment':>12}{'intent':>12}")
+    print("-" * 36)
+    print(f"{'two-model':<12}"
+          f"{accuracy(sentiment.predict(s_test), 'sentiment', s_test_y):>12.4f}"
+          f"{accuracy(intent.predict(i_test), 'intent', i_test_y):>12.4f}")
+    print(f"{'multi-task':<12}"
+          f"{accuracy(fused_sentiment, 'sentiment', s_test_y):>12.4f}"
+          f"{accuracy(fused_intent, 'intent', i_test_y):>12.4f}")
+
+    print("\nPredict latency (median ms, sentiment + intent)")
+    print(f"{'batch':>6}{'two-model':>12}{'multi-task':>12}{'speedup':>10}")
+    print("-" * 40)
+    pool = s_test + i_test
+    for batch_size in BATCH_SIZES:
+        batch = [pool[i % len(pool)] for i in range(batch_size)]
+
+        def two_model():
+            sentiment.predict(batch)
+            intent.predict(batch)
+
+        # Warm up both paths before timing
+        two_model()
+        fused.predict(batch)
+
+        separate_ms = time_call(two_model, args.repeats)
+        fused_ms = time_call(lambda: fused.predict(batch), args.repeats)
+        print(f"{batch_size:>6}{separate_ms:>12.2f}{fused_ms:>12.2f}"
+              f"{separate_ms / fused_ms:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Keras vs NumPy inference backend: startup time, peak memory and latency
+
+Each backend runs in its own fresh interpreter so peak RSS and startup time
+include everything it imports. The Keras worker loads the trained models
+(or builds random-weight ones if none are trained), writes them as a model
+bundle in a scratch directory, and the NumPy worker loads that bundle. Latency is the
+forward pass of both models on padded token ids, at batch 1, 8 and 64.
+
+Usage:
+    python benchmarks/bench_numpy_engine.py --repeats 20
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import tempfile
+import time
+
+BATCH_SIZES = [1, 8, 64]
+VOCAB_SIZE = 2000
+
+
+def random_ids(batch: int):
+    import numpy as np
+    import config
+
+    rng = np.random.default_rng(batch)
+    X = np.zeros((batch, config.MAX_SEQUENCE_LENGTH), dtype=np.int32)
+    for row in range(batch):
+        length = rng.integers(5, 40)
+        X[row, :length] = rng.integers(1, VOCAB_SIZE, size=length)
+    return X
+
+
+def load_keras(workdir: str) -> tuple:
+    """Trained Keras models if present, otherwise random weights; bundled in workdir"""
+    import config
+    from ml.sentiment_model import sentiment_model
+    from ml.intent_model import intent_model
+    from ml.numpy_engine import NumpyTokenizer
+    from ml.bundle import write_bundle
+
+    trained = all(os.path.exists(str(path)) for path in
+                  (config.SENTIMENT_MODEL_PATH, config.INTENT_MODEL_PATH, config.TOKENIZER_PATH))
+    if trained:
+        sentiment_model.load_model()
+        intent_model.load_model()
+    else:
+        sentiment_model.build_model(VOCAB_SIZE, num_classes=len(config.SENTIMENT_CLASSES))
+        intent_model.build_model(VOCAB_SIZE, num_classes=len(config.INTENT_CLASSES))
+        # Run once so the layers create their weights
+        sentiment_model.model.predict(random_ids(1), verbose=0)
+        intent_model.model.predict(random_ids(1), verbose=0)
+
+    write_bundle({
+        'sentiment': (sentiment_model.model, config.SENTIMENT_CLASSES),
+        'intent': (intent_model.model, config.INTENT_CLASSES),
+    }, NumpyTokenizer({}), bundle_dir=workdir)
+
+    return (lambda X: sentiment_model.model.predict(X, verbose=0),
+            lambda X: intent_model.model.predict(X, verbose=0)), trained
+
+
+def load_numpy(workdir: str) -> tuple:
+    from ml.numpy_engine import NumpyClassifier
+    from ml.bundle import load_bundle, current_bundle_path
+
+    bundle = load_bundle(current_bundle_path(workdir))
+    models = []
+    for name in ("sentiment", "intent"):
+        model = NumpyClassifier(name)
+        model.load_bundle(bundle)
+        models.append(model)
+
+    return (models[0].model.predict, models[1].model.predict), None
+
+
+def worker(backend: str, workdir: str, repeats: int):
+    """Runs in a child process; prints one JSON line with its measurements"""
+    start = time.perf_counter()
+    (predict_sentiment, predict_intent), trained = (
+        load_keras(workdir) if backend == "keras" else load_numpy(workdir)
+    )
+    load_seconds = time.perf_counter() - start
+
+    latency = {}
+    for batch in BATCH_SIZES:
+        X = random_ids(batch)
+        predict_sentiment(X)
+        predict_intent(X)  # warm up
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            predict_sentiment(X)
+            predict_intent(X)
+            timings.append((time.perf_counter() - start) * 1000)
+        latency[batch] = statistics.median(timings)
+
+    print(json.dumps({
+        'load_seconds': load_seconds,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'latency_ms': latency,
+        'trained': trained,
+    }))
+
+
+def run_worker(backend: str, workdir: str, repeats: int) -> dict:
+    result = subprocess.run(
+        [sys.executable, __file__, "--worker", backend, "--workdir", workdir,
+         "--repeats", str(repeats)],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{backend} worker failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Keras and NumPy inference backends")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--worker", choices=["keras", "numpy"], help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.workdir, args.repeats)
+        return
+
+    print("=" * 60)
+    print("KERAS VS NUMPY INFERENCE BACKEND")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Keras first: it writes the bundle the NumPy worker loads
+        results = {"keras": run_worker("keras", workdir, args.repeats)}
+        results["numpy"] = run_worker("numpy", workdir, args.repeats)
+
+    weights = "trained" if results["keras"]["trained"] else "random (no trained models found)"
+    print(f"Weights: {weights}, median of {args.repeats} runs, sentiment + intent\n")
+
+    keras, numpy_ = results["keras"], results["numpy"]
+    print(f"{'':<22}{'keras':>12}{'numpy':>12}{'ratio':>10}")
+    print("-" * 56)
+    print(f"{'startup (s)':<22}{keras['load_seconds']:>12.2f}{numpy_['load_seconds']:>12.2f}"
+          f"{keras['load_seconds'] / numpy_['load_seconds']:>9.1f}x")
+    print(f"{'peak RSS (MB)':<22}{keras['peak_rss_mb']:>12.0f}{numpy_['peak_rss_mb']:>12.0f}"
+          f"{keras['peak_rss_mb'] / numpy_['peak_rss_mb']:>9.1f}x")
+    for batch in BATCH_SIZES:
+        k, n = keras['latency_ms'][str(batch)], numpy_['latency_ms'][str(batch)]
+        print(f"{f'latency b={batch} (ms)':<22}{k:>12.2f}{n:>12.2f}{k / n:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark for prediction post-processing
+Compares the per-row inverse_transform loop the model classes used to run
+with ml.postprocess.decode_predictions (row dicts and columnar arrays)
+
+Usage:
+    python benchmarks/bench_postprocess.py --repeats 5
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import time
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+from ml.postprocess import class_names, decode_predictions
+import config
+
+BATCH_SIZES = [64, 1000, 10000]
+
+
+def legacy_decode(predictions: np.ndarray, label_encoder, key: str) -> list:
+    """The original per-row loop: one inverse_transform per row plus one per class"""
+    results = []
+    for pred in predictions:
+        class_idx = np.argmax(pred)
+        confidence = float(pred[class_idx])
+        label = label_encoder.inverse_transform([class_idx])[0]
+
+        results.append({
+            key: label,
+            'confidence': confidence,
+            'probabilities': {
+                label_encoder.inverse_transform([i])[0]: float(pred[i])
+                for i in range(len(pred))
+            }
+        })
+    return results
+
+
+def best_ms(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure prediction post-processing")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    encoder = LabelEncoder().fit(config.INTENT_CLASSES)
+    classes = class_names(encoder)
+    rng = np.random.default_rng(0)
+
+    print("=" * 60)
+    print("PREDICTION POST-PROCESSING")
+    print("=" * 60)
+    print(f"{len(classes)} classes (intent head), best of {args.repeats} runs\n")
+
+    print(f"{'rows':>8}{'legacy ms':>12}{'dicts ms':>12}{'columnar ms':>14}{'speedup':>10}")
+    print("-" * 56)
+    for rows in BATCH_SIZES:
+        logits = rng.normal(size=(rows, len(classes))).astype(np.float32)
+        predictions = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+
+        expected = legacy_decode(predictions, encoder, 'intent')
+        actual = decode_predictions(predictions, classes, 'intent')
+        assert expected == actual, "vectorized decoding differs from the legacy loop"
+
+        legacy = best_ms(lambda: legacy_decode(predictions, encoder, 'intent'), args.repeats)
+        dicts = best_ms(lambda: decode_predictions(predictions, classes, 'intent'), args.repeats)
+        columnar = best_ms(lambda: decode_predictions(predictions, classes, 'intent', columnar=True),
+                           args.repeats)
+        print(f"{rows:>8}{legacy:>12.2f}{dicts:>12.2f}{columnar:>14.3f}"
+              f"{legacy / dicts:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
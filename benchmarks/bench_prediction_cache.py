@@ -0,0 +1,117 @@
+"""
+Benchmark for the prediction cache
+Streams batches drawn from a Zipf-distributed pool of normalized texts through
+ml.prediction_cache.PredictionCache and compares against calling the model
+for every row. The model is a fixed-cost stand-in (5 ms/call + 0.2 ms/row).
+
+    none        every row goes to the model
+    lru         in-process LRU tier only
+    lru+sqlite  LRU plus the shared SQLite tier
+    2nd worker  a fresh process-local LRU reading the SQLite tier the
+                previous run filled (what another uvicorn worker sees)
+
+Usage:
+    python benchmarks/bench_prediction_cache.py --batches 200 --pool 20000 --lru-size 2000
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from ml.prediction_cache import PredictionCache
+
+BATCH_SIZE = 64
+MODEL_VERSION = "bench"
+
+
+def expected_rows(texts: list) -> list:
+    return [('Neutral', 0.5, 'General Feedback', float(len(text))) for text in texts]
+
+
+def simulated_predict(texts: list) -> list:
+    """Stand-in for the two models: 5 ms fixed cost per call plus 0.2 ms per row"""
+    time.sleep(0.005 + 0.0002 * len(texts))
+    return expected_rows(texts)
+
+
+def make_batches(pool: int, batches: int, zipf: float, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    ids = rng.zipf(zipf, size=(batches, BATCH_SIZE)) % pool
+    return [[f"normalized feedback text {i}" for i in row] for row in ids.tolist()]
+
+
+def run(predict, batches: list) -> float:
+    start = time.perf_counter()
+    for batch in batches:
+        rows = predict(batch)
+        assert rows == expected_rows(batch), "cached rows differ"
+    return (time.perf_counter() - start) * 1000 / len(batches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the prediction cache")
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--pool", type=int, default=20000, help="distinct normalized texts")
+    parser.add_argument("--zipf", type=float, default=1.3, help="Zipf exponent of text popularity")
+    parser.add_argument("--lru-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    batches = make_batches(args.pool, args.batches, args.zipf)
+    distinct = len({text for batch in batches for text in batch})
+
+    print("=" * 60)
+    print("PREDICTION CACHE")
+    print("=" * 60)
+    print(f"{args.batches} batches of {BATCH_SIZE}, {distinct} distinct texts, "
+          f"LRU size {args.lru_size}\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_path = os.path.join(tmp, "prediction_cache.db")
+        caches = {
+            'lru': PredictionCache(max_entries=args.lru_size),
+            'lru+sqlite': PredictionCache(max_entries=args.lru_size, sqlite_path=sqlite_path),
+        }
+        for cache in caches.values():
+            cache.set_model_version(MODEL_VERSION)
+
+        print(f"{'tier':<12}{'ms/batch':>10}{'hit rate':>10}{'evictions':>11}{'sqlite hits':>13}")
+        print("-" * 56)
+        baseline = run(simulated_predict, batches)
+        print(f"{'none':<12}{baseline:>10.2f}{'-':>10}{'-':>11}{'-':>13}")
+
+        for name, cache in caches.items():
+            ms = run(lambda texts, c=cache: c.predict(texts, simulated_predict), batches)
+            stats = cache.stats()
+            print(f"{name:<12}{ms:>10.2f}{stats['hit_rate']:>10.1%}{stats['evictions']:>11}"
+                  f"{stats['sqlite']['hits']:>13}")
+
+        worker = PredictionCache(max_entries=args.lru_size, sqlite_path=sqlite_path)
+        worker.set_model_version(MODEL_VERSION)
+        ms = run(lambda texts: worker.predict(texts, simulated_predict), batches)
+        stats = worker.stats()
+        print(f"{'2nd worker':<12}{ms:>10.2f}{stats['hit_rate']:>10.1%}{stats['evictions']:>11}"
+              f"{stats['sqlite']['hits']:>13}")
+
+        # A new model version must not see the old entries
+        worker.set_model_version(MODEL_VERSION + "-retrained")
+        worker.predict(batches[0], simulated_predict)
+        after = worker.stats()
+        assert after['hits'] == stats['hits'], "entries from the old model version were served"
+        print(f"\nAfter a model version change: {after['entries']} LRU entries, "
+              f"{after['misses'] - stats['misses']} misses on a repeated batch, "
+              f"invalidations={after['invalidations']}")
+
+        for cache in (*caches.values(), worker):
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
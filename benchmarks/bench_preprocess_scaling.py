@@ -0,0 +1,94 @@
+"""
+Scaling benchmark for parallel text preprocessing
+Runs ml.nlp_pipeline.preprocess_stream over a synthetic corpus with 1..N
+worker processes and reports throughput against the in-process baseline.
+Pool startup (spawning workers, loading NLTK) is measured separately, since
+the pool is reused across calls.
+
+Usage:
+    python benchmarks/bench_preprocess_scaling.py --texts 20000 --max-workers 8
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import os
+import random
+import time
+from ml.nlp_pipeline import preprocess_stream, shutdown_preprocess_pool
+
+FRAGMENTS = [
+    "The app crashes every time I open the settings page",
+    "Love the new dark mode feature, great work!",
+    "Loading takes forever and the dashboard is really slow",
+    "Please add calendar integration and export to CSV",
+    "The pricing is too expensive for small teams",
+    "Customer support answered quickly and solved my issue",
+    "Visit https://example.com or mail help@example.com #feedback",
+    "Notifications stopped working after the latest update",
+]
+
+
+def make_corpus(size: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [' '.join(rng.sample(FRAGMENTS, rng.randint(1, 3))) for _ in range(size)]
+
+
+def worker_counts(max_workers: int) -> list:
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure preprocessing throughput vs worker count")
+    parser.add_argument("--texts", type=int, default=20000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.texts)
+
+    print("=" * 60)
+    print("PREPROCESSING SCALING")
+    print("=" * 60)
+    print(f"{args.texts} texts, chunk size {args.chunk_size}, {os.cpu_count()} CPUs\n")
+
+    start = time.perf_counter()
+    expected = list(preprocess_stream(corpus, workers=1))
+    baseline = time.perf_counter() - start
+
+    print(f"{'workers':>8}{'startup s':>11}{'texts/s':>10}{'speedup':>10}{'efficiency':>12}")
+    print("-" * 51)
+    print(f"{'serial':>8}{'-':>11}{args.texts / baseline:>10.0f}{1.0:>9.2f}x{1.0:>12.0%}")
+
+    for workers in worker_counts(args.max_workers):
+        if workers == 1:
+            continue
+        # First call spawns the pool and loads the pipeline in every worker
+        start = time.perf_counter()
+        list(preprocess_stream(FRAGMENTS * workers, workers=workers, chunk_size=1))
+        startup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = list(preprocess_stream(corpus, workers=workers, chunk_size=args.chunk_size))
+        elapsed = time.perf_counter() - start
+        assert actual == expected, f"{workers} workers changed the output"
+
+        speedup = baseline / elapsed
+        print(f"{workers:>8}{startup:>11.2f}{args.texts / elapsed:>10.0f}{speedup:>9.2f}x"
+              f"{speedup / workers:>12.0%}")
+
+    shutdown_preprocess_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Responsiveness check for a running API server
+
+Starts a long analysis request in the background, then polls /health and
+/api/feedback/all while it runs. Reports read latencies and the event-loop
+lag the server itself measured (the "event_loop_lag" block in /health).
+
+Usage:
+    python backend/main.py                       # in another terminal
+    python benchmarks/bench_responsiveness.py --base-url http://localhost:8000
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import statistics
+import threading
+import time
+import requests
+
+
+def timed_get(url: str, **kwargs) -> tuple:
+    start = time.perf_counter()
+    response = requests.get(url, timeout=30, **kwargs)
+    return (time.perf_counter() - start) * 1000, response
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure read latency while analysis runs")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--analysis-path", default="/api/feedback/analyze-all",
+                        help="Long-running POST endpoint to exercise")
+    parser.add_argument("--polls", type=int, default=50)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("EVENT-LOOP RESPONSIVENESS CHECK")
+    print("=" * 60)
+
+    analysis_done = threading.Event()
+    analysis_time = {}
+
+    def run_analysis():
+        start = time.perf_counter()
+        requests.post(f"{args.base_url}{args.analysis_path}", timeout=600)
+        analysis_time['seconds'] = time.perf_counter() - start
+        analysis_done.set()
+
+    worker = threading.Thread(target=run_analysis, daemon=True)
+    worker.start()
+
+    health_ms, read_ms = [], []
+    for _ in range(args.polls):
+        elapsed, _ = timed_get(f"{args.base_url}/health")
+        health_ms.append(elapsed)
+        elapsed, _ = timed_get(f"{args.base_url}/api/feedback/all", params={"limit": 50})
+        read_ms.append(elapsed)
+        if analysis_done.is_set():
+            break
+
+    _, health = timed_get(f"{args.base_url}/health")
+    worker.join()
+
+    print(f"\nAnalysis request: {analysis_time.get('seconds', 0):.2f} s")
+    print(f"Polls while running: {len(health_ms)}")
+    for name, values in (("/health", health_ms), ("/api/feedback/all", read_ms)):
+        print(f"  {name:<20} median {statistics.median(values):8.2f} ms"
+              f"   max {max(values):8.2f} ms")
+
+    lag = health.json().get("event_loop_lag", {})
+    print(f"\nServer event-loop lag: current {lag.get('current_ms')} ms, "
+          f"p99 {lag.get('p99_ms')} ms, max {lag.get('max_ms')} ms")
+
+
+if __name__ == "__main__":
+    main()
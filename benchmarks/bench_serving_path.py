@@ -0,0 +1,95 @@
+"""
+Per-call cost of the Keras predict paths at batch 1, 8 and 64
+
+    predict   keras.Model.predict (data adapter + callbacks on every call)
+    eager     model(X, training=False)
+    compiled  ml.serving.ServingFunction (tf.function, fixed signature)
+
+Also reports the first-call cost of the compiled path with and without
+warmup(), i.e. what the first request after startup would pay.
+Models use random weights with the training architecture.
+
+Usage:
+    python benchmarks/bench_serving_path.py --repeats 50 --steps 16
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import statistics
+import time
+import numpy as np
+from ml.sentiment_model import SentimentModel
+from ml.intent_model import IntentModel
+from ml.serving import ServingFunction
+import config
+
+BATCH_SIZES = [1, 8, 64]
+VOCAB_SIZE = 2000
+
+
+def median_ms(fn, X, repeats: int) -> float:
+    fn(X)  # warm up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def first_call_ms(fn, X) -> float:
+    start = time.perf_counter()
+    fn(X)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-call cost of Keras predict paths")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=16, help="padded sequence length")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print("=" * 60)
+    print("KERAS SERVING PATH")
+    print("=" * 60)
+    print(f"Sequence length: {args.steps}, median of {args.repeats} calls\n")
+
+    for name, model, classes in (
+        ("sentiment", SentimentModel(), config.SENTIMENT_CLASSES),
+        ("intent", IntentModel(), config.INTENT_CLASSES),
+    ):
+        model.build_model(VOCAB_SIZE, num_classes=len(classes))
+        X_first = rng.integers(1, VOCAB_SIZE, size=(1, args.steps)).astype(np.int32)
+        model.model(X_first, training=False)  # create weights
+
+        cold = first_call_ms(ServingFunction(model.model, config.MAX_SEQUENCE_LENGTH), X_first)
+        warmed = ServingFunction(model.model, config.MAX_SEQUENCE_LENGTH)
+        warmed.warmup()
+        warm = first_call_ms(warmed, X_first)
+
+        paths = {
+            'predict': lambda X, m=model.model: m.predict(X, verbose=0),
+            'eager': lambda X, m=model.model: m(X, training=False).numpy(),
+            'compiled': warmed,
+        }
+
+        print(f"{name} model")
+        print(f"  {'batch':<8}{'predict ms':>12}{'eager ms':>12}{'compiled ms':>13}{'vs predict':>12}")
+        for batch in BATCH_SIZES:
+            X = rng.integers(1, VOCAB_SIZE, size=(batch, args.steps)).astype(np.int32)
+            times = {path: median_ms(fn, X, args.repeats) for path, fn in paths.items()}
+            print(f"  {batch:<8}{times['predict']:>12.2f}{times['eager']:>12.2f}"
+                  f"{times['compiled']:>13.2f}{times['predict'] / times['compiled']:>11.1f}x")
+        print(f"  first request: {cold:.0f} ms without warmup, {warm:.1f} ms after warmup()\n")
+
+
+if __name__ == "__main__":
+    main()
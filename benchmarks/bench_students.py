@@ -0,0 +1,142 @@
+"""
+Distilled students vs their LSTM teachers: latency, size and agreement
+
+Trains the sentiment and intent teachers on the synthetic training data
+with the held-out split of bench_multitask, distills a StudentModel from
+each, and writes all four to a scratch bundle. Then, per task, it reports
+parameter count and weight size, predict latency at batch sizes 1, 8 and
+64 (from the bundle, with the chosen inference backend), held-out accuracy
+and how often the student agrees with its teacher.
+
+Note: generate_training_data() adds punctuation variants of each sample, so
+near-duplicates can land on both sides of the split. Absolute accuracy is
+optimistic; the comparison between teacher and student is still like-for-like.
+
+Usage:
+    python benchmarks/bench_students.py --backend numpy
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import tempfile
+import time
+import numpy as np
+from ml.sentiment_model import SentimentModel
+from ml.intent_model import IntentModel
+from ml.student_model import StudentModel
+from ml.numpy_engine import NumpyClassifier
+from ml.bundle import ModelBundle, write_bundle
+from ml.nlp_pipeline import preprocess_batch
+from ml.train_models import generate_training_data, flatten_data, split_holdout
+
+BATCH_SIZES = [1, 8, 64]
+
+
+def time_call(fn, repeats: int) -> float:
+    """Median wall time of fn() in milliseconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def load(bundle: ModelBundle, name: str, label_key: str, backend: str):
+    """A bundled model as the API would serve it"""
+    if backend == "numpy":
+        model = NumpyClassifier(label_key, name)
+    elif name.endswith("_student"):
+        model = StudentModel(label_key)
+    else:
+        model = SentimentModel() if label_key == "sentiment" else IntentModel()
+    model.load_bundle(bundle)
+    model.warmup()
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare distilled students with their teachers")
+    parser.add_argument("--backend", choices=["keras", "numpy"], default="keras")
+    parser.add_argument("--epochs", type=int, default=15)
+    parser.add_argument("--student-epochs", type=int, default=40)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("DISTILLED STUDENTS vs LSTM TEACHERS")
+    print("=" * 60)
+
+    sentiment_data, intent_data = generate_training_data()
+    s_texts, s_labels = flatten_data(sentiment_data)
+    i_texts, i_labels = flatten_data(intent_data)
+
+    s_train, s_train_y, s_test, s_test_y = split_holdout(preprocess_batch(s_texts), s_labels)
+    i_train, i_train_y, i_test, i_test_y = split_holdout(preprocess_batch(i_texts), i_labels)
+
+    sentiment = SentimentModel()
+    sentiment.train(s_train, s_train_y, epochs=args.epochs, validation_split=0.0)
+    intent = IntentModel()
+    intent.set_tokenizer(sentiment.tokenizer)
+    intent.train(i_train, i_train_y, epochs=args.epochs, validation_split=0.0)
+
+    students = {
+        'sentiment': StudentModel('sentiment'),
+        'intent': StudentModel('intent'),
+    }
+    students['sentiment'].distill(sentiment, s_train, s_train_y, epochs=args.student_epochs)
+    students['intent'].distill(intent, i_train, i_train_y, epochs=args.student_epochs)
+
+    contents = {
+        'sentiment': (sentiment.model, sentiment.label_encoder.classes_),
+        'intent': (intent.model, intent.label_encoder.classes_),
+    }
+    for student in students.values():
+        contents[student.bundle_name] = (student.model, student.label_encoder.classes_)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = ModelBundle(write_bundle(contents, sentiment.tokenizer, bundle_dir=tmp,
+                                          activate=False))
+
+        for label_key, test, test_y in (("sentiment", s_test, s_test_y),
+                                        ("intent", i_test, i_test_y)):
+            teacher_labels = None
+            for name in (label_key, f"{label_key}_student"):
+                model = load(bundle, name, label_key, args.backend)
+                labels = model.predict(test, columnar=True)[label_key]
+                if teacher_labels is None:
+                    teacher_labels = labels
+
+                params = sum(int(np.prod(entry['shape']))
+                             for entry in bundle.manifest['models'][name]['arrays'].values())
+                latencies = []
+                for size in BATCH_SIZES:
+                    batch = [test[index % len(test)] for index in range(size)]
+                    latencies.append(time_call(lambda: model.predict(batch, columnar=True),
+                                               args.repeats))
+                rows.append((name, params, latencies,
+                             float(np.mean(labels == np.array(test_y))),
+                             float(np.mean(labels == teacher_labels))))
+
+    print(f"\nBackend: {args.backend}, held-out: {len(s_test)} sentiment / {len(i_test)} intent texts\n")
+    header = ''.join(f"{f'ms @{size}':>9}" for size in BATCH_SIZES)
+    print(f"{'model':<20}{'params':>10}{'MB':>7}{header}{'acc':>7}{'agree':>7}")
+    print("-" * (51 + 9 * len(BATCH_SIZES)))
+    for name, params, latencies, acc, agree in rows:
+        timings = ''.join(f"{latency:>9.2f}" for latency in latencies)
+        print(f"{name:<20}{params:>10,}{params * 4 / 1e6:>7.2f}{timings}{acc:>7.3f}{agree:>7.3f}")
+
+    print("\nMB: float32 weights (half with MODEL_BUNDLE_FLOAT16); "
+          "agree: same label as the teacher.")
+    print("Serve a student with config.MODEL_VARIANTS = {'intent': 'student', ...}.")
+
+
+if __name__ == "__main__":
+    main()
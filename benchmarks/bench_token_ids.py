@@ -0,0 +1,113 @@
+"""
+Benchmark for the fused token -> id path
+Compares, per batch, the string round trip the models used to take
+
+    ' '.join(tokens) -> tokenizer.texts_to_sequences -> pad per bucket
+
+with ml.token_ids.TokenIdEncoder.encode writing straight into one padded
+matrix, and asserts both give the same ids. Token lists come from
+data/sample_feedback.csv (lowercased, split on non-word characters; no NLTK
+needed), scaled up to --rows. Uses the NumPy tokenizer, plus the Keras
+Tokenizer when keras.preprocessing.text is available.
+
+Usage:
+    python benchmarks/bench_token_ids.py --rows 100000
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import csv
+import re
+import time
+from collections import Counter
+from itertools import cycle, islice
+import numpy as np
+from ml.numpy_engine import NumpyTokenizer
+from ml.padding import length_buckets, pad_sequences
+from ml.token_ids import TokenIdEncoder
+import config
+
+SAMPLE_PATH = config.BASE_DIR / "data" / "sample_feedback.csv"
+BATCH_SIZES = [64, 500]
+
+
+def load_token_lists(rows: int) -> list:
+    with open(SAMPLE_PATH, newline='', encoding='utf-8') as f:
+        sample = [re.findall(r"\w+", row['text'].lower()) for row in csv.DictReader(f)]
+    return [list(tokens) for tokens in islice(cycle(sample), rows)]
+
+
+def fit_word_index(token_lists: list) -> dict:
+    """Word index as Keras fit_on_texts builds it (frequency order, OOV first)"""
+    counts = Counter(token for tokens in token_lists for token in tokens)
+    ordered = [word for word, _ in counts.most_common()]
+    return {'<OOV>': 1, **{word: index + 2 for index, word in enumerate(ordered)}}
+
+
+def tokenizers(word_index: dict) -> dict:
+    # num_words below the vocabulary size so the cutoff is exercised
+    num_words = len(word_index) // 2
+    found = {'numpy': NumpyTokenizer(word_index, num_words=num_words, oov_token='<OOV>')}
+    try:
+        from keras.preprocessing.text import Tokenizer
+    except ImportError:
+        return found
+    keras_tokenizer = Tokenizer(num_words=num_words, oov_token='<OOV>')
+    keras_tokenizer.word_index = word_index
+    found['keras'] = keras_tokenizer
+    return found
+
+
+def string_path(tokenizer, batch: list, buckets: list) -> np.ndarray:
+    sequences = tokenizer.texts_to_sequences([' '.join(tokens) for tokens in batch])
+    longest = min(max(map(len, sequences)), buckets[-1])
+    return pad_sequences(sequences, next(b for b in buckets if b >= longest))
+
+
+def run(fn, batches: list) -> float:
+    start = time.perf_counter()
+    for batch in batches:
+        fn(batch)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the fused token -> id path")
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    token_lists = load_token_lists(args.rows)
+    # Fit on the sample only, then add unseen words so some tokens are OOV
+    word_index = fit_word_index(token_lists[:50])
+    buckets = length_buckets(config.MAX_SEQUENCE_LENGTH)
+
+    print("=" * 60)
+    print("FUSED TOKEN -> ID PATH")
+    print("=" * 60)
+    print(f"{args.rows} rows, {len(word_index)} words in the index, buckets {buckets}\n")
+
+    print(f"{'tokenizer':<10}{'batch':>7}{'string rows/s':>15}{'fused rows/s':>14}{'speedup':>10}")
+    print("-" * 56)
+    for name, tokenizer in tokenizers(word_index).items():
+        encoder = TokenIdEncoder(tokenizer)
+        for batch_size in BATCH_SIZES:
+            batches = [token_lists[i:i + batch_size] for i in range(0, len(token_lists), batch_size)]
+
+            expected = string_path(tokenizer, batches[0], buckets)
+            actual, _ = encoder.encode(batches[0], buckets)
+            assert np.array_equal(expected, actual), f"{name}: fused ids differ"
+
+            before = run(lambda batch: string_path(tokenizer, batch, buckets), batches)
+            after = run(lambda batch: encoder.encode(batch, buckets), batches)
+            print(f"{name:<10}{batch_size:>7}{args.rows / before:>15.0f}{args.rows / after:>14.0f}"
+                  f"{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
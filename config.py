@@ -7,18 +7,54 @@ BASE_DIR = Path(__file__).resolve().parent
 # Database Configuration
 DATABASE_PATH = BASE_DIR / "data" / "feedback.db"
 
+# Applied to every SQLite connection when it is opened
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -20000,       # negative = KiB, i.e. ~20 MB page cache
+    "mmap_size": 268435456,     # 256 MB
+    "busy_timeout": 5000,       # ms
+}
+
 # Model Paths
 MODELS_DIR = BASE_DIR / "ml" / "models"
 SENTIMENT_MODEL_PATH = MODELS_DIR / "sentiment_model.h5"
 INTENT_MODEL_PATH = MODELS_DIR / "intent_model.h5"
 TOKENIZER_PATH = MODELS_DIR / "tokenizer.pkl"
 LABEL_ENCODER_PATH = MODELS_DIR / "label_encoders.pkl"
+MULTITASK_MODEL_PATH = MODELS_DIR / "multitask_model.h5"
+
+# Versioned bundles of the separate models, tokenizer vocabulary and classes
+# (see ml/bundle.py); CURRENT in this directory names the one that is served.
+# MODEL_BUNDLE_FLOAT16 halves the weights file at a small accuracy cost.
+MODEL_BUNDLE_DIR = MODELS_DIR / "bundles"
+MODEL_BUNDLE_FLOAT16 = False
 
 # NLP Configuration
 MAX_SEQUENCE_LENGTH = 100
+
+# Inference pads each batch per length bucket instead of always to
+# MAX_SEQUENCE_LENGTH (only for models trained with a padding mask)
+LENGTH_BUCKETS = [16, 32, 64, 100]
 MAX_VOCAB_SIZE = 10000
 EMBEDDING_DIM = 128
 
+# Text preprocessing (ml.nlp_pipeline.preprocess_batch / preprocess_stream):
+# batches of at least PREPROCESS_PARALLEL_MIN_TEXTS are split into chunks of
+# PREPROCESS_CHUNK_SIZE across PREPROCESS_WORKERS processes
+PREPROCESS_WORKERS = os.cpu_count() or 1
+PREPROCESS_CHUNK_SIZE = 500
+PREPROCESS_PARALLEL_MIN_TEXTS = 2000
+
+# Tokenizer used after clean_text: "nltk" (word_tokenize) or "regex"
+# (one precompiled pattern, much faster; see ml/check_tokenizer_parity.py)
+NLP_TOKENIZER = "nltk"
+
+# Memoized token -> lemma table used by the NLP pipeline; prebuilt from the
+# training corpus by train_models and loaded when the pipeline is created
+LEMMA_TABLE_PATH = MODELS_DIR / "lemma_table.json"
+LEMMA_TABLE_MAX_SIZE = 200000
+
 # Model Parameters
 SENTIMENT_CLASSES = ["Negative", "Neutral", "Positive"]
 INTENT_CLASSES = [
@@ -29,11 +65,88 @@ INTENT_CLASSES = [
     "General Feedback"
 ]
 
+# Serving model: "separate" (SentimentModel + IntentModel)
+# or "multitask" (one shared encoder, single forward pass)
+SERVING_MODEL = "separate"
+
+# Inference backend for the separate models: "keras" or "numpy"
+# ("numpy" runs the model bundle without importing TensorFlow)
+INFERENCE_BACKEND = "keras"
+
+# Model served per task by the separate models: "lstm" (SentimentModel /
+# IntentModel) or "student", the compact pooled-embedding MLP train_models
+# distills from it (see ml/student_model.py; served from the bundle only)
+MODEL_VARIANTS = {
+    "sentiment": "lstm",
+    "intent": "lstm",
+}
+STUDENT_EMBEDDING_DIM = 32
+STUDENT_HIDDEN_UNITS = 32
+
+# Confidence-gated cascade for the separate models (see ml/linear_model.py):
+# a hashed bag-of-words linear classifier per task, trained by train_models
+# and stored in the bundle, answers every text it is at least
+# CASCADE_THRESHOLD confident about; only the rest go to the LSTM models.
+# None disables the cascade. CASCADE_FEATURES is the hashed feature count.
+CASCADE_THRESHOLD = None
+CASCADE_FEATURES = 2 ** 16
+
+# Load the serving model(s) during API startup. When False, TensorFlow is
+# imported and the models are loaded on the first analysis request instead.
+PRELOAD_MODELS = True
+
+# "local": every API worker process loads the models itself. "server": API
+# workers preprocess texts and send the token lists over a Unix socket to one
+# model server process (python backend/model_server.py), which owns the
+# models, the prediction cache and hot reload, and batches requests across
+# all workers
+INFERENCE_MODE = "local"
+MODEL_SERVER_SOCKET = BASE_DIR / "data" / "model_server.sock"
+MODEL_SERVER_TIMEOUT = 60       # seconds to wait for one reply
+MODEL_SERVER_STATUS_TIMEOUT = 2  # seconds, for /health and GET /api/models
+
+# Hot reload: the API checks the model files every MODEL_RELOAD_POLL_SECONDS
+# (0 disables the watcher) and swaps in a new version without a restart;
+# POST /api/models/reload triggers the same reload on demand
+MODEL_RELOAD_POLL_SECONDS = 5
+
+# Prediction cache (see ml/prediction_cache.py): in-process LRU entries,
+# 0 disables it. The SQLite tier is shared by every worker on the host.
+PREDICTION_CACHE_SIZE = 10000
+PREDICTION_CACHE_SQLITE = False
+PREDICTION_CACHE_PATH = BASE_DIR / "data" / "prediction_cache.db"
+PREDICTION_CACHE_SQLITE_MAX_ENTRIES = 200000
+
 # API Configuration
 API_HOST = "0.0.0.0"
 API_PORT = 8000
 API_RELOAD = True
 
+# Inference Batching (POST /api/analyze)
+BATCH_MAX_SIZE = 64
+BATCH_MAX_WAIT_MS = 5
+
+# Worker pools for blocking work in async routes
+INFERENCE_WORKERS = 2
+DB_WORKERS = 4
+LOOP_LAG_INTERVAL_MS = 100
+
+# Server-side chunk size for POST /api/analyze/batch
+ANALYZE_BATCH_CHUNK_SIZE = 256
+
+# Rows inserted per transaction by POST /api/feedback/bulk and /bulk/stream
+BULK_INSERT_CHUNK_SIZE = 5000
+# Longest single NDJSON line accepted by POST /api/feedback/bulk/stream
+BULK_STREAM_MAX_LINE_BYTES = 1024 * 1024
+
+# Rows fetched, scored and committed per step of a background analyze-all job
+ANALYZE_JOB_CHUNK_SIZE = 500
+
+# A worker process runs a job only while it holds the job's lease, renewed
+# with every committed chunk; if the owner stops renewing it for this long
+# (e.g. it died), another worker takes the job over from its cursor
+JOB_LEASE_SECONDS = 60
+
 # Streamlit Configuration
 STREAMLIT_PORT = 8501
 
@@ -1 +1,6 @@
 # ML package initialization
+
+# The model modules import TensorFlow/Keras and scikit-learn inside the
+# methods that need them, so importing the package (e.g. from the API
+# routes, or with INFERENCE_BACKEND = "numpy") stays cheap. Keep new heavy
+# imports local to the functions that use them.
@@ -0,0 +1,291 @@
+"""
+Versioned model artifact bundle
+
+Replaces the .h5 models, tokenizer.pkl and label_encoders.pkl at serving
+time with one directory per version under config.MODEL_BUNDLE_DIR:
+
+    bundles/
+        CURRENT                 name of the active version
+        <version>/
+            manifest.json       format, version, tokenizer settings and, per
+                                model, its classes, layer spec and array table
+            vocab.txt           one word per line; line i is token id i + 1
+            weights.bin         every weight array, 64-byte aligned
+
+weights.bin is memory-mapped read-only, so loading is a manifest parse plus
+an mmap and every worker process on the host shares the same pages. Only
+the vocabulary below num_words is kept (higher ids map to OOV anyway), not
+the Tokenizer's word_counts / word_docs. With MODEL_BUNDLE_FLOAT16 the
+weights are stored as float16; the NumPy engine keeps the embedding table
+mapped as float16 and upcasts the (small) remaining arrays on load.
+
+The cascade's linear first stages (ml/linear_model.py) and the distilled
+students (ml/student_model.py) are stored like any other model, as
+'<task>_linear' and '<task>_student'.
+
+Versions are content hashes, so exporting identical models again reuses the
+existing directory. A bundle becomes current by atomically replacing CURRENT.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+import numpy as np
+from ml.numpy_engine import NumpyNetwork, NumpyTokenizer, model_arrays, restore_keras_weights
+import config
+
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+MANIFEST_FILE = "manifest.json"
+VOCAB_FILE = "vocab.txt"
+WEIGHTS_FILE = "weights.bin"
+CURRENT_FILE = "CURRENT"
+
+
+def _vocabulary(tokenizer) -> list:
+    """Words ordered by id (id = position + 1), without ids at or above num_words"""
+    size = len(tokenizer.word_index)
+    if tokenizer.num_words:
+        size = min(size, tokenizer.num_words - 1)
+
+    words = [None] * size
+    for word, index in tokenizer.word_index.items():
+        if index <= size:
+            words[index - 1] = word
+
+    if None in words:
+        raise ValueError("Tokenizer word_index ids are not contiguous")
+    if any('\n' in word for word in words):
+        raise ValueError("Vocabulary words must not contain newlines")
+    return words
+
+
+def write_bundle(models: dict, tokenizer, bundle_dir: str = None, float16: bool = None,
+                 activate: bool = True) -> Path:
+    """
+    Write models and their shared tokenizer as a new bundle version
+
+    Args:
+        models: {name: (model, classes)}, e.g.
+            {'sentiment': (sentiment_model.model, label_encoder.classes_)}; a
+            model is a Keras model or has a bundle_arrays() method
+            (ml.linear_model.LinearClassifier)
+        tokenizer: Fitted Keras Tokenizer (or NumpyTokenizer) used by the models
+        bundle_dir: Parent directory (default: config.MODEL_BUNDLE_DIR)
+        float16: Store weights as float16 (default: config.MODEL_BUNDLE_FLOAT16)
+        activate: Point CURRENT at the new bundle
+
+    Returns:
+        Path of the bundle directory
+    """
+    if getattr(tokenizer, 'char_level', False):
+        raise ValueError("Character-level tokenizers are not supported in model bundles")
+
+    bundle_dir = Path(config.MODEL_BUNDLE_DIR if bundle_dir is None else bundle_dir)
+    float16 = config.MODEL_BUNDLE_FLOAT16 if float16 is None else float16
+    dtype = np.float16 if float16 else np.float32
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+
+    vocab = '\n'.join(_vocabulary(tokenizer))
+    digest = hashlib.sha256(vocab.encode('utf-8'))
+    content = {
+        'format_version': FORMAT_VERSION,
+        'dtype': np.dtype(dtype).name,
+        'tokenizer': {
+            'num_words': tokenizer.num_words,
+            'oov_token': tokenizer.oov_token,
+            'filters': tokenizer.filters,
+            'lower': tokenizer.lower,
+            'split': tokenizer.split,
+        },
+        'models': {},
+    }
+
+    staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=bundle_dir))
+    try:
+        with open(staging / WEIGHTS_FILE, 'wb') as f:
+            for name, (model, classes) in models.items():
+                layers, arrays = (model.bundle_arrays() if hasattr(model, 'bundle_arrays')
+                                  else model_arrays(model))
+                table = {}
+                for key, array in arrays.items():
+                    data = np.ascontiguousarray(array, dtype=dtype).tobytes()
+                    f.write(b'\0' * (-f.tell() % ALIGNMENT))
+                    table[key] = {'offset': f.tell(), 'shape': list(array.shape)}
+                    f.write(data)
+                    digest.update(data)
+                content['models'][name] = {
+                    'classes': [str(label) for label in classes],
+                    'layers': layers,
+                    'arrays': table,
+                }
+
+        with open(staging / VOCAB_FILE, 'w', encoding='utf-8') as f:
+            f.write(vocab)
+
+        digest.update(json.dumps(content, sort_keys=True).encode('utf-8'))
+        version = digest.hexdigest()[:16]
+        manifest = dict(content, version=version,
+                        created_at=datetime.now(timezone.utc).isoformat(timespec='seconds'))
+        with open(staging / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+        path = bundle_dir / version
+        if path.exists():
+            shutil.rmtree(staging)
+        else:
+            os.rename(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    print(f"Model bundle {version} saved to {path}")
+    if activate:
+        activate_bundle(path)
+    return path
+
+
+def activate_bundle(path):
+    """Make a bundle directory the current one (atomic rename of CURRENT)"""
+    path = Path(path)
+    pointer = path.parent / CURRENT_FILE
+    staging = path.parent / f"{CURRENT_FILE}.{os.getpid()}.tmp"
+    staging.write_text(path.name, encoding='utf-8')
+    os.replace(staging, pointer)
+
+
+def current_bundle_path(bundle_dir: str = None) -> Optional[Path]:
+    """Directory CURRENT points at, or None if there is no usable bundle"""
+    bundle_dir = Path(config.MODEL_BUNDLE_DIR if bundle_dir is None else bundle_dir)
+    try:
+        name = (bundle_dir / CURRENT_FILE).read_text(encoding='utf-8').strip()
+    except FileNotFoundError:
+        return None
+    path = bundle_dir / name
+    return path if (path / MANIFEST_FILE).exists() else None
+
+
+class ModelBundle:
+    """A bundle opened for inference: manifest, tokenizer and memory-mapped weights"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / MANIFEST_FILE, encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest['format_version'] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported bundle format {self.manifest['format_version']} "
+                             f"in {self.path} (expected {FORMAT_VERSION})")
+
+        self.version = self.manifest['version']
+        self.dtype = np.dtype(self.manifest['dtype'])
+        weights_path = self.path / WEIGHTS_FILE
+        # np.memmap refuses empty files (a bundle without models)
+        self._weights = (np.memmap(weights_path, dtype=np.uint8, mode='r')
+                         if weights_path.stat().st_size else np.empty(0, dtype=np.uint8))
+        self._tokenizer = None
+
+    @property
+    def tokenizer(self) -> NumpyTokenizer:
+        """Tokenizer rebuilt from vocab.txt, shared by every model in the bundle"""
+        if self._tokenizer is None:
+            words = (self.path / VOCAB_FILE).read_text(encoding='utf-8').split('\n')
+            word_index = {word: index for index, word in enumerate(words, start=1) if word}
+            self._tokenizer = NumpyTokenizer(word_index, **self.manifest['tokenizer'])
+        return self._tokenizer
+
+    def model_names(self) -> list:
+        return list(self.manifest['models'])
+
+    def _model(self, name: str) -> dict:
+        try:
+            return self.manifest['models'][name]
+        except KeyError:
+            raise KeyError(f"Bundle {self.version} has no model {name!r}") from None
+
+    def classes(self, name: str) -> np.ndarray:
+        """Label for each output index of a model"""
+        return np.array(self._model(name)['classes'], dtype=str)
+
+    def arrays(self, name: str) -> dict:
+        """A model's weights as read-only views into the mapped file"""
+        arrays = {}
+        for key, entry in self._model(name)['arrays'].items():
+            count = int(np.prod(entry['shape']))
+            start = entry['offset']
+            end = start + count * self.dtype.itemsize
+            arrays[key] = self._weights[start:end].view(self.dtype).reshape(entry['shape'])
+        return arrays
+
+    def network(self, name: str) -> NumpyNetwork:
+        """NumPy forward pass for a model, sharing the mapped embedding table"""
+        arrays = self.arrays(name)
+        if self.dtype != np.float32:
+            arrays = {key: array if key.endswith('/embeddings') else array.astype(np.float32)
+                      for key, array in arrays.items()}
+        return NumpyNetwork(self._model(name)['layers'], arrays)
+
+    def input_dim(self, name: str) -> int:
+        """Vocabulary size of a model's Embedding layer"""
+        embedding = next(layer for layer in self._model(name)['layers']
+                         if layer['type'] == 'embedding')
+        return self._model(name)['arrays'][f"{embedding['prefix']}/embeddings"]['shape'][0]
+
+    def masks_padding(self, name: str) -> bool:
+        """Whether a model's Embedding layer masks zero (padding) ids"""
+        return any(layer.get('mask_zero') for layer in self._model(name)['layers']
+                   if layer['type'] == 'embedding')
+
+    def label_encoder(self, name: str):
+        """Fitted LabelEncoder for a model's classes (for the Keras model classes)"""
+        from sklearn.preprocessing import LabelEncoder
+
+        encoder = LabelEncoder()
+        encoder.classes_ = np.array(self._model(name)['classes'])
+        return encoder
+
+    def restore_weights(self, name: str, keras_model):
+        """Copy a model's weights into a freshly built Keras model of the same architecture"""
+        # Calling the model once creates its weights
+        keras_model(np.zeros((1, 1), dtype=np.int32))
+        restore_keras_weights(keras_model, self.arrays(name))
+
+
+def load_bundle(path=None) -> ModelBundle:
+    """
+    Open a bundle for inference
+
+    Args:
+        path: Bundle directory (default: the one config.MODEL_BUNDLE_DIR/CURRENT names)
+    """
+    if path is None:
+        path = current_bundle_path()
+        if path is None:
+            raise FileNotFoundError(f"No model bundle in {config.MODEL_BUNDLE_DIR} "
+                                    f"(run 'python ml/train_models.py')")
+    return ModelBundle(path)
+
+
+def export_trained_models(sentiment, intent, float16: bool = None,
+                          linear_models: list = (), students: list = ()) -> Path:
+    """
+    Bundle trained SentimentModel / IntentModel instances and their shared tokenizer
+
+    Args:
+        linear_models: Trained LinearClassifier first stages for the cascade
+        students: Distilled StudentModel instances
+    """
+    models = {
+        'sentiment': (sentiment.model, sentiment.label_encoder.classes_),
+        'intent': (intent.model, intent.label_encoder.classes_),
+    }
+    for linear in linear_models:
+        models[linear.bundle_name] = (linear, linear.classes)
+    for student in students:
+        models[student.bundle_name] = (student.model, student.label_encoder.classes_)
+    return write_bundle(models, sentiment.tokenizer, float16=float16)
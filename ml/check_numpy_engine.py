@@ -0,0 +1,240 @@
+"""
+Equivalence check for the NumPy inference engine
+
+Builds the sentiment, intent and student architectures with random weights,
+writes them to a model bundle, and compares NumPy outputs with Keras
+model.predict on random token sequences, both fully padded and
+length-bucketed. Also
+checks Keras models restored from the bundle, a float16 bundle, the
+cascade's linear first stage after a bundle round trip, the bundle
+tokenizer against the Keras tokenizer, and the current bundle against the
+trained .h5 models if both exist.
+Exits with status 1 if any difference exceeds the tolerance.
+
+Usage:
+    python ml/check_numpy_engine.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import tempfile
+import numpy as np
+from ml.sentiment_model import SentimentModel
+from ml.intent_model import IntentModel
+from ml.numpy_engine import NumpyClassifier, NumpyTokenizer, pad_sequences
+from ml.linear_model import LinearClassifier
+from ml.student_model import StudentModel
+from ml.bundle import ModelBundle, write_bundle, current_bundle_path
+from ml.padding import predict_bucketed, length_buckets
+import config
+
+TOLERANCE = 1e-4
+# float16 weights only need to keep predictions close, not identical
+FLOAT16_TOLERANCE = 1e-2
+VOCAB_SIZE = 500
+SAMPLE_TEXTS = [
+    "app crash login frustrating",
+    "love new dark mode feature",
+    "app slow laggy",
+    "please add calendar integration",
+    "pricing too expensive",
+    "Mixed CASE, punctuation!!! and unseen-words like zyzzyva",
+    "",
+]
+
+
+def random_batch(rng: np.random.Generator, batch: int = 16) -> np.ndarray:
+    """Token ids with varying lengths, post-padded with zeros"""
+    lengths = rng.integers(0, config.MAX_SEQUENCE_LENGTH + 1, size=batch)
+    X = np.zeros((batch, config.MAX_SEQUENCE_LENGTH), dtype=np.int32)
+    for row, length in enumerate(lengths):
+        X[row, :length] = rng.integers(1, VOCAB_SIZE, size=length)
+    return X
+
+
+def compare(name: str, expected: np.ndarray, actual: np.ndarray,
+            tolerance: float = TOLERANCE) -> list:
+    max_diff = float(np.max(np.abs(expected - actual)))
+    agreement = float(np.mean(expected.argmax(axis=1) == actual.argmax(axis=1)))
+    print(f"  {name:<40} max |diff| = {max_diff:.2e}   argmax agreement = {agreement:.0%}")
+    if max_diff > tolerance:
+        return [f"{name}: max difference {max_diff:.2e} exceeds {tolerance:.0e}"]
+    return []
+
+
+def check_architectures(tmp: str) -> list:
+    """Random-weight models: Keras vs bundle-loaded NumPy and Keras on the same padded ids"""
+    failures = check_bundle_round(tmp, {
+        'sentiment': (SentimentModel(), config.SENTIMENT_CLASSES, SentimentModel),
+        'intent': (IntentModel(), config.INTENT_CLASSES, IntentModel),
+        'intent_student': (StudentModel('intent'), config.INTENT_CLASSES,
+                           lambda: StudentModel('intent')),
+    })
+    # Models trained before padding masks (mask_zero=False), as ml/export_bundle.py
+    # exports them from old .h5 files
+    failures += check_bundle_round(tmp, {
+        'sentiment': (SentimentModel(), config.SENTIMENT_CLASSES, SentimentModel),
+        'intent': (IntentModel(), config.INTENT_CLASSES, IntentModel),
+    }, mask_zero=False)
+    return failures
+
+
+def check_bundle_round(tmp: str, models: dict, mask_zero: bool = True) -> list:
+    """
+    Write `models` to one bundle and compare every way of serving it
+
+    Args:
+        tmp: Directory for the scratch bundles
+        models: bundle name -> (model, classes, factory for the bundle-loaded model)
+        mask_zero: Build the LSTM models with (current) or without (legacy) padding mask
+    """
+    rng = np.random.default_rng(0)
+    X = random_batch(rng)
+    failures = []
+    label = "" if mask_zero else " unmasked"
+
+    expected = {}
+    for key, (model, classes, _) in models.items():
+        if isinstance(model, StudentModel):
+            model.build_model(VOCAB_SIZE, num_classes=len(classes))
+        else:
+            model.build_model(VOCAB_SIZE, num_classes=len(classes), mask_zero=mask_zero)
+        # Predicting first also builds the layers' weights
+        expected[key] = model.model.predict(X, verbose=0)
+
+    contents = {key: (model.model, classes) for key, (model, classes, _) in models.items()}
+    bundle = ModelBundle(write_bundle(contents, NumpyTokenizer({}), bundle_dir=tmp,
+                                      activate=False))
+    half = ModelBundle(write_bundle(contents, NumpyTokenizer({}), bundle_dir=tmp,
+                                    float16=True, activate=False))
+
+    for key, (_, classes, model_class) in models.items():
+        name = f"{key}{label}"
+        engine = NumpyClassifier(key)
+        engine.load_bundle(bundle)
+        failures += compare(f"{name} (numpy)", expected[key], engine.model.predict(X))
+
+        # Masked models must give the same outputs with length-bucketed padding
+        sequences = [list(row[row != 0]) for row in X]
+        bucketed = predict_bucketed(engine.model.predict, sequences,
+                                    length_buckets(config.MAX_SEQUENCE_LENGTH,
+                                                   engine.model.masks_padding))
+        failures += compare(f"{name} bucketed", expected[key], bucketed)
+
+        restored = model_class()
+        restored.load_bundle(bundle)
+        failures += compare(f"{name} (keras from bundle)", expected[key],
+                            restored.model.predict(X, verbose=0))
+        if list(restored.label_encoder.classes_) != list(classes):
+            failures.append(f"{name}: bundle classes differ")
+
+        engine = NumpyClassifier(key)
+        engine.load_bundle(half)
+        failures += compare(f"{name} (numpy float16)", expected[key], engine.model.predict(X),
+                            tolerance=FLOAT16_TOLERANCE)
+
+    return failures
+
+
+def check_linear_stage(tmp: str) -> list:
+    """Linear first stage: trained model vs the same model loaded from a (float16) bundle"""
+    rng = np.random.default_rng(0)
+    words = [f"word{index}" for index in range(200)]
+    texts = [list(rng.choice(words, rng.integers(0, 12))) for _ in range(300)]
+    labels = [config.SENTIMENT_CLASSES[index] for index in rng.integers(0, 3, size=300)]
+
+    trained = LinearClassifier('sentiment').train(texts, labels)
+    expected = trained.predict_proba(texts)
+    failures = []
+    for name, float16, tolerance in (("linear stage", False, TOLERANCE),
+                                     ("linear stage float16", True, FLOAT16_TOLERANCE)):
+        bundle = ModelBundle(write_bundle({trained.bundle_name: (trained, trained.classes)},
+                                          NumpyTokenizer({}), bundle_dir=tmp, float16=float16,
+                                          activate=False))
+        loaded = LinearClassifier('sentiment')
+        loaded.load_bundle(bundle)
+        failures += compare(name, expected, loaded.predict_proba(texts), tolerance=tolerance)
+    return failures
+
+
+def check_tokenizer(tmp: str) -> list:
+    """Keras Tokenizer vs NumpyTokenizer sequences, including OOV and num_words cut-off"""
+    from keras.preprocessing.text import Tokenizer
+    from keras.preprocessing.sequence import pad_sequences as keras_pad_sequences
+
+    tokenizer = Tokenizer(num_words=12, oov_token='<OOV>')
+    tokenizer.fit_on_texts(SAMPLE_TEXTS[:5])
+    bundle = ModelBundle(write_bundle({}, tokenizer, bundle_dir=tmp, activate=False))
+
+    expected = keras_pad_sequences(tokenizer.texts_to_sequences(SAMPLE_TEXTS),
+                                   maxlen=4, padding='post', truncating='post')
+    actual = pad_sequences(bundle.tokenizer.texts_to_sequences(SAMPLE_TEXTS), maxlen=4)
+
+    matches = np.array_equal(expected, actual)
+    print(f"  {'tokenizer + padding':<40} {'identical' if matches else 'MISMATCH'}")
+    return [] if matches else ["tokenizer: NumPy sequences differ from Keras"]
+
+
+def check_trained_models() -> list:
+    """Trained .h5 models vs the current bundle on real preprocessed texts, if both exist"""
+    paths = [config.SENTIMENT_MODEL_PATH, config.INTENT_MODEL_PATH, config.TOKENIZER_PATH]
+    if current_bundle_path() is None or not all(os.path.exists(str(path)) for path in paths):
+        print("  trained models                            skipped (run 'python ml/train_models.py')")
+        return []
+
+    from ml.sentiment_model import sentiment_model
+    from ml.intent_model import intent_model
+    from ml.numpy_engine import numpy_sentiment_model, numpy_intent_model
+    from ml.nlp_pipeline import preprocess_batch
+
+    sentiment_model.load_model()
+    intent_model.load_model()
+    intent_model.set_tokenizer(sentiment_model.tokenizer)
+    numpy_sentiment_model.load_bundle()
+    numpy_intent_model.load_bundle()
+
+    texts = preprocess_batch(SAMPLE_TEXTS)
+    failures = []
+    for name, keras_model, numpy_model in (
+        ("trained sentiment", sentiment_model, numpy_sentiment_model),
+        ("trained intent", intent_model, numpy_intent_model),
+    ):
+        keras_ids = keras_model.prepare_data(texts)
+        numpy_ids = numpy_model.prepare_data(texts)
+        if not np.array_equal(keras_ids, numpy_ids):
+            failures.append(f"{name}: token ids differ from Keras")
+        failures += compare(name, keras_model.model.predict(keras_ids, verbose=0),
+                            numpy_model.model.predict(numpy_ids))
+    return failures
+
+
+def main() -> int:
+    print("=" * 60)
+    print("NUMPY ENGINE EQUIVALENCE CHECK")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        failures = check_architectures(tmp)
+        failures += check_linear_stage(tmp)
+        failures += check_tokenizer(tmp)
+    failures += check_trained_models()
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"✗ {len(failures)} problem(s):")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+
+    print(f"✓ NumPy engine matches Keras (tolerance {TOLERANCE:.0e})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
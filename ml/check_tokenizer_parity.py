@@ -0,0 +1,158 @@
+"""
+Parity check for the regex tokenizer and the folded clean_text passes
+
+- clean_text matches the original five re.sub passes on the sample data,
+  the training corpus and hand-picked edge cases
+- on the clean_text output of the same texts, the NLP_TOKENIZER "regex"
+  pattern gives the same tokens as "nltk" (word_tokenize). The rest of
+  preprocess_text works token by token, so equal tokens mean equal output.
+
+Only NLTK's punkt tokenizer data is needed, not the stopwords or wordnet
+corpora. Prints throughput for both tokenizers and both clean_text
+versions. Exits with status 1 on any mismatch.
+
+Usage:
+    python ml/check_tokenizer_parity.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import csv
+import re
+import time
+from ml.nlp_pipeline import FAST_TOKEN_PATTERN, NLPPipeline
+from ml.train_models import generate_training_data, flatten_data
+import config
+
+SAMPLE_PATH = config.BASE_DIR / "data" / "sample_feedback.csv"
+
+# Inputs that exercise each clean_text pass and the tokenizer rules
+EDGE_TEXTS = [
+    "See https://example.com/page?x=1 and www.example.org, or http://a.b",
+    "Mail me at support@example.com or @support_team #bugreport",
+    "prefix.http://x.y trailing@ lone @ # hashtags#inside a@b@c",
+    "Version 2.0 costs $1,000... really?! Yes!!",
+    "I cannot login, gonna try again. Wanna help? gotta go",
+    "Tabs\tand\nnewlines   and  spaces",
+    "Émojis 😀 and accents: café, naïve",
+    "",
+]
+
+
+def legacy_clean_text(text: str) -> str:
+    """clean_text as it was: five separate re.sub passes"""
+    text = text.lower()
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'@\w+|#\w+', '', text)
+    text = re.sub(r'[^\w\s.,!?]', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def load_corpus() -> list:
+    with open(SAMPLE_PATH, newline='', encoding='utf-8') as f:
+        sample = [row['text'] for row in csv.DictReader(f)]
+
+    sentiment_data, intent_data = generate_training_data()
+    training = flatten_data(sentiment_data)[0] + flatten_data(intent_data)[0]
+    return sample + training
+
+
+def rate(fn, texts: list) -> float:
+    """Texts per second for fn over texts"""
+    start = time.perf_counter()
+    for text in texts:
+        fn(text)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def regex_tokenize(text: str) -> list:
+    """NLPPipeline.tokenize in "regex" mode"""
+    return FAST_TOKEN_PATTERN.findall(text)
+
+
+def load_word_tokenize():
+    """NLTK word_tokenize, fetching the punkt data it needs if missing (None if unavailable)"""
+    import nltk
+    from nltk.tokenize import word_tokenize
+
+    for path, name in (('tokenizers/punkt_tab', 'punkt_tab'), ('tokenizers/punkt', 'punkt')):
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(name, quiet=True)
+    try:
+        word_tokenize("probe")
+    except LookupError:
+        return None
+    return word_tokenize
+
+
+def check_clean_text(texts: list) -> list:
+    failures = []
+    for text in texts:
+        expected, actual = legacy_clean_text(text), NLPPipeline.clean_text(text)
+        if expected != actual:
+            failures.append(f"clean_text({text!r}): {actual!r} != {expected!r}")
+    return failures
+
+
+def check_tokenizers(word_tokenize, texts: list) -> list:
+    failures = []
+    for text in dict.fromkeys(NLPPipeline.clean_text(text) for text in texts):
+        expected, actual = word_tokenize(text), regex_tokenize(text)
+        if expected != actual:
+            failures.append(f"tokenize({text!r}): regex {actual!r} != nltk {expected!r}")
+    return failures
+
+
+def report_throughput(word_tokenize, texts: list):
+    cleaned = [NLPPipeline.clean_text(text) for text in texts]
+
+    rows = [("clean_text", rate(legacy_clean_text, texts), rate(NLPPipeline.clean_text, texts))]
+    if word_tokenize is not None:
+        rows.append(("tokenize", rate(word_tokenize, cleaned), rate(regex_tokenize, cleaned)))
+
+    print(f"\n{'step':<18}{'before texts/s':>16}{'after texts/s':>16}{'speedup':>10}")
+    print("-" * 60)
+    for step, before, after in rows:
+        print(f"{step:<18}{before:>16.0f}{after:>16.0f}{after / before:>9.1f}x")
+    print("(before = legacy clean_text / nltk tokenizer, after = folded clean_text / regex)")
+
+
+def main() -> int:
+    print("=" * 60)
+    print("TOKENIZER PARITY CHECK")
+    print("=" * 60)
+
+    texts = load_corpus()
+    word_tokenize = load_word_tokenize()
+    print(f"{len(texts)} texts ({len(set(texts))} distinct) from "
+          f"{SAMPLE_PATH.name} and the training corpus, plus {len(EDGE_TEXTS)} edge cases")
+
+    failures = check_clean_text(texts + EDGE_TEXTS)
+    if word_tokenize is None:
+        failures.append("tokenize: NLTK punkt data unavailable, regex tokenizer not checked "
+                        "(python download_nltk_data.py)")
+    else:
+        failures += check_tokenizers(word_tokenize, texts + EDGE_TEXTS)
+    report_throughput(word_tokenize, texts)
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"✗ {len(failures)} mismatch(es):")
+        for failure in failures[:20]:
+            print(f"  - {failure}")
+        return 1
+
+    print("✓ Regex tokenizer and folded clean_text match the original pipeline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Bundle the saved sentiment and intent models for serving
+Reads the .h5 models and pickles written by train_models, writes a new
+version under config.MODEL_BUNDLE_DIR and makes it current.
+
+The cascade's linear first stages and the distilled students are only
+stored in bundles and were trained together with the models of the bundle
+they came from, so the new bundle leaves them out: run train_models to
+rebuild them. --keep-derived copies them over from the current bundle
+instead, for re-exporting the same models (e.g. with --float16).
+
+Usage:
+    python ml/export_bundle.py [--float16] [--keep-derived]
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path to support direct execution
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+from ml.sentiment_model import sentiment_model
+from ml.intent_model import intent_model
+from ml.linear_model import LinearClassifier
+from ml.student_model import StudentModel
+from ml.bundle import current_bundle_path, export_trained_models, load_bundle
+import config
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a model bundle from the saved models")
+    parser.add_argument("--float16", action="store_true",
+                        help="store weights as float16 (default: config.MODEL_BUNDLE_FLOAT16)")
+    parser.add_argument("--keep-derived", action="store_true",
+                        help="copy the linear stages and students from the current bundle")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("EXPORTING MODEL BUNDLE")
+    print("=" * 60)
+
+    sentiment_model.load_model()
+    intent_model.load_model()
+    intent_model.set_tokenizer(sentiment_model.tokenizer)
+
+    linear_models, students = [], []
+    current = load_bundle() if current_bundle_path() is not None else None
+    if current is not None and args.keep_derived:
+        for label_key in ('sentiment', 'intent'):
+            linear = LinearClassifier(label_key)
+            if linear.bundle_name in current.model_names():
+                linear.load_bundle(current)
+                linear_models.append(linear)
+            student = StudentModel(label_key)
+            if student.bundle_name in current.model_names():
+                student.load_bundle(current)
+                students.append(student)
+
+        kept = [model.bundle_name for model in linear_models + students]
+        if kept:
+            print("\n" + "!" * 60)
+            print(f"⚠ Keeping {', '.join(kept)} from bundle {current.version}.")
+            print(f"  They were trained together with the models of bundle {current.version};")
+            print("  if the saved .h5 models are different, run train_models instead.")
+            print("!" * 60 + "\n")
+    elif current is not None:
+        dropped = [name for name in current.model_names()
+                   if name.endswith(('_linear', '_student'))]
+        if dropped:
+            print(f"⚠ Leaving out {', '.join(dropped)} (trained with bundle "
+                  f"{current.version}); pass --keep-derived to copy them over")
+
+    export_trained_models(sentiment_model, intent_model, float16=args.float16 or None,
+                          linear_models=linear_models, students=students)
+
+    print("\n" + "=" * 60)
+    if config.MODEL_RELOAD_POLL_SECONDS > 0:
+        print("Export complete! Running API workers (or the model server) pick up the")
+        print("new bundle automatically; POST /api/models/reload swaps it in right away.")
+    else:
+        print("Export complete! POST /api/models/reload to swap in the new bundle.")
+    print("=" * 60)
@@ -0,0 +1,392 @@
+"""
+Shared inference helpers for the API
+Runs preprocessing and both models once for a whole batch of texts
+
+config.MODEL_VARIANTS picks the LSTM or its distilled student
+(ml/student_model.py) per task. With config.CASCADE_THRESHOLD set, a linear first stage (ml/linear_model.py)
+answers the texts it is confident about and only the rest reach the LSTMs.
+
+The loaded models live in one ServingModels set. Each request takes the
+current set once and uses it to the end, so reload_serving_models can load
+and warm up a new version next to it and swap it in without a restart:
+in-flight requests finish on the old models, new ones start on the new.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+import numpy as np
+from ml.sentiment_model import SentimentModel
+from ml.intent_model import IntentModel
+from ml.multitask_model import MultiTaskModel
+from ml.numpy_engine import NumpyClassifier
+from ml.linear_model import LinearClassifier
+from ml.student_model import StudentModel
+from ml.bundle import CURRENT_FILE, current_bundle_path, load_bundle
+from ml.nlp_pipeline import preprocess_batch
+from ml.prediction_cache import prediction_cache
+import config
+
+# Serializes loads and reloads; requests never take it
+_load_lock = threading.Lock()
+
+
+class ServingModels:
+    """One loaded and warmed-up set of the configured serving model(s)"""
+
+    def __init__(self, source, version: str, sentiment=None, intent=None, multitask=None,
+                 sentiment_linear=None, intent_linear=None, threshold: float = None):
+        # source: model_source() at load time, to tell when the files change
+        self.source = source
+        self.version = version
+        self.sentiment = sentiment
+        self.intent = intent
+        self.multitask = multitask
+        # Cascade first stages; texts below threshold confidence go to the model
+        self.sentiment_linear = sentiment_linear
+        self.intent_linear = intent_linear
+        self.threshold = threshold
+        self.loaded_at = datetime.now().isoformat(timespec='seconds')
+        self._cascade_lock = threading.Lock()
+        self._cascade_counts = {'texts': 0, 'sentiment': 0, 'intent': 0}
+
+    def _cascade(self, model, linear, token_lists: list) -> dict:
+        """Label and confidence arrays from the linear stage, escalating unsure texts to model"""
+        if linear is None:
+            return model.predict(token_lists, columnar=True)
+
+        key = linear.label_key
+        predictions = linear.predict(token_lists, columnar=True)
+        labels, confidence = predictions[key], predictions['confidence']
+        escalated = np.flatnonzero(confidence < self.threshold)
+        if len(escalated):
+            deep = model.predict([token_lists[index] for index in escalated], columnar=True)
+            labels = labels.astype(np.result_type(labels, deep[key]))
+            labels[escalated] = deep[key]
+            confidence[escalated] = deep['confidence']
+
+        with self._cascade_lock:
+            self._cascade_counts[key] += len(escalated)
+        return {key: labels, 'confidence': confidence}
+
+    def predict_rows(self, token_lists: list) -> list:
+        """Run the models on preprocessed token lists, one tuple per text"""
+        if self.multitask is not None:
+            sentiment_preds, intent_preds = self.multitask.predict(token_lists, columnar=True)
+        else:
+            sentiment_preds = self._cascade(self.sentiment, self.sentiment_linear, token_lists)
+            intent_preds = self._cascade(self.intent, self.intent_linear, token_lists)
+            if self.threshold is not None:
+                with self._cascade_lock:
+                    self._cascade_counts['texts'] += len(token_lists)
+
+        return list(zip(
+            sentiment_preds['sentiment'].tolist(), sentiment_preds['confidence'].tolist(),
+            intent_preds['intent'].tolist(), intent_preds['confidence'].tolist()
+        ))
+
+    def cascade_stats(self) -> Optional[dict]:
+        """Texts seen and the fraction escalated per task since load, or None without a cascade"""
+        if self.threshold is None:
+            return None
+        with self._cascade_lock:
+            counts = dict(self._cascade_counts)
+        texts = counts['texts']
+        return {
+            'threshold': self.threshold,
+            'texts': texts,
+            'sentiment_escalated': round(counts['sentiment'] / texts, 4) if texts else 0.0,
+            'intent_escalated': round(counts['intent'] / texts, 4) if texts else 0.0,
+        }
+
+
+_serving: Optional[ServingModels] = None
+
+
+def uses_model_bundle() -> bool:
+    """
+    Whether the separate models are served from the current model bundle
+
+    The NumPy backend only reads bundles; the Keras backend falls back to
+    the .h5 files and pickles of models trained before bundles existed.
+    """
+    if config.SERVING_MODEL == "multitask":
+        return False
+    return config.INFERENCE_BACKEND == "numpy" or current_bundle_path() is not None
+
+
+def serving_model_paths() -> list:
+    """Files that must exist before the configured serving model(s) can load"""
+    if config.SERVING_MODEL == "multitask":
+        return [config.MULTITASK_MODEL_PATH, config.TOKENIZER_PATH]
+    if uses_model_bundle():
+        return [config.MODEL_BUNDLE_DIR / CURRENT_FILE]
+    return [config.SENTIMENT_MODEL_PATH, config.INTENT_MODEL_PATH, config.TOKENIZER_PATH]
+
+
+def serving_model_version(bundle=None) -> str:
+    """
+    Content hash of the serving model files and the settings that affect output
+
+    Used as the prediction cache namespace, so retrained or swapped models
+    never see results computed by the previous ones.
+
+    Args:
+        bundle: The loaded ModelBundle, if serving from one; its version is
+            already a content hash, so no files are read
+    """
+    digest = hashlib.sha256(
+        f"{config.SERVING_MODEL}|{config.INFERENCE_BACKEND}|{config.MAX_SEQUENCE_LENGTH}|"
+        f"{config.CASCADE_THRESHOLD}|{sorted(config.MODEL_VARIANTS.items())}".encode()
+    )
+    if bundle is not None:
+        digest.update(bundle.version.encode())
+        return digest.hexdigest()[:16]
+
+    paths = serving_model_paths()
+    if config.LABEL_ENCODER_PATH.exists():
+        paths.append(config.LABEL_ENCODER_PATH)
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def model_source():
+    """
+    What the configured serving models would load from right now
+
+    The bundle directory CURRENT points at, or the size and mtime of each
+    legacy model file; None if the models are not trained. Compared with
+    the serving set's source to notice a new model version.
+    """
+    if uses_model_bundle():
+        path = current_bundle_path()
+        return str(path) if path is not None else None
+
+    source = []
+    for path in serving_model_paths():
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        source.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(source)
+
+
+def models_trained() -> bool:
+    """Whether models are loaded or can be loaded (checked on every call)"""
+    return _serving is not None or model_source() is not None
+
+
+def models_loaded() -> bool:
+    """Whether the configured serving model(s) are in memory"""
+    return _serving is not None
+
+
+def loaded_models() -> Optional[ServingModels]:
+    """The serving set in use, or None before the first load"""
+    return _serving
+
+
+def _task_model(label_key: str, lstm_class, bundle):
+    """Unloaded model for a task, of the variant config.MODEL_VARIANTS selects"""
+    variant = config.MODEL_VARIANTS.get(label_key, "lstm")
+    if variant not in ("lstm", "student"):
+        raise ValueError(f"Unknown {label_key} model variant {variant!r} (use 'lstm' or 'student')")
+
+    if variant == "student" and (bundle is None
+                                 or f"{label_key}_student" not in bundle.model_names()):
+        print(f"⚠ No {label_key} student in the serving models "
+              f"(run 'python ml/train_models.py'); serving the LSTM")
+        variant = "lstm"
+
+    if config.INFERENCE_BACKEND == "numpy":
+        return NumpyClassifier(label_key, f"{label_key}_student" if variant == "student" else None)
+    return StudentModel(label_key) if variant == "student" else lstm_class()
+
+
+def _load_models() -> ServingModels:
+    """Load and warm up a new set of the configured serving model(s)"""
+    source = model_source()
+
+    if config.SERVING_MODEL == "multitask":
+        if config.INFERENCE_BACKEND == "numpy":
+            raise ValueError("INFERENCE_BACKEND 'numpy' supports SERVING_MODEL 'separate' only")
+        if config.CASCADE_THRESHOLD is not None:
+            raise ValueError("CASCADE_THRESHOLD supports SERVING_MODEL 'separate' only")
+        if "student" in config.MODEL_VARIANTS.values():
+            raise ValueError("Student MODEL_VARIANTS support SERVING_MODEL 'separate' only")
+        multitask = MultiTaskModel()
+        multitask.load_model()
+        multitask.warmup()
+        return ServingModels(source, serving_model_version(), multitask=multitask)
+
+    # One mapped bundle: all models share its tokenizer and pages
+    bundle = load_bundle(source) if uses_model_bundle() else None
+    sentiment = _task_model('sentiment', SentimentModel, bundle)
+    intent = _task_model('intent', IntentModel, bundle)
+
+    if bundle is not None:
+        sentiment.load_bundle(bundle)
+        intent.load_bundle(bundle)
+    else:
+        sentiment.load_model()
+        intent.load_model()
+    intent.set_tokenizer(sentiment.tokenizer)
+    # Trace the compiled predict path now, not on the first request
+    sentiment.warmup()
+    intent.warmup()
+
+    linear = {}
+    if config.CASCADE_THRESHOLD is not None:
+        if bundle is not None and all(f"{key}_linear" in bundle.model_names()
+                                      for key in ('sentiment', 'intent')):
+            for key in ('sentiment', 'intent'):
+                linear[f"{key}_linear"] = LinearClassifier(key)
+                linear[f"{key}_linear"].load_bundle(bundle)
+        else:
+            print("⚠ No linear first stage in the serving models "
+                  "(run 'python ml/train_models.py'); serving without the cascade")
+
+    return ServingModels(source, serving_model_version(bundle), sentiment, intent,
+                         threshold=config.CASCADE_THRESHOLD if linear else None, **linear)
+
+
+def _activate(models: ServingModels):
+    global _serving
+    # Drops cached predictions if these are not the models that made them
+    prediction_cache.set_model_version(models.version)
+    _serving = models
+
+
+def load_serving_models():
+    """
+    Load the configured serving model(s) from disk
+
+    With the Keras backend this is where TensorFlow actually gets imported,
+    so it is the slow part of startup. Safe to call from several threads;
+    only the first call loads.
+    """
+    with _load_lock:
+        if _serving is None:
+            _activate(_load_models())
+
+
+def reload_serving_models(force: bool = False) -> dict:
+    """
+    Load the model version now on disk next to the serving one and swap it in
+
+    Requests keep using the current set while the new one loads and warms
+    up; the swap itself is one reference assignment. If loading fails the
+    current set stays in service and the exception propagates.
+
+    Args:
+        force: Reload even if the model files have not changed
+
+    Returns:
+        Dict with 'reloaded', 'version', 'previous_version' and 'seconds'
+    """
+    with _load_lock:
+        start = time.perf_counter()
+        previous = _serving
+        reloaded = force or previous is None or model_source() != previous.source
+        if reloaded:
+            _activate(_load_models())
+
+        return {
+            'reloaded': reloaded,
+            'version': _serving.version,
+            'previous_version': previous.version if previous is not None else None,
+            'seconds': round(time.perf_counter() - start, 3),
+        }
+
+
+def current_models() -> ServingModels:
+    """The serving set a request should use from start to finish (loaded on first use)"""
+    models = _serving
+    if models is None:
+        load_serving_models()
+        models = _serving
+    return models
+
+
+def analyze_texts_columnar(texts: list) -> dict:
+    """
+    Analyze a batch of raw texts and return one NumPy array per field
+
+    For bulk callers (e.g. the analyze-all job) that don't need a dict per text.
+
+    Args:
+        texts: List of raw feedback texts
+
+    Returns:
+        Dict of 'sentiment', 'sentiment_score', 'intent' and 'intent_score'
+        arrays, in the same order as the input texts
+    """
+    return predict_columnar(preprocess_batch(texts, return_string=False))
+
+
+def predict_columnar(token_lists: list) -> dict:
+    """
+    analyze_texts_columnar for texts that are already preprocessed
+
+    Args:
+        token_lists: preprocess_batch(..., return_string=False) output
+
+    Returns:
+        Same dict of arrays as analyze_texts_columnar
+    """
+    models = current_models()
+
+    # Token lists go to the models as they are; the joined text is only the cache key
+    clean_texts = [' '.join(tokens) for tokens in token_lists]
+
+    # Inputs that normalize to the same text are predicted once
+    rows = prediction_cache.predict(clean_texts, models.predict_rows, inputs=token_lists,
+                                    version=models.version)
+    sentiments, sentiment_scores, intents, intent_scores = zip(*rows) if rows else ((),) * 4
+
+    return {
+        'sentiment': np.array(sentiments, dtype=str),
+        'sentiment_score': np.array(sentiment_scores, dtype=np.float32),
+        'intent': np.array(intents, dtype=str),
+        'intent_score': np.array(intent_scores, dtype=np.float32)
+    }
+
+
+def analyze_texts(texts: list) -> list:
+    """
+    Analyze a batch of raw texts with a single forward pass per model
+
+    Args:
+        texts: List of raw feedback texts
+
+    Returns:
+        List of dicts with sentiment, sentiment_score, intent and intent_score,
+        in the same order as the input texts
+    """
+    if not texts:
+        return []
+
+    return columns_to_dicts(analyze_texts_columnar(texts))
+
+
+def columns_to_dicts(columns: dict) -> list:
+    """One result dict per text from analyze_texts_columnar output"""
+    return [
+        {
+            'sentiment': sentiment,
+            'sentiment_score': sentiment_score,
+            'intent': intent,
+            'intent_score': intent_score
+        }
+        for sentiment, sentiment_score, intent, intent_score in zip(
+            columns['sentiment'].tolist(), columns['sentiment_score'].tolist(),
+            columns['intent'].tolist(), columns['intent_score'].tolist()
+        )
+    ]
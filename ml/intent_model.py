@@ -1,10 +1,9 @@
 import numpy as np
 import pickle
-from tensorflow import keras
-from keras.models import Sequential, load_model
-from keras.layers import Embedding, LSTM, Dense, Dropout
-from keras.preprocessing.sequence import pad_sequences
-from sklearn.preprocessing import LabelEncoder
+from ml.padding import predict_padded
+from ml.token_ids import token_encoder
+from ml.serving import ServingFunction
+from ml.postprocess import class_names, decode_predictions
 import config
 import os
 
@@ -18,8 +17,12 @@ class IntentModel:
         self.embedding_dim = config.EMBEDDING_DIM
         # Will use the same tokenizer as sentiment model for consistency
         self.tokenizer = None
+        # Compiled forward pass for predict(), built on first use
+        self._serving = None
+        # (label_encoder, class name array) used to decode predictions
+        self._classes = None
     
-    def build_model(self, vocab_size: int, num_classes: int = 5):
+    def build_model(self, vocab_size: int, num_classes: int = 5, mask_zero: bool = True):
         """
         Build LSTM architecture for intent classification
         
@@ -28,11 +31,18 @@ class IntentModel:
         - LSTM layers
         - Dropout for regularization
         - Dense layer with softmax activation
+        
+        mask_zero=False rebuilds the unmasked architecture of models
+        trained before padding masks were added (see load_bundle)
         """
+        from keras.models import Sequential
+        from keras.layers import Embedding, LSTM, Dense, Dropout
+        
         model = Sequential([
+            # mask_zero: padding is ignored, so inference can pad per length bucket
             Embedding(input_dim=vocab_size, 
                      output_dim=self.embedding_dim, 
-                     input_length=self.max_length),
+                     mask_zero=mask_zero),
             
             LSTM(128, return_sequences=True),
             Dropout(0.3),
@@ -53,6 +63,7 @@ class IntentModel:
         )
         
         self.model = model
+        self._serving = None
         return model
     
     def set_tokenizer(self, tokenizer):
@@ -73,6 +84,8 @@ class IntentModel:
         if self.tokenizer is None:
             raise ValueError("Tokenizer not set. Use set_tokenizer() first.")
         
+        from keras.preprocessing.sequence import pad_sequences
+        
         # Convert texts to sequences
         sequences = self.tokenizer.texts_to_sequences(texts)
         padded = pad_sequences(sequences, maxlen=self.max_length, padding='post', truncating='post')
@@ -80,6 +93,7 @@ class IntentModel:
         # Encode labels if provided
         if labels is not None:
             if self.label_encoder is None:
+                from sklearn.preprocessing import LabelEncoder
                 self.label_encoder = LabelEncoder()
                 self.label_encoder.fit(config.INTENT_CLASSES)
             
@@ -122,15 +136,20 @@ class IntentModel:
         
         return history
     
-    def predict(self, texts: list or str) -> list:
+    def predict(self, texts: list or str, columnar: bool = False):
         """
         Predict intent for given texts
         
         Args:
-            texts: Single text string or list of texts
+            texts: Single text string, list of texts, or list of token lists
+                (preprocess_batch(..., return_string=False))
+            columnar: Return NumPy arrays instead of one dict per text
+                (for bulk callers that don't need the per-class dicts)
         
         Returns:
-            List of predictions with intent and confidence score
+            List of predictions with intent and confidence score, or with
+            columnar=True a dict of 'intent' labels, 'confidence' scores,
+            the 'probabilities' matrix and its 'classes'
         """
         # Handle single text input
         if isinstance(texts, str):
@@ -139,30 +158,37 @@ class IntentModel:
         else:
             single_input = False
         
-        # Prepare data
-        X = self.prepare_data(texts)
+        if self.tokenizer is None:
+            raise ValueError("Tokenizer not set. Use set_tokenizer() first.")
         
-        # Get predictions
-        predictions = self.model.predict(X, verbose=0)
+        # Get predictions, one compiled forward pass per length bucket
+        serving = self.serving_function()
+        padded, lengths = token_encoder(self.tokenizer).encode(texts, serving.buckets)
+        predictions = predict_padded(serving, padded, lengths, serving.buckets)
         
-        # Convert to intent labels and scores
-        results = []
-        for pred in predictions:
-            class_idx = np.argmax(pred)
-            confidence = float(pred[class_idx])
-            intent = self.label_encoder.inverse_transform([class_idx])[0]
-            
-            results.append({
-                'intent': intent,
-                'confidence': confidence,
-                'probabilities': {
-                    self.label_encoder.inverse_transform([i])[0]: float(pred[i])
-                    for i in range(len(pred))
-                }
-            })
+        # Convert to intent labels and scores for the whole batch at once
+        results = decode_predictions(predictions, self.class_names(), 'intent', columnar)
         
+        if columnar:
+            return results
         return results[0] if single_input else results
     
+    def class_names(self) -> np.ndarray:
+        """Label for each output index, cached per label encoder"""
+        if self._classes is None or self._classes[0] is not self.label_encoder:
+            self._classes = (self.label_encoder, class_names(self.label_encoder))
+        return self._classes[1]
+    
+    def serving_function(self) -> ServingFunction:
+        """Compiled forward pass used by predict (built on first use)"""
+        if self._serving is None:
+            self._serving = ServingFunction(self.model, self.max_length)
+        return self._serving
+    
+    def warmup(self):
+        """Trace the serving function so the first request doesn't pay for it"""
+        self.serving_function().warmup()
+    
     def save_model(self, model_path: str = None):
         """Save intent model"""
         model_path = model_path or str(config.INTENT_MODEL_PATH)
@@ -196,7 +222,9 @@ class IntentModel:
         
         # Load model
         if os.path.exists(model_path):
+            from keras.models import load_model
             self.model = load_model(model_path)
+            self._serving = None
             print(f"Intent model loaded from {model_path}")
         else:
             raise FileNotFoundError(f"Intent model not found at {model_path}")
@@ -209,6 +237,28 @@ class IntentModel:
             print(f"Intent label encoder loaded from {encoder_path}")
         else:
             raise FileNotFoundError(f"Label encoder not found at {encoder_path}")
+    
+    def load_bundle(self, bundle=None):
+        """
+        Load model, tokenizer and label encoder from a model bundle
+        
+        Args:
+            bundle: ml.bundle.ModelBundle, or a bundle directory
+                (default: the current bundle)
+        """
+        from ml.bundle import ModelBundle, load_bundle
+        
+        if not isinstance(bundle, ModelBundle):
+            bundle = load_bundle(bundle)
+        
+        classes = bundle.classes('intent')
+        # Same padding mask as the exported model (older models have none)
+        self.build_model(bundle.input_dim('intent'), num_classes=len(classes),
+                         mask_zero=bundle.masks_padding('intent'))
+        bundle.restore_weights('intent', self.model)
+        self.tokenizer = bundle.tokenizer
+        self.label_encoder = bundle.label_encoder('intent')
+        print(f"Intent model loaded from bundle {bundle.version}")
 
 
 # Create singleton instance
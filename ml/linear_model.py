@@ -0,0 +1,162 @@
+"""
+Hashed bag-of-words linear classifier: the cheap first stage of the cascade
+
+Each text becomes its set of unigrams and bigrams, hashed (CRC32) into
+config.CASCADE_FEATURES buckets and L2-normalized; a multinomial logistic
+regression on those features gives class probabilities. Inference is a
+row gather and a sum per text in NumPy, orders of magnitude cheaper than
+the Bi-LSTMs, so with CASCADE_THRESHOLD set ml.inference answers texts this
+model is confident about directly and only escalates the rest.
+
+The weights are stored in the model bundle next to the LSTM models (as
+'<label_key>_linear') and versioned with them.
+"""
+
+import zlib
+import numpy as np
+from ml.postprocess import decode_predictions
+import config
+
+# scikit-learn and SciPy are only needed for training and are imported there
+
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+class LinearClassifier:
+    """Logistic regression over hashed unigram + bigram features"""
+
+    def __init__(self, label_key: str, n_features: int = None):
+        # label_key names the prediction field: 'sentiment' or 'intent'
+        self.label_key = label_key
+        self.n_features = n_features or config.CASCADE_FEATURES
+        self.kernel = None
+        self.bias = None
+        self.classes = None
+
+    @property
+    def bundle_name(self) -> str:
+        """Name of this model in the model bundle"""
+        return f"{self.label_key}_linear"
+
+    def _hash(self, gram: str) -> int:
+        return zlib.crc32(gram.encode('utf-8')) % self.n_features
+
+    def features(self, texts: list) -> tuple:
+        """
+        Hashed feature ids of each text
+
+        Args:
+            texts: Preprocessed texts, or token lists
+                (preprocess_batch(..., return_string=False))
+
+        Returns:
+            (ids, lengths): all texts' feature ids concatenated, and the
+            number of ids per text
+        """
+        ids, lengths = [], []
+        for tokens in texts:
+            if isinstance(tokens, str):
+                tokens = tokens.split()
+            grams = set(tokens)
+            grams.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+            ids.extend(self._hash(gram) for gram in grams)
+            lengths.append(len(grams))
+        return np.array(ids, dtype=np.int64), np.array(lengths, dtype=np.int64)
+
+    def train(self, texts: list, labels: list, C: float = 10.0):
+        """
+        Fit the classifier on preprocessed texts
+
+        Args:
+            texts: Preprocessed texts or token lists
+            labels: Class label per text
+            C: Inverse L2 regularization strength of the logistic regression
+        """
+        from scipy.sparse import csr_matrix
+        from sklearn.linear_model import LogisticRegression
+
+        ids, lengths = self.features(texts)
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        values = np.repeat(1.0 / np.sqrt(np.maximum(lengths, 1)), lengths)
+        X = csr_matrix((values, ids, offsets), shape=(len(texts), self.n_features))
+
+        regression = LogisticRegression(C=C, max_iter=1000)
+        regression.fit(X, labels)
+
+        self.classes = np.asarray(regression.classes_).astype(str)
+        coef, intercept = regression.coef_, regression.intercept_
+        if len(self.classes) == 2:
+            # Binary problems get one weight vector; expand it to two softmax columns
+            coef = np.vstack([-coef / 2, coef / 2])
+            intercept = np.array([-intercept[0] / 2, intercept[0] / 2])
+        self.kernel = coef.T.astype(np.float32)
+        self.bias = intercept.astype(np.float32)
+        return self
+
+    def bundle_arrays(self) -> tuple:
+        """Layer spec and weight arrays for ml.bundle.write_bundle"""
+        if self.kernel is None:
+            raise ValueError("Linear model is not trained")
+        layers = [{'type': 'hashed_linear', 'prefix': 'linear', 'n_features': self.n_features}]
+        return layers, {'linear/kernel': self.kernel, 'linear/bias': self.bias}
+
+    def load_bundle(self, bundle=None):
+        """
+        Load the weights and classes from a model bundle
+
+        Args:
+            bundle: ml.bundle.ModelBundle, or a bundle directory
+                (default: the current bundle)
+        """
+        from ml.bundle import ModelBundle, load_bundle
+
+        if not isinstance(bundle, ModelBundle):
+            bundle = load_bundle(bundle)
+
+        arrays = bundle.arrays(self.bundle_name)
+        # The kernel stays mapped (and float16 if the bundle is); only gathered rows are upcast
+        self.kernel = arrays['linear/kernel']
+        self.bias = np.asarray(arrays['linear/bias'], dtype=np.float32)
+        self.n_features = self.kernel.shape[0]
+        self.classes = bundle.classes(self.bundle_name)
+        print(f"Linear {self.label_key} model loaded from bundle {bundle.version}")
+
+    def predict_proba(self, texts: list) -> np.ndarray:
+        """(batch, classes) probability matrix"""
+        ids, lengths = self.features(texts)
+        # Per-text sums of the gathered kernel rows, as differences of a running sum
+        totals = np.zeros((len(ids) + 1, len(self.classes)), dtype=np.float64)
+        np.cumsum(self.kernel[ids], axis=0, dtype=np.float64, out=totals[1:])
+        ends = np.cumsum(lengths)
+        logits = (totals[ends] - totals[ends - lengths]) / np.sqrt(np.maximum(lengths, 1))[:, None]
+        return _softmax(logits + self.bias).astype(np.float32)
+
+    def predict(self, texts: list or str, columnar: bool = False):
+        """
+        Predict labels for given texts
+
+        Args:
+            texts: Single text string, list of texts, or list of token lists
+            columnar: Return NumPy arrays instead of one dict per text
+
+        Returns:
+            Same format as SentimentModel / IntentModel.predict
+        """
+        single_input = isinstance(texts, str)
+        if single_input:
+            texts = [texts]
+
+        results = decode_predictions(self.predict_proba(texts), self.classes,
+                                     self.label_key, columnar)
+
+        if columnar:
+            return results
+        return results[0] if single_input else results
+
+
+# Singleton instances
+sentiment_linear_model = LinearClassifier('sentiment')
+intent_linear_model = LinearClassifier('intent')
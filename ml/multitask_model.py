@@ -0,0 +1,253 @@
+import numpy as np
+import pickle
+from ml.padding import predict_padded
+from ml.token_ids import token_encoder
+from ml.serving import ServingFunction
+from ml.postprocess import class_names, decode_predictions
+import config
+import os
+
+class MultiTaskModel:
+    """Shared Bi-LSTM encoder with separate sentiment and intent heads"""
+
+    def __init__(self):
+        self.model = None
+        self.sentiment_encoder = None
+        self.intent_encoder = None
+        self.max_length = config.MAX_SEQUENCE_LENGTH
+        self.embedding_dim = config.EMBEDDING_DIM
+        # Uses the same tokenizer as the sentiment model
+        self.tokenizer = None
+        # Compiled forward pass for predict(), built on first use
+        self._serving = None
+        # Per head: (label encoder, class name array) used to decode predictions
+        self._classes = {}
+
+    def build_model(self, vocab_size: int, num_sentiments: int = 3, num_intents: int = 5):
+        """
+        Build multi-output architecture
+
+        Architecture:
+        - Shared embedding layer
+        - Shared Bidirectional LSTM encoder
+        - Sentiment head: Dense + softmax
+        - Intent head: Dense + softmax
+        """
+        from keras.models import Model
+        from keras.layers import Input, Embedding, Bidirectional, LSTM, Dense, Dropout
+
+        # Variable-length input with mask_zero: padding is ignored, so
+        # inference can pad per length bucket
+        inputs = Input(shape=(None,), name='tokens')
+
+        x = Embedding(input_dim=vocab_size, output_dim=self.embedding_dim, mask_zero=True)(inputs)
+        x = Bidirectional(LSTM(64, return_sequences=True))(x)
+        x = Dropout(0.3)(x)
+        x = Bidirectional(LSTM(32))(x)
+        encoded = Dropout(0.3)(x)
+
+        s = Dense(64, activation='relu')(encoded)
+        s = Dropout(0.2)(s)
+        sentiment_out = Dense(num_sentiments, activation='softmax', name='sentiment')(s)
+
+        i = Dense(64, activation='relu')(encoded)
+        i = Dropout(0.2)(i)
+        intent_out = Dense(num_intents, activation='softmax', name='intent')(i)
+
+        model = Model(inputs=inputs, outputs=[sentiment_out, intent_out])
+
+        model.compile(
+            optimizer='adam',
+            loss={
+                'sentiment': 'sparse_categorical_crossentropy',
+                'intent': 'sparse_categorical_crossentropy'
+            },
+            metrics={'sentiment': ['accuracy'], 'intent': ['accuracy']}
+        )
+
+        self.model = model
+        self._serving = None
+        return model
+
+    def set_tokenizer(self, tokenizer):
+        """Set tokenizer (shared with sentiment model)"""
+        self.tokenizer = tokenizer
+
+    def _init_encoders(self):
+        """Fit label encoders on the configured class lists"""
+        from sklearn.preprocessing import LabelEncoder
+
+        if self.sentiment_encoder is None:
+            self.sentiment_encoder = LabelEncoder()
+            self.sentiment_encoder.fit(config.SENTIMENT_CLASSES)
+        if self.intent_encoder is None:
+            self.intent_encoder = LabelEncoder()
+            self.intent_encoder.fit(config.INTENT_CLASSES)
+
+    def prepare_data(self, texts: list):
+        """Convert texts to padded sequences"""
+        if self.tokenizer is None:
+            raise ValueError("Tokenizer not set. Use set_tokenizer() first.")
+
+        from keras.preprocessing.sequence import pad_sequences
+
+        sequences = self.tokenizer.texts_to_sequences(texts)
+        return pad_sequences(sequences, maxlen=self.max_length, padding='post', truncating='post')
+
+    def train(self, sentiment_texts: list, sentiment_labels: list,
+              intent_texts: list, intent_labels: list,
+              epochs: int = 10, batch_size: int = 32, validation_split: float = 0.2):
+        """
+        Train both heads jointly
+
+        The sentiment and intent datasets are different sets of texts, so they
+        are concatenated and each sample only contributes to the loss of the
+        head it has a label for (the other head gets a zero sample weight).
+
+        Returns:
+            Training history
+        """
+        self._init_encoders()
+
+        texts = list(sentiment_texts) + list(intent_texts)
+        n_sent, n_int = len(sentiment_texts), len(intent_texts)
+
+        y_sentiment = np.concatenate([
+            self.sentiment_encoder.transform(sentiment_labels), np.zeros(n_int, dtype=int)
+        ])
+        y_intent = np.concatenate([
+            np.zeros(n_sent, dtype=int), self.intent_encoder.transform(intent_labels)
+        ])
+        w_sentiment = np.concatenate([np.ones(n_sent), np.zeros(n_int)])
+        w_intent = np.concatenate([np.zeros(n_sent), np.ones(n_int)])
+
+        X = self.prepare_data(texts)
+
+        # Shuffle so validation_split doesn't hold out only intent samples
+        order = np.random.permutation(len(texts))
+
+        if self.model is None:
+            vocab_size = min(len(self.tokenizer.word_index) + 1, config.MAX_VOCAB_SIZE)
+            self.build_model(vocab_size,
+                             num_sentiments=len(config.SENTIMENT_CLASSES),
+                             num_intents=len(config.INTENT_CLASSES))
+
+        history = self.model.fit(
+            X[order],
+            {'sentiment': y_sentiment[order], 'intent': y_intent[order]},
+            sample_weight={'sentiment': w_sentiment[order], 'intent': w_intent[order]},
+            epochs=epochs,
+            batch_size=batch_size,
+            validation_split=validation_split,
+            verbose=1
+        )
+
+        return history
+
+    def predict(self, texts: list or str, columnar: bool = False) -> tuple:
+        """
+        Predict sentiment and intent with a single forward pass
+
+        Args:
+            texts: Single text string, list of texts, or list of token lists
+                (preprocess_batch(..., return_string=False))
+            columnar: Return NumPy arrays instead of one dict per text
+
+        Returns:
+            (sentiment_results, intent_results) in the same formats as
+            SentimentModel.predict and IntentModel.predict
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+            single_input = True
+        else:
+            single_input = False
+
+        if self.tokenizer is None:
+            raise ValueError("Tokenizer not set. Use set_tokenizer() first.")
+
+        # One compiled forward pass per length bucket
+        serving = self.serving_function()
+        padded, lengths = token_encoder(self.tokenizer).encode(texts, serving.buckets)
+        sentiment_probs, intent_probs = predict_padded(serving, padded, lengths, serving.buckets)
+
+        sentiment_results = self._decode(sentiment_probs, self.sentiment_encoder, 'sentiment',
+                                         columnar)
+        intent_results = self._decode(intent_probs, self.intent_encoder, 'intent', columnar)
+
+        if single_input and not columnar:
+            return sentiment_results[0], intent_results[0]
+        return sentiment_results, intent_results
+
+    def serving_function(self) -> ServingFunction:
+        """Compiled forward pass used by predict (built on first use)"""
+        if self._serving is None:
+            self._serving = ServingFunction(self.model, self.max_length)
+        return self._serving
+
+    def warmup(self):
+        """Trace the serving function so the first request doesn't pay for it"""
+        self.serving_function().warmup()
+
+    def _decode(self, predictions, encoder, key: str, columnar: bool = False):
+        """Turn a probability matrix into labels and scores for the whole batch"""
+        cached = self._classes.get(key)
+        if cached is None or cached[0] is not encoder:
+            cached = self._classes[key] = (encoder, class_names(encoder))
+        return decode_predictions(predictions, cached[1], key, columnar)
+
+    def save_model(self, model_path: str = None, encoder_path: str = None):
+        """Save multi-task model and its label encoders"""
+        model_path = model_path or str(config.MULTITASK_MODEL_PATH)
+        encoder_path = encoder_path or str(config.LABEL_ENCODER_PATH)
+
+        self.model.save(model_path)
+        print(f"Multi-task model saved to {model_path}")
+
+        encoders = {}
+        if os.path.exists(encoder_path):
+            with open(encoder_path, 'rb') as f:
+                encoders = pickle.load(f)
+
+        encoders['multitask_sentiment'] = self.sentiment_encoder
+        encoders['multitask_intent'] = self.intent_encoder
+
+        with open(encoder_path, 'wb') as f:
+            pickle.dump(encoders, f)
+
+        print(f"Multi-task label encoders saved to {encoder_path}")
+
+    def load_model(self, model_path: str = None, tokenizer_path: str = None,
+                   encoder_path: str = None):
+        """Load multi-task model, shared tokenizer and label encoders"""
+        model_path = model_path or str(config.MULTITASK_MODEL_PATH)
+        tokenizer_path = tokenizer_path or str(config.TOKENIZER_PATH)
+        encoder_path = encoder_path or str(config.LABEL_ENCODER_PATH)
+
+        if os.path.exists(model_path):
+            from keras.models import load_model
+            self.model = load_model(model_path)
+            self._serving = None
+            print(f"Multi-task model loaded from {model_path}")
+        else:
+            raise FileNotFoundError(f"Multi-task model not found at {model_path}")
+
+        if os.path.exists(tokenizer_path):
+            with open(tokenizer_path, 'rb') as f:
+                self.tokenizer = pickle.load(f)
+            print(f"Tokenizer loaded from {tokenizer_path}")
+        else:
+            raise FileNotFoundError(f"Tokenizer not found at {tokenizer_path}")
+
+        if os.path.exists(encoder_path):
+            with open(encoder_path, 'rb') as f:
+                encoders = pickle.load(f)
+                self.sentiment_encoder = encoders.get('multitask_sentiment')
+                self.intent_encoder = encoders.get('multitask_intent')
+            print(f"Multi-task label encoders loaded from {encoder_path}")
+        else:
+            raise FileNotFoundError(f"Label encoder not found at {encoder_path}")
+
+
+# Create singleton instance
+multitask_model = MultiTaskModel()
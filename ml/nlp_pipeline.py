@@ -1,53 +1,103 @@
+import atexit
+import json
+import os
 import re
 import string
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
-import numpy as np
-
-# Download required NLTK data (will only download if not present)
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    print("Downloading punkt...")
-    nltk.download('punkt', quiet=True)
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    print("Downloading stopwords...")
-    nltk.download('stopwords', quiet=True)
-
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    print("Downloading wordnet...")
-    nltk.download('wordnet', quiet=True)
-
-# Try to download punkt_tab, but don't fail if it doesn't exist
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except (LookupError, OSError):
+import threading
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator
+import config
+
+# NLTK resources needed by the pipeline: (lookup path, download name)
+NLTK_RESOURCES = [
+    ('tokenizers/punkt', 'punkt'),
+    ('corpora/stopwords', 'stopwords'),
+    ('corpora/wordnet', 'wordnet'),
+]
+
+
+def ensure_nltk_data():
+    """Download required NLTK data if it isn't present (called on first pipeline use)"""
+    import nltk
+    
+    for path, name in NLTK_RESOURCES:
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            print(f"Downloading {name}...")
+            nltk.download(name, quiet=True)
+    
+    # Try to download punkt_tab, but don't fail if it doesn't exist
     try:
-        print("Downloading punkt_tab...")
-        nltk.download('punkt_tab', quiet=True)
-    except:
-        # punkt_tab might not be available in all NLTK versions
-        # punkt alone is sufficient for tokenization
-        pass
+        nltk.data.find('tokenizers/punkt_tab')
+    except (LookupError, OSError):
+        try:
+            print("Downloading punkt_tab...")
+            nltk.download('punkt_tab', quiet=True)
+        except:
+            # punkt_tab might not be available in all NLTK versions
+            # punkt alone is sufficient for tokenization
+            pass
+
+
+# clean_text patterns, compiled once. https is covered by http; emails,
+# mentions and hashtags share a pass since an email match always spans a
+# whole whitespace-separated chunk.
+URL_PATTERN = re.compile(r'http\S+|www\S+')
+HANDLE_PATTERN = re.compile(r'\S+@\S+|[@#]\w+')
+SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s.,!?]+')
+
+# Regex tokenizer for clean_text output, where only \w, whitespace and .,!?
+# remain. Follows word_tokenize on that alphabet: splits cannot/gonna/...
+# like its contraction rules, keeps internal periods and digit commas in
+# the word (2.0, 1,000), keeps runs of periods as one token and splits off .,!?
+# It does not know punkt's abbreviation list, so e.g. "etc." mid-sentence
+# becomes "etc" + "." where word_tokenize keeps "etc.".
+FAST_TOKEN_PATTERN = re.compile(r'''
+    \b(?:can(?=not\b)|gim(?=me\b)|gon(?=na\b)|got(?=ta\b)|lem(?=me\b)
+       |wan(?=na\b(?!\.\w|,\d)))
+    | \w+(?:\.\w+|,\d\w*)*
+    | \.{2,}
+    | [.,!?]
+''', re.VERBOSE | re.IGNORECASE)
+
+TOKENIZERS = ("nltk", "regex")
+
 
 class NLPPipeline:
     """Complete NLP preprocessing pipeline for customer feedback"""
     
-    def __init__(self):
+    def __init__(self, lemma_table_path: str = None, tokenizer: str = None):
+        self.tokenizer_mode = config.NLP_TOKENIZER if tokenizer is None else tokenizer
+        if self.tokenizer_mode not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer {self.tokenizer_mode!r}, expected one of {TOKENIZERS}")
+        
+        ensure_nltk_data()
+        
+        from nltk.corpus import stopwords
+        from nltk.tokenize import word_tokenize
+        from nltk.stem import WordNetLemmatizer
+        
         self.stop_words = set(stopwords.words('english'))
         self.lemmatizer = WordNetLemmatizer()
+        self._word_tokenize = word_tokenize
         
         # Keep some sentiment-bearing words that are usually stopwords
         self.stop_words -= {'not', 'no', 'never', 'very', 'too', 'but', 'however'}
+        
+        # Compiled token table: token -> lemma, or '' if the token is dropped
+        # (punctuation, stopword or blank lemma). Seeded with the drops; lemmas
+        # are memoized on first sight, up to LEMMA_TABLE_MAX_SIZE entries.
+        self._token_table = dict.fromkeys(self.stop_words | set(string.punctuation), '')
+        self._token_table_limit = len(self._token_table) + config.LEMMA_TABLE_MAX_SIZE
+        
+        path = config.LEMMA_TABLE_PATH if lemma_table_path is None else lemma_table_path
+        if os.path.exists(str(path)):
+            self.load_lemma_table(path)
     
-    def clean_text(self, text: str) -> str:
+    @staticmethod
+    def clean_text(text: str) -> str:
         """
         Clean text by:
         - Converting to lowercase
@@ -59,30 +109,27 @@ class NLPPipeline:
         text = text.lower()
         
         # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+        text = URL_PATTERN.sub('', text)
         
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
-        
-        # Remove mentions and hashtags
-        text = re.sub(r'@\w+|#\w+', '', text)
+        # Remove email addresses, mentions and hashtags
+        text = HANDLE_PATTERN.sub('', text)
         
         # Remove numbers (optional - keep if numbers are meaningful)
         # text = re.sub(r'\d+', '', text)
         
         # Remove punctuation but keep sentence structure
         # We'll keep periods and commas for better tokenization
-        text = re.sub(r'[^\w\s.,!?]', '', text)
+        text = SPECIAL_CHARS_PATTERN.sub('', text)
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        return ' '.join(text.split())
     
     def tokenize(self, text: str) -> list:
-        """Tokenize text into words"""
+        """Tokenize text into words (NLTK word_tokenize, or FAST_TOKEN_PATTERN in "regex" mode)"""
+        if self.tokenizer_mode == "regex":
+            return FAST_TOKEN_PATTERN.findall(text)
         try:
-            tokens = word_tokenize(text)
+            tokens = self._word_tokenize(text)
         except:
             # Fallback to simple split if punkt tokenizer fails
             tokens = text.split()
@@ -100,6 +147,73 @@ class NLPPipeline:
         """Remove punctuation tokens"""
         return [token for token in tokens if token not in string.punctuation]
     
+    def _compile_token(self, token: str) -> str:
+        """Output for a token not yet in the table, memoized while there is room"""
+        if token in string.punctuation or token in self.stop_words:
+            lemma = ''
+        else:
+            lemma = self.lemmatizer.lemmatize(token)
+            if not lemma.strip():
+                lemma = ''
+        
+        if len(self._token_table) < self._token_table_limit:
+            self._token_table[token] = lemma
+        return lemma
+    
+    def filter_and_lemmatize(self, tokens: list) -> list:
+        """
+        Remove punctuation and stopwords and lemmatize in one pass
+        
+        Same result as remove_punctuation, remove_stopwords, lemmatize and
+        dropping blank tokens in sequence, with one table lookup per token.
+        """
+        table = self._token_table
+        output = []
+        for token in tokens:
+            lemma = table.get(token)
+            if lemma is None:
+                lemma = self._compile_token(token)
+            if lemma:
+                output.append(lemma)
+        return output
+    
+    def build_lemma_table(self, texts: list) -> int:
+        """
+        Lemmatize every token of a corpus into the table
+        
+        Args:
+            texts: Raw texts, e.g. the training corpus
+        
+        Returns:
+            Number of memoized lemmas
+        """
+        for text in texts:
+            self.filter_and_lemmatize(self.tokenize(self.clean_text(text)))
+        return len(self._lemmas())
+    
+    def _lemmas(self) -> dict:
+        """Table entries that are lemmas rather than seeded drops"""
+        return {
+            token: lemma for token, lemma in self._token_table.items()
+            if token not in self.stop_words and token not in string.punctuation
+        }
+    
+    def save_lemma_table(self, path: str = None):
+        """Persist the memoized lemmas (next to the model artifacts by default)"""
+        path = config.LEMMA_TABLE_PATH if path is None else path
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self._lemmas(), f, ensure_ascii=False, sort_keys=True)
+    
+    def load_lemma_table(self, path: str):
+        """Add lemmas saved by save_lemma_table; seeded drops always win"""
+        with open(path, encoding='utf-8') as f:
+            lemmas = json.load(f)
+        
+        for token, lemma in lemmas.items():
+            if len(self._token_table) >= self._token_table_limit:
+                break
+            self._token_table.setdefault(token, lemma)
+    
     def preprocess_text(self, text: str, return_string: bool = True) -> str or list:
         """
         Complete preprocessing pipeline
@@ -117,17 +231,8 @@ class NLPPipeline:
         # Step 2: Tokenize
         tokens = self.tokenize(cleaned)
         
-        # Step 3: Remove punctuation
-        tokens = self.remove_punctuation(tokens)
-        
-        # Step 4: Remove stopwords
-        tokens = self.remove_stopwords(tokens)
-        
-        # Step 5: Lemmatize
-        tokens = self.lemmatize(tokens)
-        
-        # Step 6: Remove empty tokens
-        tokens = [token for token in tokens if token.strip()]
+        # Step 3: Remove punctuation and stopwords, lemmatize, drop empty tokens
+        tokens = self.filter_and_lemmatize(tokens)
         
         if return_string:
             return ' '.join(tokens)
@@ -151,19 +256,156 @@ class NLPPipeline:
             "original_length": len(text),
             "token_count": len(tokens),
             "unique_tokens": len(set(tokens)),
-            "avg_word_length": np.mean([len(token) for token in tokens]) if tokens else 0
+            "avg_word_length": sum(len(token) for token in tokens) / len(tokens) if tokens else 0
         }
 
 
-# Singleton instance
-nlp_pipeline = NLPPipeline()
+# Singleton instance, built on first use so importing this module stays cheap
+_nlp_pipeline = None
+_nlp_pipeline_lock = threading.Lock()
+
+
+def get_nlp_pipeline() -> NLPPipeline:
+    """Return the shared pipeline, creating it (and fetching NLTK data) on first call"""
+    global _nlp_pipeline
+    if _nlp_pipeline is None:
+        with _nlp_pipeline_lock:
+            if _nlp_pipeline is None:
+                _nlp_pipeline = NLPPipeline()
+    return _nlp_pipeline
+
+
+def __getattr__(name):
+    # Keep `from ml.nlp_pipeline import nlp_pipeline` working without eager construction
+    if name == 'nlp_pipeline':
+        return get_nlp_pipeline()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def preprocess_text(text: str) -> str:
     """Convenience function for text preprocessing"""
-    return nlp_pipeline.preprocess_text(text)
+    return get_nlp_pipeline().preprocess_text(text)
+
+
+# Process pool for large batches, created on first parallel call
+_preprocess_pool = None
+_preprocess_pool_workers = 0
+_preprocess_pool_lock = threading.Lock()
+
+
+def _init_preprocess_worker():
+    """Build the worker's own pipeline before its first chunk arrives"""
+    get_nlp_pipeline()
+
+
+def _preprocess_chunk(texts: list, return_string: bool = True) -> list:
+    pipeline = get_nlp_pipeline()
+    return [pipeline.preprocess_text(text, return_string) for text in texts]
+
+
+def _get_preprocess_pool(workers: int):
+    """Shared process pool with `workers` processes, rebuilt if the size changes"""
+    global _preprocess_pool, _preprocess_pool_workers
+    with _preprocess_pool_lock:
+        if _preprocess_pool is None or _preprocess_pool_workers != workers:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            if _preprocess_pool is not None:
+                _preprocess_pool.shutdown()
+            # spawn, not fork: the API process may already hold TensorFlow threads
+            _preprocess_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_preprocess_worker
+            )
+            _preprocess_pool_workers = workers
+        return _preprocess_pool
+
+
+@atexit.register
+def shutdown_preprocess_pool():
+    """Stop the preprocessing worker processes, if any were started"""
+    global _preprocess_pool, _preprocess_pool_workers
+    with _preprocess_pool_lock:
+        if _preprocess_pool is not None:
+            _preprocess_pool.shutdown()
+            _preprocess_pool = None
+            _preprocess_pool_workers = 0
+
+
+def preprocess_stream(texts: Iterable[str], workers: int = None, chunk_size: int = None,
+                      return_string: bool = True) -> Iterator:
+    """
+    Preprocess an iterable of texts lazily, yielding results in input order
+
+    Input is consumed chunk by chunk and at most two chunks per worker are in
+    flight, so memory stays bounded however long the input is.
+
+    Args:
+        texts: Any iterable of raw texts (list, generator, file lines, ...)
+        workers: Worker processes; 1 runs in this process
+            (default: config.PREPROCESS_WORKERS)
+        chunk_size: Texts sent to a worker per task (default: config.PREPROCESS_CHUNK_SIZE)
+        return_string: Yield joined strings (True) or token lists (False)
+    """
+    workers = config.PREPROCESS_WORKERS if workers is None else workers
+    chunk_size = chunk_size or config.PREPROCESS_CHUNK_SIZE
+    iterator = iter(texts)
+
+    if workers <= 1:
+        pipeline = get_nlp_pipeline()
+        for text in iterator:
+            yield pipeline.preprocess_text(text, return_string)
+        return
+
+    pool = _get_preprocess_pool(workers)
+    pending = deque()
+    while True:
+        while len(pending) < 2 * workers:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            pending.append(pool.submit(_preprocess_chunk, chunk, return_string))
+        if not pending:
+            return
+        yield from pending.popleft().result()
+
+
+def build_lemma_table(texts: list, path: str = None) -> int:
+    """
+    Prebuild the shared pipeline's lemma table from a corpus and save it
+
+    Args:
+        texts: Raw texts, e.g. the training corpus
+        path: Output file (default: config.LEMMA_TABLE_PATH)
+
+    Returns:
+        Number of memoized lemmas
+    """
+    pipeline = get_nlp_pipeline()
+    count = pipeline.build_lemma_table(texts)
+    pipeline.save_lemma_table(path)
+    return count
+
+
+def preprocess_batch(texts: list, workers: int = None, return_string: bool = True) -> list:
+    """
+    Preprocess a batch of texts
+
+    Batches of at least config.PREPROCESS_PARALLEL_MIN_TEXTS are split into
+    chunks across a process pool; smaller ones (e.g. API requests) run
+    in-process, where pool overhead would outweigh the gain.
 
+    Args:
+        texts: List of raw texts
+        workers: Worker processes (default: config.PREPROCESS_WORKERS)
+        return_string: Return joined strings (True) or token lists (False),
+            which the models' predict methods encode without re-splitting
 
-def preprocess_batch(texts: list) -> list:
-    """Preprocess a batch of texts"""
-    return [nlp_pipeline.preprocess_text(text) for text in texts]
+    Returns:
+        Preprocessed texts, in the same order as the input
+    """
+    if len(texts) < config.PREPROCESS_PARALLEL_MIN_TEXTS:
+        workers = 1
+    return list(preprocess_stream(texts, workers=workers, return_string=return_string))
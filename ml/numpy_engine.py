@@ -0,0 +1,387 @@
+"""
+NumPy-only inference for the Sequential LSTM models
+
+`model_arrays` turns a trained Keras model into a layer spec plus plain
+weight arrays, which ml.bundle stores in the model artifact bundle.
+`NumpyClassifier` loads a bundle and runs the same batched forward pass
+without importing TensorFlow, so API workers using
+INFERENCE_BACKEND = "numpy" never pay TensorFlow's startup time or memory.
+
+Supported layers: Embedding, LSTM, Bidirectional(LSTM), GlobalMaxPooling1D,
+Dense. Dropout and InputLayer are no-ops at inference time and are skipped.
+"""
+
+import numpy as np
+from ml.padding import pad_sequences, predict_padded, length_buckets
+from ml.token_ids import token_encoder
+from ml.postprocess import decode_predictions
+import config
+
+
+def _sigmoid(x):
+    # Same values as 1 / (1 + exp(-x)) without overflow warnings
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'tanh': np.tanh,
+    'sigmoid': _sigmoid,
+    'softmax': _softmax,
+}
+
+MERGE_MODES = {
+    'concat': lambda fwd, bwd: np.concatenate([fwd, bwd], axis=-1),
+    'sum': lambda fwd, bwd: fwd + bwd,
+    'ave': lambda fwd, bwd: (fwd + bwd) / 2,
+    'mul': lambda fwd, bwd: fwd * bwd,
+}
+
+SKIPPED_LAYERS = {'Dropout', 'InputLayer'}
+# Exported as a layer spec, but without weights
+POOLING_LAYERS = {'GlobalMaxPooling1D'}
+
+
+# ---------------------------------------------------------------------------
+# Export (needs Keras, runs after training)
+# ---------------------------------------------------------------------------
+
+def _activation_name(layer_config: dict, key: str) -> str:
+    name = layer_config[key]
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation for NumPy export: {name}")
+    return name
+
+
+def _export_lstm(layer, prefix: str, arrays: dict) -> dict:
+    layer_config = layer.get_config()
+    weights = layer.get_weights()
+    units = layer_config['units']
+
+    arrays[f'{prefix}/kernel'] = weights[0]
+    arrays[f'{prefix}/recurrent_kernel'] = weights[1]
+    arrays[f'{prefix}/bias'] = weights[2] if len(weights) > 2 else np.zeros(4 * units, np.float32)
+
+    return {
+        'type': 'lstm',
+        'activation': _activation_name(layer_config, 'activation'),
+        'recurrent_activation': _activation_name(layer_config, 'recurrent_activation'),
+        'return_sequences': layer_config['return_sequences'],
+        'go_backwards': layer_config.get('go_backwards', False),
+    }
+
+
+def model_arrays(keras_model) -> tuple:
+    """
+    Layer spec and weight arrays of a Sequential Keras model
+
+    Args:
+        keras_model: Trained Sequential model (Embedding/LSTM/Bidirectional/Dense)
+
+    Returns:
+        (layers, arrays): JSON-serializable layer list for NumpyNetwork and
+        the weights keyed as 'layer{index}/...'
+    """
+    arrays = {}
+    layers = []
+
+    for index, layer in enumerate(keras_model.layers):
+        kind = type(layer).__name__
+        prefix = f'layer{index}'
+
+        if kind in SKIPPED_LAYERS:
+            continue
+        elif kind == 'Embedding':
+            arrays[f'{prefix}/embeddings'] = layer.get_weights()[0]
+            layers.append({
+                'type': 'embedding',
+                'prefix': prefix,
+                'mask_zero': bool(layer.get_config().get('mask_zero', False)),
+            })
+        elif kind == 'LSTM':
+            spec = _export_lstm(layer, prefix, arrays)
+            layers.append(dict(spec, prefix=prefix))
+        elif kind == 'Bidirectional':
+            if type(layer.forward_layer).__name__ != 'LSTM':
+                raise ValueError("Only Bidirectional(LSTM) is supported by the NumPy engine")
+            if layer.merge_mode not in MERGE_MODES:
+                raise ValueError(f"Unsupported Bidirectional merge_mode: {layer.merge_mode}")
+            layers.append({
+                'type': 'bidirectional',
+                'merge_mode': layer.merge_mode,
+                'forward': dict(_export_lstm(layer.forward_layer, f'{prefix}/forward', arrays),
+                                prefix=f'{prefix}/forward'),
+                'backward': dict(_export_lstm(layer.backward_layer, f'{prefix}/backward', arrays),
+                                 prefix=f'{prefix}/backward'),
+            })
+        elif kind == 'GlobalMaxPooling1D':
+            layers.append({'type': 'global_max_pooling'})
+        elif kind == 'Dense':
+            kernel, bias = layer.get_weights()
+            arrays[f'{prefix}/kernel'] = kernel
+            arrays[f'{prefix}/bias'] = bias
+            layers.append({
+                'type': 'dense',
+                'prefix': prefix,
+                'activation': _activation_name(layer.get_config(), 'activation'),
+            })
+        else:
+            raise ValueError(f"Layer type {kind} is not supported by the NumPy engine")
+
+    return layers, arrays
+
+
+def _lstm_values(layer, prefix: str, arrays: dict) -> list:
+    values = [arrays[f'{prefix}/kernel'], arrays[f'{prefix}/recurrent_kernel']]
+    if layer.get_config().get('use_bias', True):
+        values.append(arrays[f'{prefix}/bias'])
+    return values
+
+
+def restore_keras_weights(keras_model, arrays: dict):
+    """
+    Inverse of model_arrays: set the weights of a freshly built model
+
+    The model must have the architecture the arrays were taken from and
+    its weights must already exist (call it once on a dummy batch).
+    """
+    for index, layer in enumerate(keras_model.layers):
+        kind = type(layer).__name__
+        prefix = f'layer{index}'
+        # Bundles may store float16; Keras variables stay float32
+        values = {key: np.asarray(value, dtype=np.float32) for key, value in arrays.items()
+                  if key.startswith(prefix + '/')}
+
+        if kind in SKIPPED_LAYERS or kind in POOLING_LAYERS:
+            continue
+        elif kind == 'Embedding':
+            layer.set_weights([values[f'{prefix}/embeddings']])
+        elif kind == 'LSTM':
+            layer.set_weights(_lstm_values(layer, prefix, values))
+        elif kind == 'Bidirectional':
+            layer.forward_layer.set_weights(
+                _lstm_values(layer.forward_layer, f'{prefix}/forward', values))
+            layer.backward_layer.set_weights(
+                _lstm_values(layer.backward_layer, f'{prefix}/backward', values))
+        elif kind == 'Dense':
+            layer.set_weights([values[f'{prefix}/kernel'], values[f'{prefix}/bias']])
+        else:
+            raise ValueError(f"Layer type {kind} is not supported by the NumPy engine")
+
+
+# ---------------------------------------------------------------------------
+# Inference (NumPy only)
+# ---------------------------------------------------------------------------
+
+class NumpyTokenizer:
+    """Keras Tokenizer.texts_to_sequences without Keras"""
+
+    def __init__(self, word_index: dict, num_words: int = None, oov_token: str = None,
+                 filters: str = '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n',
+                 lower: bool = True, split: str = ' '):
+        self.word_index = word_index
+        self.num_words = num_words
+        self.oov_token = oov_token
+        self.filters = filters
+        self.lower = lower
+        self.split = split
+        self._translate = str.maketrans({c: split for c in filters})
+        self._oov_index = word_index.get(oov_token) if oov_token is not None else None
+
+    def texts_to_sequences(self, texts: list) -> list:
+        sequences = []
+        for text in texts:
+            if self.lower:
+                text = text.lower()
+            sequence = []
+            for word in text.translate(self._translate).split(self.split):
+                if not word:
+                    continue
+                index = self.word_index.get(word)
+                if index is not None and not (self.num_words and index >= self.num_words):
+                    sequence.append(index)
+                elif self._oov_index is not None:
+                    sequence.append(self._oov_index)
+            sequences.append(sequence)
+        return sequences
+
+
+def _lstm(x: np.ndarray, weights, spec: dict, mask: np.ndarray = None) -> np.ndarray:
+    """
+    Run one LSTM layer over a (batch, steps, features) array
+
+    Where `mask` (batch, steps) is False the step is skipped and the state
+    carried over unchanged, as Keras does for masked time steps.
+    """
+    kernel, recurrent_kernel, bias = weights
+    batch, steps, _ = x.shape
+    units = recurrent_kernel.shape[0]
+    activation = ACTIVATIONS[spec['activation']]
+    recurrent_activation = ACTIVATIONS[spec['recurrent_activation']]
+
+    # Input projections for every time step in a single matmul
+    projected = x @ kernel + bias
+
+    h = np.zeros((batch, units), dtype=x.dtype)
+    c = np.zeros((batch, units), dtype=x.dtype)
+    outputs = []
+    steps_order = range(steps - 1, -1, -1) if spec['go_backwards'] else range(steps)
+
+    for t in steps_order:
+        z = projected[:, t] + h @ recurrent_kernel
+        # Keras gate order: input, forget, cell, output
+        i = recurrent_activation(z[:, :units])
+        f = recurrent_activation(z[:, units:2 * units])
+        g = activation(z[:, 2 * units:3 * units])
+        o = recurrent_activation(z[:, 3 * units:])
+        c_next = f * c + i * g
+        h_next = o * activation(c_next)
+        if mask is None:
+            h, c = h_next, c_next
+        else:
+            keep = mask[:, t:t + 1]
+            h = np.where(keep, h_next, h)
+            c = np.where(keep, c_next, c)
+        if spec['return_sequences']:
+            outputs.append(h)
+
+    # Like Keras, a go_backwards layer returns its sequence in processing order
+    return np.stack(outputs, axis=1) if spec['return_sequences'] else h
+
+
+class NumpyNetwork:
+    """Forward pass over exported layers; mirrors keras Model.predict"""
+
+    def __init__(self, layers: list, arrays: dict):
+        self.layers = layers
+        self.arrays = arrays
+        # Padding-invariant models can run on shorter, bucketed padding
+        self.masks_padding = any(layer.get('mask_zero') for layer in layers)
+
+    def _lstm_weights(self, prefix: str):
+        return (self.arrays[f'{prefix}/kernel'],
+                self.arrays[f'{prefix}/recurrent_kernel'],
+                self.arrays[f'{prefix}/bias'])
+
+    def predict(self, X: np.ndarray, verbose: int = 0) -> np.ndarray:
+        x = X
+        mask = None
+        for layer in self.layers:
+            kind = layer['type']
+            if kind == 'embedding':
+                if layer.get('mask_zero'):
+                    mask = X != 0
+                x = self.arrays[f"{layer['prefix']}/embeddings"][x]
+                if x.dtype != np.float32:
+                    # float16 bundles: only the looked-up rows are upcast
+                    x = x.astype(np.float32)
+            elif kind == 'lstm':
+                x = _lstm(x, self._lstm_weights(layer['prefix']), layer, mask)
+                if not layer['return_sequences']:
+                    mask = None
+            elif kind == 'bidirectional':
+                forward, backward = layer['forward'], layer['backward']
+                fwd = _lstm(x, self._lstm_weights(forward['prefix']), forward, mask)
+                bwd = _lstm(x, self._lstm_weights(backward['prefix']), backward, mask)
+                if backward['return_sequences']:
+                    # Realign the backward sequence with the input time steps
+                    bwd = bwd[:, ::-1]
+                else:
+                    mask = None
+                x = MERGE_MODES[layer['merge_mode']](fwd, bwd)
+            elif kind == 'global_max_pooling':
+                # Like Keras, over every step (a mask is ignored)
+                x = x.max(axis=1)
+                mask = None
+            elif kind == 'dense':
+                x = ACTIVATIONS[layer['activation']](
+                    x @ self.arrays[f"{layer['prefix']}/kernel"] + self.arrays[f"{layer['prefix']}/bias"]
+                )
+        return x
+
+
+class NumpyClassifier:
+    """TensorFlow-free stand-in for SentimentModel / IntentModel at inference time"""
+
+    def __init__(self, label_key: str, bundle_name: str = None):
+        # label_key names the prediction field: 'sentiment' or 'intent';
+        # bundle_name the model in the bundle (default: label_key, the LSTM)
+        self.label_key = label_key
+        self.bundle_name = bundle_name or label_key
+        self.model = None
+        self.classes = None
+        self.tokenizer = None
+        self.max_length = config.MAX_SEQUENCE_LENGTH
+
+    def set_tokenizer(self, tokenizer: NumpyTokenizer):
+        """Set tokenizer (shared between classifiers)"""
+        self.tokenizer = tokenizer
+
+    def load_bundle(self, bundle=None):
+        """
+        Load this classifier's weights and classes from a model bundle
+
+        Args:
+            bundle: ml.bundle.ModelBundle, or a bundle directory
+                (default: the current bundle). The bundle's tokenizer is
+                used unless one is already set.
+        """
+        from ml.bundle import ModelBundle, load_bundle
+
+        if not isinstance(bundle, ModelBundle):
+            bundle = load_bundle(bundle)
+
+        self.model = bundle.network(self.bundle_name)
+        self.classes = bundle.classes(self.bundle_name)
+        if self.tokenizer is None:
+            self.tokenizer = bundle.tokenizer
+        print(f"NumPy {self.bundle_name} model loaded from bundle {bundle.version}")
+
+    def warmup(self):
+        """Run each length bucket once, like the Keras classes' warmup"""
+        for bound in length_buckets(self.max_length, self.model.masks_padding):
+            self.model.predict(np.zeros((1, bound), dtype=np.int32))
+
+    def prepare_data(self, texts: list) -> np.ndarray:
+        """Convert texts to padded sequences"""
+        if self.tokenizer is None:
+            raise ValueError("Tokenizer not set. Use set_tokenizer() first.")
+        return pad_sequences(self.tokenizer.texts_to_sequences(texts), self.max_length)
+
+    def predict(self, texts: list or str, columnar: bool = False):
+        """
+        Predict labels for given texts
+
+        Args:
+            texts: Single text string, list of texts, or list of token lists
+                (preprocess_batch(..., return_string=False))
+            columnar: Return NumPy arrays instead of one dict per text
+
+        Returns:
+            List of predictions with the label (under `label_key`), confidence
+            and per-class probabilities, like the Keras model classes
+        """
+        single_input = isinstance(texts, str)
+        if single_input:
+            texts = [texts]
+
+        buckets = length_buckets(self.max_length, self.model.masks_padding)
+        padded, lengths = token_encoder(self.tokenizer).encode(texts, buckets)
+        predictions = predict_padded(self.model.predict, padded, lengths, buckets)
+
+        results = decode_predictions(predictions, self.classes, self.label_key, columnar)
+
+        if columnar:
+            return results
+        return results[0] if single_input else results
+
+
+# Singleton instances
+numpy_sentiment_model = NumpyClassifier('sentiment')
+numpy_intent_model = NumpyClassifier('intent')
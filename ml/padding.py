@@ -0,0 +1,113 @@
+"""
+Sequence padding helpers shared by the Keras and NumPy inference paths
+
+Models whose Embedding uses mask_zero=True ignore padding, so a batch can be
+padded only as far as its longest sequence needs. `predict_bucketed` groups
+sequences into a few fixed length buckets (config.LENGTH_BUCKETS), pads each
+bucket to its own bound and runs one forward pass per bucket; the LSTMs then
+skip most of the zero steps a full MAX_SEQUENCE_LENGTH pad would cost.
+
+When each forward pass has a high fixed cost (Keras model.predict), pass
+split=False: the whole batch is padded to the smallest bucket that fits its
+longest sequence and run in a single call.
+"""
+
+import numpy as np
+import config
+
+
+def pad_sequences(sequences: list, maxlen: int) -> np.ndarray:
+    """Equivalent of keras pad_sequences(padding='post', truncating='post')"""
+    padded = np.zeros((len(sequences), maxlen), dtype=np.int32)
+    for row, sequence in enumerate(sequences):
+        sequence = sequence[:maxlen]
+        padded[row, :len(sequence)] = sequence
+    return padded
+
+
+def masks_padding(keras_model) -> bool:
+    """Whether a Keras model's Embedding masks zero (padding) ids"""
+    return any(getattr(layer, 'mask_zero', False) for layer in keras_model.layers)
+
+
+def length_buckets(max_length: int, bucketed: bool = True) -> list:
+    """
+    Bucket bounds for a model's maximum sequence length
+
+    Args:
+        max_length: The model's maximum sequence length (always the last bound)
+        bucketed: False for models that don't mask padding; those must
+            always see fully padded sequences to keep their predictions
+    """
+    if not bucketed:
+        return [max_length]
+    return sorted(b for b in set(config.LENGTH_BUCKETS) if b < max_length) + [max_length]
+
+
+def predict_bucketed(predict, sequences: list, buckets: list, split: bool = True):
+    """
+    Run `predict` once per length bucket and reassemble outputs in input order
+
+    Args:
+        predict: Function from a padded (batch, steps) id matrix to an array,
+            or a list of arrays for multi-output models
+        sequences: Token id lists (unpadded)
+        buckets: Ascending bucket bounds; the last one is the truncation length
+        split: One call per bucket (True) or one call for the whole batch,
+            padded to the bucket of its longest sequence (False)
+
+    Returns:
+        Same structure `predict` returns, with one row per input sequence
+    """
+    max_length = buckets[-1]
+    lengths = np.array([min(len(s), max_length) for s in sequences], dtype=np.intp)
+    longest = int(lengths.max()) if len(sequences) else 0
+    width = next(b for b in buckets if b >= longest)
+    return predict_padded(predict, pad_sequences(sequences, width), lengths, buckets, split)
+
+
+def predict_padded(predict, padded: np.ndarray, lengths: np.ndarray, buckets: list,
+                   split: bool = True):
+    """
+    predict_bucketed for a batch that is already one padded id matrix
+
+    Args:
+        predict: As for predict_bucketed
+        padded: (batch, width) post-padded ids, at least as wide as the
+            bucket of the longest row (see ml.token_ids.TokenIdEncoder.encode)
+        lengths: Unpadded length of each row
+        buckets: Ascending bucket bounds
+        split: As for predict_bucketed
+
+    Returns:
+        Same structure `predict` returns, with one row per input row
+    """
+    if not len(padded):
+        return predict(np.zeros((0, buckets[-1]), dtype=np.int32))
+
+    # Index of the smallest bucket that fits each row
+    row_buckets = np.searchsorted(buckets, np.minimum(lengths, buckets[-1]))
+
+    if not split:
+        bound = buckets[row_buckets.max()]
+        return predict(np.ascontiguousarray(padded[:, :bound]))
+
+    groups = np.unique(row_buckets)
+    if len(groups) == 1:
+        return predict(np.ascontiguousarray(padded[:, :buckets[groups[0]]]))
+
+    outputs = None
+    multi_output = False
+    for group in groups:
+        indices = np.flatnonzero(row_buckets == group)
+        result = predict(padded[indices, :buckets[group]])
+        multi_output = isinstance(result, (list, tuple))
+        parts = result if multi_output else [result]
+
+        if outputs is None:
+            outputs = [np.empty((len(padded),) + part.shape[1:], dtype=part.dtype)
+                       for part in parts]
+        for output, part in zip(outputs, parts):
+            output[indices] = part
+
+    return outputs if multi_output else outputs[0]
@@ -0,0 +1,54 @@
+"""
+Vectorized decoding of prediction matrices into labels and scores
+
+Replaces per-row label_encoder.inverse_transform calls: argmax, max and the
+label lookup run once over the whole (batch, classes) matrix.
+"""
+
+import numpy as np
+
+
+def class_names(label_encoder) -> np.ndarray:
+    """Label for each output index, as a NumPy string array"""
+    return np.asarray(label_encoder.classes_).astype(str)
+
+
+def decode_predictions(predictions: np.ndarray, classes: np.ndarray, key: str,
+                       columnar: bool = False):
+    """
+    Turn a probability matrix into labels and confidence scores
+
+    Args:
+        predictions: (batch, classes) probability matrix
+        classes: Label for each column (see class_names)
+        key: Name of the label field, e.g. 'sentiment' or 'intent'
+        columnar: Return arrays instead of one dict per row
+
+    Returns:
+        columnar=False: list of {key, 'confidence', 'probabilities'} dicts
+        columnar=True: {key: label array, 'confidence': score array,
+                        'probabilities': the input matrix, 'classes': classes}
+    """
+    predictions = np.asarray(predictions)
+    indices = predictions.argmax(axis=1)
+    confidences = predictions[np.arange(len(predictions)), indices]
+    labels = classes[indices]
+
+    if columnar:
+        return {
+            key: labels,
+            'confidence': confidences,
+            'probabilities': predictions,
+            'classes': classes,
+        }
+
+    names = classes.tolist()
+    return [
+        {
+            key: label,
+            'confidence': confidence,
+            'probabilities': dict(zip(names, row))
+        }
+        for label, confidence, row in zip(labels.tolist(), confidences.tolist(),
+                                          predictions.tolist())
+    ]
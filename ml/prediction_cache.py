@@ -0,0 +1,267 @@
+"""
+Content-addressed cache of analysis results
+
+Keys are a hash of the preprocessed text and the serving model version, so
+inputs that normalize to the same string share one entry and entries from an
+older model can never be returned. Two tiers:
+
+- in-process LRU (PREDICTION_CACHE_SIZE entries)
+- optional SQLite table shared by every worker process on the host
+  (PREDICTION_CACHE_SQLITE), bounded to PREDICTION_CACHE_SQLITE_MAX_ENTRIES
+  by evicting the oldest-written rows
+
+The cache stays disabled until a model version is set, which
+ml.inference does when it activates a set of serving models; switching to a
+different version clears the LRU tier and drops the old version's SQLite
+rows. Requests still running on the replaced models bypass the cache.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+import config
+
+# Cached value: (sentiment, sentiment_score, intent, intent_score)
+Row = Tuple[str, float, str, float]
+
+# Trim the SQLite tier after this many inserts
+SQLITE_TRIM_INTERVAL = 1000
+
+# SQLite's default limit on bound parameters is 999 in older builds
+SQLITE_MAX_PARAMS = 500
+
+
+class PredictionCache:
+    """Two-tier (LRU + optional SQLite) cache keyed by text and model version"""
+
+    def __init__(self, max_entries: int = None, sqlite_path: str = None,
+                 sqlite_max_entries: int = None):
+        self.max_entries = config.PREDICTION_CACHE_SIZE if max_entries is None else max_entries
+        self.sqlite_path = sqlite_path
+        self.sqlite_max_entries = (config.PREDICTION_CACHE_SQLITE_MAX_ENTRIES
+                                   if sqlite_max_entries is None else sqlite_max_entries)
+        self.model_version: Optional[str] = None
+
+        self._entries: "OrderedDict[str, Row]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._inserts_since_trim = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.sqlite_hits = 0
+        self.sqlite_evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.model_version is not None and (self.max_entries > 0 or bool(self.sqlite_path))
+
+    def key(self, text: str, version: str = None) -> str:
+        version = self.model_version if version is None else version
+        return hashlib.blake2b(f"{version}\0{text}".encode('utf-8'),
+                               digest_size=16).hexdigest()
+
+    def set_model_version(self, version: Optional[str]):
+        """Switch to a model version, dropping entries computed by any other"""
+        with self._lock:
+            if version == self.model_version:
+                return
+            if self.model_version is not None:
+                self.invalidations += 1
+            self.model_version = version
+            self._entries.clear()
+
+            if version is not None and self.sqlite_path:
+                conn = self._sqlite()
+                with conn:
+                    conn.execute("DELETE FROM prediction_cache WHERE model_version != ?",
+                                 (version,))
+
+    def predict(self, texts: List[str], predict_fn: Callable[[list], List[Row]],
+                inputs: list = None, version: str = None) -> List[Row]:
+        """
+        Rows for `texts`, calling predict_fn only for distinct uncached texts
+
+        Args:
+            texts: Preprocessed texts (the cache keys)
+            predict_fn: Computes rows for a list of inputs, in order
+            inputs: What predict_fn receives for each text, e.g. its token
+                list (default: the texts themselves)
+            version: Model version predict_fn runs (default: the current
+                one). Any other version bypasses the cache, so a request
+                still running on replaced models never stores its rows.
+
+        Returns:
+            One row per input text, in input order
+        """
+        version = self.model_version if version is None else version
+        by_text = dict(zip(texts, texts if inputs is None else inputs))
+        unique = list(by_text)
+        if not self.enabled or version != self.model_version:
+            computed = dict(zip(unique, predict_fn(list(by_text.values())))) if unique else {}
+            return [computed[text] for text in texts]
+
+        keys = {text: self.key(text, version) for text in unique}
+        found = self._get_many(keys)
+
+        missing = [text for text in unique if text not in found]
+        if missing:
+            computed = dict(zip(missing, predict_fn([by_text[text] for text in missing])))
+            self._put_many({keys[text]: row for text, row in computed.items()}, version)
+            found.update(computed)
+
+        return [found[text] for text in texts]
+
+    def _get_many(self, keys: Dict[str, str]) -> Dict[str, Row]:
+        found = {}
+        with self._lock:
+            for text, key in keys.items():
+                row = self._entries.get(key)
+                if row is not None:
+                    self._entries.move_to_end(key)
+                    found[text] = row
+
+            remaining = {key: text for text, key in keys.items() if text not in found}
+            if remaining and self.sqlite_path:
+                for key, row in self._sqlite_get(list(remaining)).items():
+                    found[remaining[key]] = row
+                    self.sqlite_hits += 1
+                    self._remember(key, row)
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def _put_many(self, rows: Dict[str, Row], version: str):
+        with self._lock:
+            if version != self.model_version:
+                # The models were swapped while these rows were computed
+                return
+            for key, row in rows.items():
+                self._remember(key, row)
+            if self.sqlite_path:
+                self._sqlite_put(rows)
+
+    def _remember(self, key: str, row: Row):
+        """Add to the LRU tier, evicting least recently used entries (lock held)"""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = row
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _sqlite(self):
+        """Shared-tier connection, opened on first use (lock held)"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.execute("PRAGMA busy_timeout = 5000")
+            with self._conn:
+                self._conn.execute('''
+                    CREATE TABLE IF NOT EXISTS prediction_cache (
+                        key TEXT PRIMARY KEY,
+                        model_version TEXT NOT NULL,
+                        sentiment TEXT,
+                        sentiment_score REAL,
+                        intent TEXT,
+                        intent_score REAL,
+                        created_at REAL NOT NULL
+                    ) WITHOUT ROWID
+                ''')
+                self._conn.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_prediction_cache_created_at
+                    ON prediction_cache(created_at)
+                ''')
+        return self._conn
+
+    def _sqlite_get(self, keys: List[str]) -> Dict[str, Row]:
+        conn = self._sqlite()
+        found = {}
+        for start in range(0, len(keys), SQLITE_MAX_PARAMS):
+            chunk = keys[start:start + SQLITE_MAX_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            for key, *row in conn.execute(f'''
+                SELECT key, sentiment, sentiment_score, intent, intent_score
+                FROM prediction_cache WHERE key IN ({placeholders})
+            ''', chunk):
+                found[key] = tuple(row)
+        return found
+
+    def _sqlite_put(self, rows: Dict[str, Row]):
+        conn = self._sqlite()
+        now = time.time()
+        with conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO prediction_cache
+                    (key, model_version, sentiment, sentiment_score, intent, intent_score, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', [(key, self.model_version, *row, now) for key, row in rows.items()])
+
+        self._inserts_since_trim += len(rows)
+        if self._inserts_since_trim >= SQLITE_TRIM_INTERVAL:
+            self._inserts_since_trim = 0
+            self._sqlite_trim()
+
+    def _sqlite_trim(self):
+        """Evict the oldest-written rows beyond sqlite_max_entries"""
+        conn = self._sqlite()
+        count = conn.execute("SELECT COUNT(*) FROM prediction_cache").fetchone()[0]
+        excess = count - self.sqlite_max_entries
+        if excess > 0:
+            with conn:
+                conn.execute('''
+                    DELETE FROM prediction_cache WHERE key IN (
+                        SELECT key FROM prediction_cache ORDER BY created_at LIMIT ?
+                    )
+                ''', (excess,))
+            self.sqlite_evictions += excess
+
+    def clear(self):
+        """Drop every entry in both tiers"""
+        with self._lock:
+            self._entries.clear()
+            if self.sqlite_path:
+                conn = self._sqlite()
+                with conn:
+                    conn.execute("DELETE FROM prediction_cache")
+
+    def stats(self) -> Dict:
+        """Hit rate, size and eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'model_version': self.model_version,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'sqlite': {
+                    'enabled': bool(self.sqlite_path),
+                    'hits': self.sqlite_hits,
+                    'evictions': self.sqlite_evictions,
+                },
+            }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Singleton instance
+prediction_cache = PredictionCache(
+    sqlite_path=str(config.PREDICTION_CACHE_PATH) if config.PREDICTION_CACHE_SQLITE else None
+)
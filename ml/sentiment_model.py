@@ -1,11 +1,9 @@
 import numpy as np
 import pickle
-from tensorflow import keras
-from keras.models import Sequential, load_model
-from keras.layers import Embedding, Bidirectional, LSTM, Dense, Dropout
-from keras.preprocessing.text import Tokenizer
-from keras.preprocessing.sequence import pad_sequences
-from sklearn.preprocessing import LabelEncoder
+from ml.padding import predict_padded
+from ml.token_ids import token_encoder
+from ml.serving import ServingFunction
+from ml.postprocess import class_names, decode_predictions
 import config
 import os
 
@@ -19,8 +17,12 @@ class SentimentModel:
         self.max_length = config.MAX_SEQUENCE_LENGTH
         self.max_vocab = config.MAX_VOCAB_SIZE
         self.embedding_dim = config.EMBEDDING_DIM
+        # Compiled forward pass for predict(), built on first use
+        self._serving = None
+        # (label_encoder, class name array) used to decode predictions
+        self._classes = None
         
-    def build_model(self, vocab_size: int, num_classes: int = 3):
+    def build_model(self, vocab_size: int, num_classes: int = 3, mask_zero: bool = True):
         """
         Build Bi-LSTM architecture for sentiment classification
         
@@ -29,11 +31,18 @@ class SentimentModel:
         - Bidirectional LSTM
         - Dropout for regularization
         - Dense layer with softmax activation
+        
+        mask_zero=False rebuilds the unmasked architecture of models
+        trained before padding masks were added (see load_bundle)
         """
+        from keras.models import Sequential
+        from keras.layers import Embedding, Bidirectional, LSTM, Dense, Dropout
+        
         model = Sequential([
+            # mask_zero: padding is ignored, so inference can pad per length bucket
             Embedding(input_dim=vocab_size, 
                      output_dim=self.embedding_dim, 
-                     input_length=self.max_length),
+                     mask_zero=mask_zero),
             
             Bidirectional(LSTM(64, return_sequences=True)),
             Dropout(0.3),
@@ -54,6 +63,7 @@ class SentimentModel:
         )
         
         self.model = model
+        self._serving = None
         return model
     
     def prepare_data(self, texts: list, labels: list = None):
@@ -67,8 +77,12 @@ class SentimentModel:
         Returns:
             Padded sequences and encoded labels (if labels provided)
         """
+        from keras.preprocessing.sequence import pad_sequences
+        
         # Initialize tokenizer if not exists
         if self.tokenizer is None:
+            from keras.preprocessing.text import Tokenizer
+
             self.tokenizer = Tokenizer(num_words=self.max_vocab, oov_token='<OOV>')
             self.tokenizer.fit_on_texts(texts)
         
@@ -79,6 +93,7 @@ class SentimentModel:
         # Encode labels if provided
         if labels is not None:
             if self.label_encoder is None:
+                from sklearn.preprocessing import LabelEncoder
                 self.label_encoder = LabelEncoder()
                 self.label_encoder.fit(config.SENTIMENT_CLASSES)
             
@@ -121,15 +136,20 @@ class SentimentModel:
         
         return history
     
-    def predict(self, texts: list or str) -> list:
+    def predict(self, texts: list or str, columnar: bool = False):
         """
         Predict sentiment for given texts
         
         Args:
-            texts: Single text string or list of texts
+            texts: Single text string, list of texts, or list of token lists
+                (preprocess_batch(..., return_string=False))
+            columnar: Return NumPy arrays instead of one dict per text
+                (for bulk callers that don't need the per-class dicts)
         
         Returns:
-            List of predictions with sentiment and confidence score
+            List of predictions with sentiment and confidence score, or with
+            columnar=True a dict of 'sentiment' labels, 'confidence' scores,
+            the 'probabilities' matrix and its 'classes'
         """
         # Handle single text input
         if isinstance(texts, str):
@@ -138,30 +158,37 @@ class SentimentModel:
         else:
             single_input = False
         
-        # Prepare data
-        X = self.prepare_data(texts)
+        if self.tokenizer is None:
+            raise ValueError("Tokenizer not set. Call train(), load_model() or load_bundle() first.")
         
-        # Get predictions
-        predictions = self.model.predict(X, verbose=0)
+        # Get predictions, one compiled forward pass per length bucket
+        serving = self.serving_function()
+        padded, lengths = token_encoder(self.tokenizer).encode(texts, serving.buckets)
+        predictions = predict_padded(serving, padded, lengths, serving.buckets)
         
-        # Convert to sentiment labels and scores
-        results = []
-        for pred in predictions:
-            class_idx = np.argmax(pred)
-            confidence = float(pred[class_idx])
-            sentiment = self.label_encoder.inverse_transform([class_idx])[0]
-            
-            results.append({
-                'sentiment': sentiment,
-                'confidence': confidence,
-                'probabilities': {
-                    self.label_encoder.inverse_transform([i])[0]: float(pred[i])
-                    for i in range(len(pred))
-                }
-            })
+        # Convert to sentiment labels and scores for the whole batch at once
+        results = decode_predictions(predictions, self.class_names(), 'sentiment', columnar)
         
+        if columnar:
+            return results
         return results[0] if single_input else results
     
+    def class_names(self) -> np.ndarray:
+        """Label for each output index, cached per label encoder"""
+        if self._classes is None or self._classes[0] is not self.label_encoder:
+            self._classes = (self.label_encoder, class_names(self.label_encoder))
+        return self._classes[1]
+    
+    def serving_function(self) -> ServingFunction:
+        """Compiled forward pass used by predict (built on first use)"""
+        if self._serving is None:
+            self._serving = ServingFunction(self.model, self.max_length)
+        return self._serving
+    
+    def warmup(self):
+        """Trace the serving function so the first request doesn't pay for it"""
+        self.serving_function().warmup()
+    
     def save_model(self, model_path: str = None, tokenizer_path: str = None, 
                    encoder_path: str = None):
         """Save model and preprocessing artifacts"""
@@ -176,11 +203,15 @@ class SentimentModel:
         with open(tokenizer_path, 'wb') as f:
             pickle.dump(self.tokenizer, f)
         
-        # Save label encoder
+        # Save label encoder, keeping the encoders other models stored in
+        # the same file (intent, multitask_*)
+        encoders = {}
+        if os.path.exists(encoder_path):
+            with open(encoder_path, 'rb') as f:
+                encoders = pickle.load(f)
+        encoders['sentiment'] = self.label_encoder
         with open(encoder_path, 'wb') as f:
-            pickle.dump({
-                'sentiment': self.label_encoder
-            }, f)
+            pickle.dump(encoders, f)
         
         print(f"Model saved to {model_path}")
         print(f"Tokenizer saved to {tokenizer_path}")
@@ -195,7 +226,9 @@ class SentimentModel:
         
         # Load model
         if os.path.exists(model_path):
+            from keras.models import load_model
             self.model = load_model(model_path)
+            self._serving = None
             print(f"Model loaded from {model_path}")
         else:
             raise FileNotFoundError(f"Model not found at {model_path}")
@@ -216,6 +249,28 @@ class SentimentModel:
             print(f"Label encoder loaded from {encoder_path}")
         else:
             raise FileNotFoundError(f"Label encoder not found at {encoder_path}")
+    
+    def load_bundle(self, bundle=None):
+        """
+        Load model, tokenizer and label encoder from a model bundle
+        
+        Args:
+            bundle: ml.bundle.ModelBundle, or a bundle directory
+                (default: the current bundle)
+        """
+        from ml.bundle import ModelBundle, load_bundle
+        
+        if not isinstance(bundle, ModelBundle):
+            bundle = load_bundle(bundle)
+        
+        classes = bundle.classes('sentiment')
+        # Same padding mask as the exported model (older models have none)
+        self.build_model(bundle.input_dim('sentiment'), num_classes=len(classes),
+                         mask_zero=bundle.masks_padding('sentiment'))
+        bundle.restore_weights('sentiment', self.model)
+        self.tokenizer = bundle.tokenizer
+        self.label_encoder = bundle.label_encoder('sentiment')
+        print(f"Model loaded from bundle {bundle.version}")
 
 
 # Create singleton instance
@@ -0,0 +1,41 @@
+"""
+Compiled serving path for the Keras models
+
+keras.Model.predict builds a data adapter, callbacks and a progress loop on
+every call, which dominates the cost for the small batches the online
+endpoints send. `ServingFunction` wraps `model(X, training=False)` in a
+tf.function with a fixed input signature, so it is traced once and then
+reused for every batch size and length bucket.
+"""
+
+import numpy as np
+from ml.padding import length_buckets, masks_padding
+
+
+class ServingFunction:
+    """Retrace-free forward pass for one Keras model"""
+
+    def __init__(self, keras_model, max_length: int):
+        import tensorflow as tf
+
+        bucketed = masks_padding(keras_model)
+        self.buckets = length_buckets(max_length, bucketed)
+
+        # Masked models accept any length; older models need the full padding
+        signature = [tf.TensorSpec(shape=(None, None if bucketed else max_length),
+                                   dtype=tf.int32)]
+        self._forward = tf.function(
+            lambda X: keras_model(X, training=False),
+            input_signature=signature
+        )
+
+    def __call__(self, X: np.ndarray):
+        outputs = self._forward(X)
+        if isinstance(outputs, (list, tuple)):
+            return [output.numpy() for output in outputs]
+        return outputs.numpy()
+
+    def warmup(self):
+        """Trace the function and run every bucket shape once"""
+        for bound in self.buckets:
+            self(np.zeros((1, bound), dtype=np.int32))
@@ -0,0 +1,185 @@
+import numpy as np
+from ml.padding import predict_padded
+from ml.token_ids import token_encoder
+from ml.serving import ServingFunction
+from ml.postprocess import class_names, decode_predictions
+import config
+
+class StudentModel:
+    """Compact pooled-embedding classifier distilled from SentimentModel / IntentModel"""
+
+    def __init__(self, label_key: str):
+        # label_key names the prediction field: 'sentiment' or 'intent'
+        self.label_key = label_key
+        self.model = None
+        self.tokenizer = None
+        self.label_encoder = None
+        self.max_length = config.MAX_SEQUENCE_LENGTH
+        self.embedding_dim = config.STUDENT_EMBEDDING_DIM
+        self.hidden_units = config.STUDENT_HIDDEN_UNITS
+        # Compiled forward pass for predict(), built on first use
+        self._serving = None
+        # (label_encoder, class name array) used to decode predictions
+        self._classes = None
+
+    @property
+    def bundle_name(self) -> str:
+        """Name of this model in the model bundle"""
+        return f"{self.label_key}_student"
+
+    def build_model(self, vocab_size: int, num_classes: int):
+        """
+        Build the student architecture
+
+        Architecture:
+        - Small embedding layer
+        - Global max pooling over the (fully padded) sequence
+        - One hidden Dense layer
+        - Dense layer with softmax activation
+
+        Keras max pooling ignores padding masks, so there is none: the
+        student always sees MAX_SEQUENCE_LENGTH steps and the padding
+        embedding is learned like any other.
+        """
+        from keras.models import Sequential
+        from keras.layers import Embedding, GlobalMaxPooling1D, Dense, Dropout
+        from keras.optimizers import Adam
+
+        model = Sequential([
+            Embedding(input_dim=vocab_size, output_dim=self.embedding_dim),
+            GlobalMaxPooling1D(),
+
+            Dense(self.hidden_units, activation='relu'),
+            Dropout(0.2),
+
+            Dense(num_classes, activation='softmax')
+        ])
+
+        # A model this small trains well with a 10x higher learning rate
+        model.compile(
+            optimizer=Adam(learning_rate=0.01),
+            loss='categorical_crossentropy',
+            metrics=['accuracy']
+        )
+
+        self.model = model
+        self._serving = None
+        return model
+
+    def set_tokenizer(self, tokenizer):
+        """Set tokenizer (shared with the teacher models)"""
+        self.tokenizer = tokenizer
+
+    def distill(self, teacher, texts: list, labels: list, epochs: int = 40,
+                batch_size: int = 32, temperature: float = 2.0, alpha: float = 0.7):
+        """
+        Train on the teacher's soft labels
+
+        Args:
+            teacher: Trained SentimentModel / IntentModel for the same task;
+                its tokenizer and label encoder are reused
+            texts: Preprocessed training texts
+            labels: True label per text
+            epochs: Number of training epochs
+            batch_size: Batch size for training
+            temperature: Softens the teacher's probabilities (p ** (1 / T),
+                renormalized) so the student also learns the class ranking
+            alpha: Weight of the soft labels; the rest goes to the true labels
+
+        Returns:
+            Training history
+        """
+        self.tokenizer = teacher.tokenizer
+        self.label_encoder = teacher.label_encoder
+
+        X = teacher.prepare_data(texts)
+        soft = teacher.model.predict(X, verbose=0) ** (1.0 / temperature)
+        soft /= soft.sum(axis=1, keepdims=True)
+        hard = np.eye(len(self.label_encoder.classes_))[self.label_encoder.transform(labels)]
+        targets = alpha * soft + (1 - alpha) * hard
+
+        # Same vocabulary size as the teacher's Embedding
+        vocab_size = next(layer.input_dim for layer in teacher.model.layers
+                          if type(layer).__name__ == 'Embedding')
+        self.build_model(vocab_size, num_classes=len(self.label_encoder.classes_))
+
+        history = self.model.fit(
+            X, targets,
+            epochs=epochs,
+            batch_size=batch_size,
+            verbose=0
+        )
+
+        return history
+
+    def predict(self, texts: list or str, columnar: bool = False):
+        """
+        Predict labels for given texts
+
+        Args:
+            texts: Single text string, list of texts, or list of token lists
+                (preprocess_batch(..., return_string=False))
+            columnar: Return NumPy arrays instead of one dict per text
+
+        Returns:
+            Same format as SentimentModel / IntentModel.predict, with the
+            label under `label_key`
+        """
+        single_input = isinstance(texts, str)
+        if single_input:
+            texts = [texts]
+
+        if self.tokenizer is None:
+            raise ValueError("Tokenizer not set. Use set_tokenizer() first.")
+
+        serving = self.serving_function()
+        padded, lengths = token_encoder(self.tokenizer).encode(texts, serving.buckets)
+        predictions = predict_padded(serving, padded, lengths, serving.buckets)
+
+        results = decode_predictions(predictions, self.class_names(), self.label_key, columnar)
+
+        if columnar:
+            return results
+        return results[0] if single_input else results
+
+    def class_names(self) -> np.ndarray:
+        """Label for each output index, cached per label encoder"""
+        if self._classes is None or self._classes[0] is not self.label_encoder:
+            self._classes = (self.label_encoder, class_names(self.label_encoder))
+        return self._classes[1]
+
+    def serving_function(self) -> ServingFunction:
+        """Compiled forward pass used by predict (built on first use)"""
+        if self._serving is None:
+            self._serving = ServingFunction(self.model, self.max_length)
+        return self._serving
+
+    def warmup(self):
+        """Trace the serving function so the first request doesn't pay for it"""
+        self.serving_function().warmup()
+
+    def load_bundle(self, bundle=None):
+        """
+        Load the student, tokenizer and label encoder from a model bundle
+
+        Args:
+            bundle: ml.bundle.ModelBundle, or a bundle directory
+                (default: the current bundle)
+        """
+        from ml.bundle import ModelBundle, load_bundle
+
+        if not isinstance(bundle, ModelBundle):
+            bundle = load_bundle(bundle)
+
+        classes = bundle.classes(self.bundle_name)
+        self.build_model(bundle.input_dim(self.bundle_name), num_classes=len(classes))
+        bundle.restore_weights(self.bundle_name, self.model)
+        if self.tokenizer is None:
+            self.tokenizer = bundle.tokenizer
+        self.label_encoder = bundle.label_encoder(self.bundle_name)
+        print(f"Student {self.label_key} model loaded from bundle {bundle.version}")
+
+
+# Create singleton instances
+sentiment_student = StudentModel('sentiment')
+intent_student = StudentModel('intent')
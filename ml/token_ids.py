@@ -0,0 +1,118 @@
+"""
+Fused path from preprocessed tokens to a padded token-id matrix
+
+The NLP pipeline produces token lists. Joining them into a string for
+Tokenizer.texts_to_sequences means Keras lowercases, filters and splits the
+same words again before looking them up. `TokenIdEncoder` looks tokens up
+directly in a compact copy of the fitted tokenizer's vocabulary (only ids
+below num_words) and writes the whole batch into one preallocated int32
+matrix, padded to the batch's length bucket.
+
+Ids are the same as texts_to_sequences on ' '.join(tokens) followed by
+post-padding and post-truncation, for tokenizers fitted with the default
+split=' '.
+"""
+
+import threading
+import weakref
+import numpy as np
+
+# Upper bound on memoized out-of-vocabulary tokens per encoder
+MAX_MEMOIZED_MISSES = 100000
+
+
+class TokenIdEncoder:
+    """Token -> id lookup built from a fitted Keras Tokenizer or NumpyTokenizer"""
+
+    def __init__(self, tokenizer):
+        num_words = tokenizer.num_words
+        self.vocab = {
+            word: index for word, index in tokenizer.word_index.items()
+            if not (num_words and index >= num_words)
+        }
+        self.oov_index = (tokenizer.word_index.get(tokenizer.oov_token)
+                          if tokenizer.oov_token is not None else None)
+        self.lower = tokenizer.lower
+        self.split = tokenizer.split
+        self._translate = str.maketrans({c: tokenizer.split for c in tokenizer.filters})
+        # Tokens not in vocab -> their ids, computed the way Keras would
+        self._misses = {}
+
+    def _words(self, text: str) -> list:
+        """Keras text_to_word_sequence"""
+        if self.lower:
+            text = text.lower()
+        return [word for word in text.translate(self._translate).split(self.split) if word]
+
+    def _miss(self, token: str) -> tuple:
+        ids = self._misses.get(token)
+        if ids is None:
+            ids = []
+            for word in self._words(token):
+                index = self.vocab.get(word, self.oov_index)
+                if index is not None:
+                    ids.append(index)
+            ids = tuple(ids)
+            if len(self._misses) < MAX_MEMOIZED_MISSES:
+                self._misses[token] = ids
+        return ids
+
+    def ids(self, tokens: list) -> list:
+        """Ids for one token list"""
+        ids = list(map(self.vocab.get, tokens))
+        if None not in ids:
+            return ids
+
+        # Out-of-vocabulary, upper-case or filter characters: resolve per token
+        ids = []
+        for token in tokens:
+            index = self.vocab.get(token)
+            if index is not None:
+                ids.append(index)
+            else:
+                ids.extend(self._miss(token))
+        return ids
+
+    def encode(self, texts: list, buckets: list) -> tuple:
+        """
+        Encode a batch into one padded id matrix
+
+        Args:
+            texts: Token lists (preprocess_batch(..., return_string=False)),
+                or preprocessed strings, which are split the way Keras would
+            buckets: Ascending length buckets; the last one is the truncation
+                length and the matrix is as wide as the bucket of the
+                longest row
+
+        Returns:
+            (padded, lengths): (batch, width) int32 matrix with post padding
+            and each row's unpadded length
+        """
+        max_length = buckets[-1]
+        lengths = np.zeros(len(texts), dtype=np.intp)
+        flat = []
+        for row, tokens in enumerate(texts):
+            ids = self.ids(self._words(tokens) if isinstance(tokens, str) else tokens)
+            if len(ids) > max_length:
+                ids = ids[:max_length]
+            lengths[row] = len(ids)
+            flat.extend(ids)
+
+        longest = int(lengths.max()) if len(texts) else 0
+        width = next(bound for bound in buckets if bound >= longest)
+        padded = np.zeros((len(texts), width), dtype=np.int32)
+        padded[np.arange(width) < lengths[:, None]] = flat
+        return padded, lengths
+
+
+_encoders = weakref.WeakKeyDictionary()
+_encoders_lock = threading.Lock()
+
+
+def token_encoder(tokenizer) -> TokenIdEncoder:
+    """Shared encoder for a fitted tokenizer, built on first use"""
+    with _encoders_lock:
+        encoder = _encoders.get(tokenizer)
+        if encoder is None:
+            encoder = _encoders[tokenizer] = TokenIdEncoder(tokenizer)
+        return encoder
@@ -14,7 +14,11 @@ import numpy as np
 import random
 from ml.sentiment_model import sentiment_model
 from ml.intent_model import intent_model
-from ml.nlp_pipeline import preprocess_batch
+from ml.multitask_model import multitask_model
+from ml.linear_model import sentiment_linear_model, intent_linear_model
+from ml.student_model import sentiment_student, intent_student
+from ml.bundle import export_trained_models
+from ml.nlp_pipeline import preprocess_batch, build_lemma_table
 import config
 
 # Set random seeds for reproducibility
@@ -289,8 +293,71 @@ def generate_training_data():
     return sentiment_data, intent_data
 
 
-def train_models():
-    """Train both sentiment and intent models"""
+def flatten_data(data: dict) -> tuple:
+    """Turn a {label: [samples]} dict into parallel text and label lists"""
+    texts = []
+    labels = []
+    for label, samples in data.items():
+        texts.extend(samples)
+        labels.extend([label] * len(samples))
+    return texts, labels
+
+
+def split_holdout(texts: list, labels: list, fraction: float = 0.2, seed: int = 42) -> tuple:
+    """
+    Shuffle and split a dataset into training and held-out parts
+    
+    Returns:
+        (train_texts, train_labels, holdout_texts, holdout_labels)
+    """
+    order = list(range(len(texts)))
+    random.Random(seed).shuffle(order)
+    n_holdout = int(len(order) * fraction)
+    
+    holdout = order[:n_holdout]
+    train = order[n_holdout:]
+    
+    return (
+        [texts[i] for i in train], [labels[i] for i in train],
+        [texts[i] for i in holdout], [labels[i] for i in holdout]
+    )
+
+
+def train_multitask_model(sentiment_texts: list, sentiment_labels: list,
+                          intent_texts: list, intent_labels: list):
+    """Jointly train the shared-encoder model on preprocessed texts"""
+    print("\n" + "=" * 60)
+    print("TRAINING MULTI-TASK MODEL (shared Bi-LSTM encoder)")
+    print("=" * 60)
+    
+    multitask_model.set_tokenizer(sentiment_model.tokenizer)
+    
+    history = multitask_model.train(
+        sentiment_texts,
+        sentiment_labels,
+        intent_texts,
+        intent_labels,
+        epochs=15,
+        batch_size=32,
+        validation_split=0.2
+    )
+    
+    multitask_model.save_model()
+    
+    print(f"\nMulti-task Model:")
+    print(f"  Sentiment Validation Accuracy: {history.history['val_sentiment_accuracy'][-1]:.4f}")
+    print(f"  Intent Validation Accuracy: {history.history['val_intent_accuracy'][-1]:.4f}")
+    
+    return history
+
+
+def train_models(multitask: bool = config.SERVING_MODEL == "multitask"):
+    """
+    Train both sentiment and intent models
+    
+    Args:
+        multitask: Also train the shared-encoder multi-task model
+    """
     
     print("=" * 60)
     print("GENERATING TRAINING DATA")
@@ -299,21 +366,13 @@ def train_models():
     sentiment_data, intent_data = generate_training_data()
     
     # Prepare sentiment training data
-    sentiment_texts = []
-    sentiment_labels = []
-    for label, samples in sentiment_data.items():
-        sentiment_texts.extend(samples)
-        sentiment_labels.extend([label] * len(samples))
+    sentiment_texts, sentiment_labels = flatten_data(sentiment_data)
     
     print(f"\nSentiment training samples: {len(sentiment_texts)}")
     print(f"Sentiment classes: {set(sentiment_labels)}")
     
     # Prepare intent training data
-    intent_texts = []
-    intent_labels = []
-    for label, samples in intent_data.items():
-        intent_texts.extend(samples)
-        intent_labels.extend([label] * len(samples))
+    intent_texts, intent_labels = flatten_data(intent_data)
     
     print(f"\nIntent training samples: {len(intent_texts)}")
     print(f"Intent classes: {set(intent_labels)}")
@@ -328,6 +387,10 @@ def train_models():
     
     print(f"Preprocessing complete!")
     
+    # Saved next to the models so serving preprocessing starts with a warm table
+    lemma_count = build_lemma_table(sentiment_texts + intent_texts)
+    print(f"Lemma table: {lemma_count} tokens -> {config.LEMMA_TABLE_PATH}")
+    
     # Train sentiment model
     print("\n" + "=" * 60)
     print("TRAINING SENTIMENT MODEL (Bi-LSTM)")
@@ -362,6 +425,27 @@ def train_models():
     # Save intent model
     intent_model.save_model()
     
+    # Cheap first stage of the cascade (served when CASCADE_THRESHOLD is set)
+    print("\n" + "=" * 60)
+    print("TRAINING LINEAR FIRST STAGE (hashed bag-of-words)")
+    print("=" * 60)
+    
+    sentiment_linear_model.train(sentiment_texts_clean, sentiment_labels)
+    intent_linear_model.train(intent_texts_clean, intent_labels)
+    
+    # Compact students, served instead of the LSTMs via config.MODEL_VARIANTS
+    print("\n" + "=" * 60)
+    print("DISTILLING STUDENT MODELS (pooled-embedding MLP)")
+    print("=" * 60)
+    
+    sentiment_student.distill(sentiment_model, sentiment_texts_clean, sentiment_labels)
+    intent_student.distill(intent_model, intent_texts_clean, intent_labels)
+    
+    # Versioned bundle the API serves from (both inference backends)
+    export_trained_models(sentiment_model, intent_model,
+                          linear_models=[sentiment_linear_model, intent_linear_model],
+                          students=[sentiment_student, intent_student])
+    
     print("\n" + "=" * 60)
     print("TRAINING COMPLETE!")
     print("=" * 60)
@@ -381,6 +465,32 @@ def train_models():
     print(f"  Training Accuracy: {intent_acc:.4f}")
     print(f"  Validation Accuracy: {intent_val_acc:.4f}")
     
+    for name, linear, texts, labels in (
+        ("Sentiment", sentiment_linear_model, sentiment_texts_clean, sentiment_labels),
+        ("Intent", intent_linear_model, intent_texts_clean, intent_labels),
+    ):
+        predicted = linear.predict(texts, columnar=True)[linear.label_key]
+        print(f"\n{name} Linear First Stage:")
+        print(f"  Training Accuracy: {np.mean(predicted == np.array(labels)):.4f}")
+    
+    for name, teacher, student, texts in (
+        ("Sentiment", sentiment_model, sentiment_student, sentiment_texts_clean),
+        ("Intent", intent_model, intent_student, intent_texts_clean),
+    ):
+        key = student.label_key
+        agreement = np.mean(student.predict(texts, columnar=True)[key] ==
+                            teacher.predict(texts, columnar=True)[key])
+        print(f"\n{name} Student:")
+        print(f"  Parameters: {student.model.count_params():,} "
+              f"(teacher {teacher.model.count_params():,})")
+        print(f"  Agreement with Teacher: {agreement:.4f}")
+    
+    if multitask:
+        train_multitask_model(
+            sentiment_texts_clean, sentiment_labels,
+            intent_texts_clean, intent_labels
+        )
+    
     # Test predictions
     print("\n" + "=" * 60)
     print("TESTING PREDICTIONS")
@@ -409,4 +519,11 @@ def train_models():
 
 
 if __name__ == "__main__":
-    train_models()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Train sentiment and intent models")
+    parser.add_argument("--multitask", action="store_true",
+                        help="Also train the shared-encoder multi-task model")
+    args = parser.parse_args()
+    
+    train_models(multitask=args.multitask or config.SERVING_MODEL == "multitask")
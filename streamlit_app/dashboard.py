@@ -7,7 +7,9 @@ from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 from datetime import datetime
 import io
+import json
 import os
+import time
 
 # Page configuration
 st.set_page_config(
@@ -84,6 +86,30 @@ def get_all_feedback(source=None, sentiment=None, limit=None):
     except:
         return []
 
+def search_feedback(query, source=None, sentiment=None, limit=100):
+    """Full-text search across all feedback, following cursors up to `limit` results"""
+    results = []
+    params = {'q': query, 'limit': min(limit, 100)}
+    if source:
+        params['source'] = source
+    if sentiment:
+        params['sentiment'] = sentiment
+    
+    try:
+        while len(results) < limit:
+            response = requests.get(f"{API_BASE_URL}/feedback/search", params=params)
+            if response.status_code != 200:
+                break
+            page = response.json()
+            results.extend(page['results'])
+            if not page.get('next_cursor'):
+                break
+            params['cursor'] = page['next_cursor']
+    except:
+        pass
+    
+    return results[:limit]
+
 def analyze_text(text):
     """Analyze text using API"""
     try:
@@ -116,17 +142,32 @@ def analyze_all_feedback():
     except Exception as e:
         return False, {"message": str(e)}
 
-def upload_csv_feedback(df):
-    """Upload CSV feedback data"""
+def get_job_status(job_id):
+    """Fetch progress of a background job"""
     try:
-        feedbacks = df.to_dict('records')
-        response = requests.post(
-            f"{API_BASE_URL}/feedback/bulk",
-            json={"feedbacks": feedbacks}
-        )
-        return response.status_code == 200, response.json()
-    except Exception as e:
-        return False, {"message": str(e)}
+        response = requests.get(f"{API_BASE_URL}/jobs/{job_id}")
+        if response.status_code == 200:
+            return response.json()
+        return None
+    except:
+        return None
+
+def feedback_ndjson(df, rows_per_chunk=1000):
+    """Yield the feedback rows as NDJSON, a block of rows at a time"""
+    columns = ['feedback_id', 'text', 'source', 'date']
+    for start in range(0, len(df), rows_per_chunk):
+        block = df[columns].iloc[start:start + rows_per_chunk].astype(str)
+        yield ''.join(json.dumps(record) + '\n'
+                      for record in block.to_dict('records')).encode('utf-8')
+
+def upload_csv_feedback(df, timeout=30):
+    """Stream CSV feedback rows to the API, which inserts them as they arrive"""
+    return requests.post(
+        f"{API_BASE_URL}/feedback/bulk/stream",
+        data=feedback_ndjson(df),
+        headers={"Content-Type": "application/x-ndjson"},
+        timeout=timeout
+    )
 
 
 # Main App
@@ -159,12 +200,24 @@ def main():
         
         st.subheader("Quick Actions")
         if st.button("Analyze All Feedback", use_container_width=True):
-            with st.spinner("Analyzing all feedback..."):
-                success, result = analyze_all_feedback()
-                if success:
-                    st.success(result.get('message', 'Analysis complete!'))
+            success, result = analyze_all_feedback()
+            if success:
+                progress = st.progress(0.0, text="Analyzing all feedback...")
+                job = get_job_status(result['job_id'])
+                while job and job['status'] in ('queued', 'running'):
+                    eta = f" (ETA {job['eta_seconds']:.0f}s)" if job.get('eta_seconds') else ""
+                    progress.progress(job['progress'],
+                                      text=f"Analyzed {job['processed']}/{job['total']}{eta}")
+                    time.sleep(1)
+                    job = get_job_status(result['job_id'])
+                
+                if job and job['status'] == 'completed':
+                    progress.progress(1.0, text=f"Analyzed {job['processed']} feedback entries")
+                    st.success('Analysis complete!')
                 else:
-                    st.error(f"Error: {result.get('message', 'Unknown error')}")
+                    st.error(f"Error: {(job or {}).get('error') or 'Job status unavailable'}")
+            else:
+                st.error(f"Error: {result.get('message', 'Unknown error')}")
         
         st.divider()
         st.caption("Powered by AI & Deep Learning")
@@ -347,11 +400,18 @@ def show_deep_dive():
     with col3:
         limit = st.number_input("Max Results", min_value=10, max_value=1000, value=100)
     
+    # Search runs server-side over the whole table
+    search_term = st.text_input("Search in feedback text")
+    
     # Fetch filtered data
     source = None if source_filter == "All" else source_filter
     sentiment = None if sentiment_filter == "All" else sentiment_filter
     
-    feedback_data = get_all_feedback(source=source, sentiment=sentiment, limit=limit)
+    if search_term:
+        feedback_data = search_feedback(search_term, source=source, sentiment=sentiment,
+                                        limit=limit)
+    else:
+        feedback_data = get_all_feedback(source=source, sentiment=sentiment, limit=limit)
     
     if not feedback_data:
         st.warning("No feedback matches the selected filters.")
@@ -413,11 +473,8 @@ def show_deep_dive():
     # Detailed Table
     st.subheader("Detailed Feedback Table")
     
-    # Add search
-    search_term = st.text_input("Search in feedback text")
-    
-    if search_term:
-        df = df[df['text'].str.contains(search_term, case=False, na=False)]
+    # Search relevance columns aren't useful in the table or the export
+    df = df.drop(columns=['snippet', 'score'], errors='ignore')
     
     st.dataframe(df, use_container_width=True, hide_index=True)
     
@@ -527,23 +584,9 @@ def show_add_feedback():
                     
                     if st.button("Upload Feedback", use_container_width=True):
                         with st.spinner("Uploading feedback..."):
-                            # Convert DataFrame to list of dicts with proper formatting
-                            feedbacks = []
-                            for _, row in df.iterrows():
-                                feedback = {
-                                    "feedback_id": str(row['feedback_id']),
-                                    "text": str(row['text']),
-                                    "source": str(row['source']),
-                                    "date": str(row['date'])
-                                }
-                                feedbacks.append(feedback)
-                            
                             try:
-                                response = requests.post(
-                                    f"{API_BASE_URL}/feedback/bulk",
-                                    json={"feedbacks": feedbacks},
-                                    timeout=30
-                                )
+                                # Rows are sent in blocks, not as one request body
+                                response = upload_csv_feedback(df)
                                 
                                 if response.status_code == 200:
                                     result = response.json()